@@ -0,0 +1,102 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:00
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+MINUTES_PER_DAY = 24 * 60
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# (model, m2m field, compact field)
+RELATIONS = [
+    ('Business', 'working_hours', 'schedule'),
+    ('Business', 'breaking_hours', 'breaking_schedule'),
+    ('Employee', 'working_hours', 'schedule'),
+    ('Service', 'working_hours', 'schedule'),
+]
+
+
+def to_compact(rows):
+    """
+    Frozen copy of WeeklySchedule.from_rows(rows).to_json() as of this migration:
+    {"monday": [[540, 1020]], ...}, sorted merged minute intervals, an end at or before the start runs until midnight.
+    """
+    days = defaultdict(list)
+    for day_of_week, start_time, end_time in rows:
+        start = start_time.hour * 60 + start_time.minute
+        end = end_time.hour * 60 + end_time.minute
+        if end <= start:
+            end = MINUTES_PER_DAY
+        days[day_of_week].append((start, end))
+
+    compact = {}
+    for day in DAYS:
+        merged = []
+        for start, end in sorted(days.get(day, [])):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        if merged:
+            compact[day] = merged
+    return compact
+
+
+def build_schedules(apps, schema_editor):
+    for model_name, field_name, compact_field in RELATIONS:
+        model = apps.get_model('business', model_name)
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        owner_column = field.m2m_field_name()
+        hours_column = field.m2m_reverse_field_name()
+
+        rows = defaultdict(list)
+        for owner_id, day_of_week, start_time, end_time in through.objects.values_list(
+            f'{owner_column}_id',
+            f'{hours_column}__day_of_week',
+            f'{hours_column}__start_time',
+            f'{hours_column}__end_time',
+        ).iterator():
+            rows[owner_id].append((day_of_week, start_time, end_time))
+
+        model.objects.bulk_update(
+            [
+                model(pk=owner_id, **{compact_field: to_compact(owner_rows)})
+                for owner_id, owner_rows in rows.items()
+            ],
+            [compact_field],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0045_business_apply_for_weeks_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='schedule',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Compact weekly schedule built from working_hours, minutes per day'),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='breaking_schedule',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Compact weekly schedule built from breaking_hours, minutes per day'),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='schedule',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Compact weekly schedule built from working_hours, minutes per day'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='schedule',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Compact weekly schedule built from working_hours, minutes per day'),
+        ),
+        migrations.RunPython(build_schedules, migrations.RunPython.noop),
+    ]
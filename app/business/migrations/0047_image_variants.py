@@ -0,0 +1,33 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0046_compact_schedules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicecategory',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized variants of the logo, see core.images.ImageDerivatives'),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized variants of the image, see core.images.ImageDerivatives'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized variants of the image, see core.images.ImageDerivatives'),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized variants of the avatar, see core.images.ImageDerivatives'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from uuid import uuid4
 from django.contrib.gis.db import models
 from django.apps import apps
 
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from core.models import safe_file_path
 from core.validators import validate_file_size
@@ -13,7 +14,8 @@ from user.geo_utils.main import GeoUtils
 from datetime import date, timedelta
 
 from rating import models as rating_models
-from business.utils.time_zoner import TimeZoner 
+from business.utils.time_zoner import TimeZoner, LocalSchedule
+from business.utils.schedule import WeeklySchedule
 
 
 class ServiceCategory(models.Model):
@@ -40,6 +42,12 @@ class ServiceCategory(models.Model):
         validators=[validate_file_size],
         verbose_name=_("Logo"),
     )
+    logo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized variants of the logo, see core.images.ImageDerivatives"),
+    )
     parent = models.ForeignKey(
         "self",
         on_delete=models.CASCADE,
@@ -159,6 +167,12 @@ class Gallery(models.Model):
         validators=[validate_file_size],
         verbose_name=_("Image"),
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized variants of the image, see core.images.ImageDerivatives"),
+    )
     is_main = models.BooleanField(
         default=False,
         help_text=_("Is this image the main image for the business?"),
@@ -215,6 +229,12 @@ class Service(models.Model):
         validators=[validate_file_size],
         verbose_name=_("Image"),
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized variants of the image, see core.images.ImageDerivatives"),
+    )
     gender = models.CharField(
         max_length=255,
         choices=onboarding_enums.ServiceGenderChoices.choices,
@@ -258,6 +278,12 @@ class Service(models.Model):
         related_name="services",
         blank=True,
     )
+    schedule = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Compact weekly schedule built from working_hours, minutes per day"),
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -304,6 +330,12 @@ class Employee(models.Model):
         validators=[validate_file_size],
         verbose_name=_("Avatar"),
     )
+    avatar_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized variants of the avatar, see core.images.ImageDerivatives"),
+    )
     services = models.ManyToManyField(
         "business.Service",
         related_name="employees_services",
@@ -314,6 +346,12 @@ class Employee(models.Model):
         related_name="employees",
         blank=True,
     )
+    schedule = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Compact weekly schedule built from working_hours, minutes per day"),
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -390,6 +428,18 @@ class Business(models.Model):
         related_name="businesses_breaking_hours",
         blank=True,
     )
+    schedule = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Compact weekly schedule built from working_hours, minutes per day"),
+    )
+    breaking_schedule = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Compact weekly schedule built from breaking_hours, minutes per day"),
+    )
     visit_type = models.CharField(
         max_length=255,
         choices=business_enums.VisitTypeChoices.choices,
@@ -466,8 +516,25 @@ class Business(models.Model):
         - if apply_for_weeks is ALL_WEEKS, return working hours as they are.
         - else, return empty queryset.
         """
-        if not self.apply_for_weeks_date:
+        if self.is_schedule_active():
             return self.working_hours.all()
+        return WorkingHours.objects.none()
+
+    @property
+    def real_schedule(self) -> WeeklySchedule:
+        """
+        Same rules as get_real_working_hours, computed from the compact schedules with
+        breaking hours subtracted, no queries.
+        """
+        if not self.is_schedule_active():
+            return WeeklySchedule()
+        return WeeklySchedule.from_json(self.schedule).subtract(
+            WeeklySchedule.from_json(self.breaking_schedule)
+        )
+
+    def is_schedule_active(self) -> bool:
+        if not self.apply_for_weeks_date:
+            return True
 
         today = date.today()
         start_of_week = self.apply_for_weeks_date - timedelta(days=today.weekday())
@@ -479,13 +546,10 @@ class Business(models.Model):
         }
 
         if self.apply_for_weeks == business_enums.ApplyForWeeksChoices.ALL_WEEKS:
-            return self.working_hours.all()
+            return True
 
         window_end = week_windows.get(self.apply_for_weeks)
-        if window_end and start_of_week <= today <= window_end:
-            return self.working_hours.all()
-
-        return WorkingHours.objects.none()
+        return bool(window_end and start_of_week <= today <= window_end)
 
 
     @property
@@ -594,41 +658,44 @@ class UserBusinesBooking(models.Model):
         return f"{self.user} - {self.business} ({self.start_time} - {self.end_time})"
 
     @property
-    def date_str(self) -> str:
-        user_timezone = getattr(self.user, 'timezone', None) if hasattr(self, 'user') else None
-        return TimeZoner.convert_date(
-            booking_date=self.date,
-            reference_time=self.start_time,
-            user_timezone=user_timezone,
+    def user_timezone(self) -> str:
+        try:
+            return getattr(self.user, 'timezone', None)
+        except Exception:
+            return None
+
+    @cached_property
+    def local_schedule(self) -> LocalSchedule:
+        """
+        Date and times in the user's timezone, converted once per instance.
+        Use prefetch_local_schedules to convert a whole chunk of bookings in one call.
+        """
+        return TimeZoner.convert_schedule(self.date, self.start_time, self.end_time, self.user_timezone)
+
+    @classmethod
+    def prefetch_local_schedules(cls, bookings):
+        """
+        Fill local_schedule for many bookings; select_related('user') avoids a query per booking.
+        """
+        schedules = TimeZoner.convert_many(
+            (booking.date, booking.start_time, booking.end_time, booking.user_timezone)
+            for booking in bookings
         )
+        for booking, schedule in zip(bookings, schedules):
+            booking.__dict__['local_schedule'] = schedule
+        return bookings
+
+    @property
+    def date_str(self) -> str:
+        return self.local_schedule.date
     
     @property
     def time_str(self) -> str:
-        user_timezone = None
-        try:
-            user_timezone = getattr(self.user, 'timezone', None)
-        except Exception:
-            user_timezone = None
-        result = TimeZoner.convert_time_range(
-            booking_date=self.date,
-            start_time=self.start_time,
-            end_time=self.end_time,
-            user_timezone=user_timezone,
-        )
-        return result.range
+        return self.local_schedule.range
     
     @property
     def start_time_str(self) -> str:
-        if not self.start_time or not self.date:
-            return ""
-        user_timezone = getattr(self.user, 'timezone', None) if hasattr(self, 'user') else None
-        result = TimeZoner.convert_time_range(
-            booking_date=self.date,
-            start_time=self.start_time,
-            end_time=self.start_time,
-            user_timezone=user_timezone,
-        )
-        return result.start
+        return self.local_schedule.start
 
     @property
     def price(self):
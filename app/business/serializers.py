@@ -14,9 +14,13 @@ from rating import models as rating_models
 
 from user import serializers as user_serializers
 from notifications.task_sender import NotificationTaskSender
+from notifications.coalescer import NotificationCoalescer
+from notifications.enums import NotificationType
 
 
 from core.validators import phone_validator
+from core.fields import ImageVariantsField
+from business.utils.schedule_writer import ScheduleWriter
 
 
 class WorkingHoursEntrySerializer(serializers.Serializer):
@@ -66,19 +70,10 @@ class WorkingHoursBatchUpdateSerializer(serializers.Serializer):
             businesses = business_models.Business.objects.filter(uid=business_uid).all()
             instances.extend(businesses)
         
-        working_hours_objs = []
-        for entry in working_hours_data:
-            working_hours_objs.append(
-                business_models.WorkingHours.objects.update_or_create(
-                    visit_type=entry.get("visit_type", None),
-                    day_of_week=entry.get("day_of_week"),
-                    start_time=entry.get("start_time"),
-                    end_time=entry.get("end_time"),
-                )[0]
-            )
-        for instance in instances:
-            instance.working_hours.set(working_hours_objs)
-            instance.save()
+        ScheduleWriter.replace(
+            instances,
+            [ScheduleWriter.build_slot(entry) for entry in working_hours_data],
+        )
 
         return instances
 
@@ -280,6 +275,7 @@ class ServiceSubCategorySerializer(serializers.ModelSerializer):
     """
     Serializer for ServiceCategory model.
     """
+    logo_variants = ImageVariantsField()
 
     class Meta:
         model = business_models.ServiceCategory
@@ -297,6 +293,7 @@ class ServiceSubCategorySerializer(serializers.ModelSerializer):
             "currency_symbol",
             "duration",
             "logo",
+            "logo_variants",
         ]
 
 
@@ -307,6 +304,7 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
     """
     subcategories = ServiceSubCategorySerializer(many=True, read_only=True)
     service_type = serializers.ChoiceField(choices=business_enums.ServiceTypeChoices.choices)
+    logo_variants = ImageVariantsField()
     
     class Meta:
         model = business_models.ServiceCategory
@@ -326,12 +324,14 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
             "currency_symbol",
             "duration",
             "logo",
+            "logo_variants",
         ]
 
 
 class ServiceCategoryDetailSerializer(serializers.ModelSerializer):
     service_type = serializers.ChoiceField(choices=business_enums.ServiceTypeChoices.choices)
     subcategories = ServiceCategorySerializer(many=True, read_only=True)
+    logo_variants = ImageVariantsField()
 
     class Meta:
         model = business_models.ServiceCategory
@@ -341,6 +341,7 @@ class ServiceCategoryDetailSerializer(serializers.ModelSerializer):
             "service_type",
             "description",
             "logo",
+            "logo_variants",
             "subcategories",
         ]
 
@@ -349,12 +350,14 @@ class GalleryImageSerializer(serializers.ModelSerializer):
     """
     Serializer for GalleryImage model.
     """
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = business_models.Gallery
         fields = [
             "uid",
             "image",
+            "image_variants",
         ]
 
 class VideoGallerySerializer(serializers.ModelSerializer):
@@ -814,18 +817,15 @@ class BookingEditSerializer(BookingCreateSerializer):
                 },
             )
         else:
-            celery_app.send_task(
-                "send_booking_updated_notification",
-                kwargs={
-                    "booking_uid": str(instance.uid),
-                },
-            )
-            celery_app.send_task(
-                "send_booking_updated_mail",
-                kwargs={
-                    "booking_uid": str(instance.uid),
-                },
-            )
+            # coalesced: quick successive edits end up as a single push and mail
+            for task_name in ("send_booking_updated_notification", "send_booking_updated_mail"):
+                NotificationCoalescer.schedule(
+                    task_name=task_name,
+                    notification_type=NotificationType.BOOKING_UPDATED,
+                    user_id=instance.user_id,
+                    object_uid=str(instance.uid),
+                    sender_id=self.context["request"].user.id,
+                )
         return instance
     
 
@@ -859,6 +859,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
         read_only=True,
         default=0,
     )
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = business_models.Service
@@ -866,6 +867,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
             "uid",
             "name",
             "image",
+            "image_variants",
             "gender",
             "price",
             "currency",
@@ -883,6 +885,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
 
 class ServiceListInlineSerializer(serializers.ModelSerializer):
     category = ServiceCategorySerializer()
+    image_variants = ImageVariantsField()
     
     class Meta:
         model = business_models.Service
@@ -890,6 +893,7 @@ class ServiceListInlineSerializer(serializers.ModelSerializer):
             "uid",
             "name",
             "image",
+            "image_variants",
             "price",
             "currency",
             "currency_symbol",
@@ -918,6 +922,7 @@ class EmployeeListSerializer(serializers.ModelSerializer):
     avatar = serializers.ImageField(
         read_only=True,
     )
+    avatar_variants = ImageVariantsField()
     average_rating = serializers.FloatField(
         read_only=True,
         default=0.0,
@@ -947,6 +952,7 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             "services",
             "user",
             "avatar",
+            "avatar_variants",
             "average_rating",
             "working_hours",
             "free_hours",
@@ -963,12 +969,17 @@ class EmployeeInlineSerializer(serializers.ModelSerializer):
         read_only=True,
         default=None,
     )
+    avatar_variants = ImageVariantsField(
+        source="user",
+        default=None,
+    )
     class Meta:
         model = business_models.Employee
         fields = [
             "uid",
             "name",
             "avatar",
+            "avatar_variants",
         ]
     
 
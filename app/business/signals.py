@@ -0,0 +1,112 @@
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from business import models as business_models
+from business.utils.schedule_writer import ScheduleWriter
+from core.signals import MediaDeletionBatch
+
+
+# (owner model, m2m field) pairs that have a compact schedule next to them
+SCHEDULE_RELATIONS = [
+    (business_models.Business, "working_hours"),
+    (business_models.Business, "breaking_hours"),
+    (business_models.Employee, "working_hours"),
+    (business_models.Service, "working_hours"),
+]
+
+
+def get_relation_owner_ids(working_hours_ids):
+    """
+    {(owner model, m2m field): owner ids} of everything linked to the given WorkingHours.
+    """
+    owners = {}
+    for model, field_name in SCHEDULE_RELATIONS:
+        through, owner_column, hours_column = ScheduleWriter.get_through(model, field_name)
+        owners[(model, field_name)] = list(
+            through.objects.filter(**{f"{hours_column}_id__in": working_hours_ids})
+            .values_list(f"{owner_column}_id", flat=True)
+        )
+    return owners
+
+
+def refresh_relation_owners(owners):
+    for (model, field_name), owner_ids in owners.items():
+        ScheduleWriter.refresh_compact(model, owner_ids, field_name)
+
+
+def refresh_schedule(model, field_name):
+    def handler(sender, instance, action, reverse, pk_set, **kwargs):
+        if action == "pre_clear" and reverse:
+            through, owner_column, hours_column = ScheduleWriter.get_through(model, field_name)
+            instance._schedule_cleared_owner_ids = list(
+                through.objects.filter(**{f"{hours_column}_id": instance.pk})
+                .values_list(f"{owner_column}_id", flat=True)
+            )
+            return
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        if not reverse:
+            owner_ids = [instance.pk]
+        elif action == "post_clear":
+            owner_ids = getattr(instance, "_schedule_cleared_owner_ids", [])
+        else:
+            owner_ids = pk_set or []
+        ScheduleWriter.refresh_compact(model, owner_ids, field_name)
+    return handler
+
+
+for _model, _field_name in SCHEDULE_RELATIONS:
+    m2m_changed.connect(
+        refresh_schedule(_model, _field_name),
+        sender=getattr(_model, _field_name).through,
+        weak=False,
+    )
+
+
+@receiver(post_save, sender=business_models.WorkingHours)
+def refresh_schedules_on_working_hours_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    refresh_relation_owners(get_relation_owner_ids([instance.pk]))
+
+
+@receiver(pre_delete, sender=business_models.WorkingHours)
+def collect_schedule_owners(sender, instance, **kwargs):
+    instance._schedule_owners = get_relation_owner_ids([instance.pk])
+
+
+@receiver(post_delete, sender=business_models.WorkingHours)
+def refresh_schedules_on_working_hours_delete(sender, instance, **kwargs):
+    refresh_relation_owners(getattr(instance, "_schedule_owners", {}))
+
+
+@receiver(pre_delete, sender=business_models.Business)
+def collect_business_media(sender, instance, **kwargs):
+    instance._gallery_ids = list(
+        business_models.Gallery.objects.filter(
+            Q(businesses=instance) | Q(services__business=instance)
+        ).values_list("id", flat=True).distinct()
+    )
+    instance._video_ids = list(instance.videos.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=business_models.Business)
+def delete_business_media(sender, instance, **kwargs):
+    """
+    Gallery images and videos of a deleted business are deleted with it, their files (and the
+    image variants, see core.signals) in one batched task. Rows still linked elsewhere are kept.
+    """
+    images = business_models.Gallery.objects.filter(
+        id__in=getattr(instance, "_gallery_ids", []),
+        businesses__isnull=True,
+        services__isnull=True,
+    )
+    videos = business_models.VideoGallery.objects.filter(
+        id__in=getattr(instance, "_video_ids", []),
+        businesses__isnull=True,
+    )
+    names = list(images.values_list("image", flat=True)) + list(videos.values_list("video", flat=True))
+    images.delete()
+    videos.delete()
+    MediaDeletionBatch.add(names)
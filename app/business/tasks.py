@@ -4,6 +4,7 @@ from celery import shared_task
 
 from business import models as business_models
 from notifications.task_sender import NotificationTaskSender
+from notifications.coalescer import NotificationCoalescer
 
 from user import models as user_models
 from onboarding import models as onboarding_models
@@ -60,12 +61,17 @@ def send_canceled_mail_task(
 @shared_task(name="send_booking_updated_notification")
 def send_booking_updated_notification_task(
     booking_uid: str,
+    coalesce_key: str = None,
 ):
+    NotificationCoalescer.release(coalesce_key)
     booking = business_models.UserBusinesBooking.objects.filter(
         uid=booking_uid,
     ).first()
     if booking is None:
         return
+    if booking.status == business_models.business_enums.BookingStatusChoices.CANCELLED:
+        # cancelled inside the quiet window, the cancellation already went out
+        return
     NotificationTaskSender.send_booking_updated_notification(
         booking=booking,
     )
@@ -86,11 +92,16 @@ def send_booked_mail_task(
 @shared_task(name="send_booking_updated_mail")
 def send_booking_updated_mail_task(
     booking_uid: str,
+    coalesce_key: str = None,
 ):
+    NotificationCoalescer.release(coalesce_key)
     booking = business_models.UserBusinesBooking.objects.filter(
         uid=booking_uid,
     ).first()
-    
+    if booking is None:
+        return
+    if booking.status == business_models.business_enums.BookingStatusChoices.CANCELLED:
+        return
     if not booking.user.send_email_notification or not booking.user.notification_settings.booking_email:
         return
     handlers.booking_mail_handler(
@@ -118,14 +129,18 @@ def send_reminder_notification_task(
         "was_user_reminded": False,
         "status": business_models.business_enums.BookingStatusChoices.CONFIRMED,
     }
-    logger.info(f"Filter kwargs: {filter_kwargs}")
+    logger.debug("Filter kwargs: {}", filter_kwargs)
     
-    upcoming_bookings = business_models.UserBusinesBooking.objects.filter(
-        **filter_kwargs,
+    upcoming_bookings = list(
+        business_models.UserBusinesBooking.objects.filter(
+            **filter_kwargs,
+        ).select_related("user", "business__user", "employee")
     )
-    logger.info(f"Upcoming bookings count: {upcoming_bookings.count()}")
+    logger.info(f"Upcoming bookings count: {len(upcoming_bookings)}")
+    # one timezone conversion pass for the whole chunk
+    business_models.UserBusinesBooking.prefetch_local_schedules(upcoming_bookings)
     for booking in upcoming_bookings:
-        logger.info(f"Sending reminder notification for booking {booking.uid}")
+        logger.debug("Sending reminder notification for booking {}", booking.uid)
         NotificationTaskSender.send_reminder_notification(booking=booking)
 
         booking.was_user_reminded = True
@@ -146,14 +161,18 @@ def send_reminder_notification_daily_task(
         "status": business_models.business_enums.BookingStatusChoices.CONFIRMED,
         "was_user_reminded_daily": False,
     }
-    logger.info(f"filter kwargs: {filter_kwargs}")
+    logger.debug("filter kwargs: {}", filter_kwargs)
     
-    upcoming_bookings = business_models.UserBusinesBooking.objects.filter(
-        **filter_kwargs,
+    upcoming_bookings = list(
+        business_models.UserBusinesBooking.objects.filter(
+            **filter_kwargs,
+        ).select_related("user", "business__user", "employee")
     )
-    logger.info(f"Upcoming bookings count: {upcoming_bookings.count()}")
+    logger.info(f"Upcoming bookings count: {len(upcoming_bookings)}")
+    # one timezone conversion pass for the whole chunk
+    business_models.UserBusinesBooking.prefetch_local_schedules(upcoming_bookings)
     for booking in upcoming_bookings:
-        logger.info(f"Sending reminder notification for booking {booking.uid}")
+        logger.debug("Sending reminder notification for booking {}", booking.uid)
         NotificationTaskSender.send_reminder_notification_daily(booking=booking)
         
         booking.was_user_reminded_daily = True
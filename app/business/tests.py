@@ -1,3 +1,57 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from business.utils.bookings import BookingHoursBuilder
+from business.utils.schedule import (
+    WeeklySchedule,
+    intersect_intervals,
+    subtract_intervals,
+)
+
+
+class IntervalTests(SimpleTestCase):
+
+    def test_intersect(self):
+        self.assertEqual(
+            intersect_intervals([(540, 720), (780, 1020)], [(600, 840), (1000, 1200)]),
+            [(600, 720), (780, 840), (1000, 1020)],
+        )
+        self.assertEqual(intersect_intervals([(540, 600)], [(600, 660)]), [])
+        self.assertEqual(intersect_intervals([], [(0, 1440)]), [])
+
+    def test_subtract(self):
+        self.assertEqual(
+            subtract_intervals([(540, 1020)], [(720, 780), (900, 960)]),
+            [(540, 720), (780, 900), (960, 1020)],
+        )
+        self.assertEqual(subtract_intervals([(540, 600)], [(500, 700)]), [])
+        self.assertEqual(subtract_intervals([(540, 600), (660, 720)], [(590, 670)]), [(540, 590), (670, 720)])
+        self.assertEqual(subtract_intervals([(540, 600)], []), [(540, 600)])
+
+    def test_free_intervals(self):
+        schedule = WeeklySchedule({"monday": [(540, 1020)]})
+        busy = [(datetime.time(10, 0), datetime.time(11, 0)), (datetime.time(11, 30), datetime.time(16, 45))]
+
+        self.assertEqual(schedule.free_intervals("monday", busy), [(540, 600), (660, 690), (1005, 1020)])
+        self.assertEqual(
+            schedule.free_intervals("monday", busy, min_duration=datetime.timedelta(minutes=30)),
+            [(540, 600), (660, 690)],
+        )
+        self.assertEqual(schedule.free_intervals("tuesday", busy), [])
+
+    def test_rows_until_midnight_and_merged(self):
+        schedule = WeeklySchedule.from_rows([
+            ("friday", datetime.time(9, 0), datetime.time(12, 0)),
+            ("friday", datetime.time(11, 0), datetime.time(13, 0)),
+            ("friday", datetime.time(22, 0), datetime.time(0, 0)),
+        ])
+        self.assertEqual(schedule.to_json(), {"friday": [[540, 780], [1320, 1440]]})
+
+
+class BookingHoursBuilderTests(SimpleTestCase):
+
+    def test_booking_hours_cover_the_day(self):
+        start = datetime.datetime(2030, 1, 7)
+        slots = BookingHoursBuilder(start_datetime=start, end_datetime=start).build_list()
+        self.assertEqual(len(slots), 47)
@@ -103,6 +103,7 @@ class BusinessRegistry:
                 "images",
                 "videos",
                 "working_hours",
+                "breaking_hours",
                 "user",
                 "ratings",
                 "notification_settings",
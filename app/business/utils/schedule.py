@@ -0,0 +1,177 @@
+import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from business import enums as business_enums
+
+
+MINUTES_PER_DAY = 24 * 60
+
+# [start, end) in minutes since midnight
+Interval = Tuple[int, int]
+
+DAYS = [day.value for day in business_enums.DayOfWeekChoices]
+
+
+def to_minutes(value: datetime.time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes: int) -> datetime.time:
+    if minutes >= MINUTES_PER_DAY:
+        return datetime.time(23, 59)
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect_intervals(left: List[Interval], right: List[Interval]) -> List[Interval]:
+    """
+    Both inputs sorted and merged, single linear sweep.
+    """
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start < end:
+            result.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def subtract_intervals(left: List[Interval], right: List[Interval]) -> List[Interval]:
+    """
+    Parts of left not covered by right, both sorted and merged, single linear sweep.
+    """
+    result = []
+    j = 0
+    for start, end in left:
+        while j < len(right) and right[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(right) and right[k][0] < end:
+            if right[k][0] > start:
+                result.append((start, right[k][0]))
+            start = max(start, right[k][1])
+            if start >= end:
+                break
+            k += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+class WeeklySchedule:
+    """
+    Weekly schedule as sorted, merged [start, end) minute intervals per day.
+    This is the compact form stored on Business, Employee and Service
+    ({"monday": [[540, 1020]], ...}), so availability math runs on the row without
+    joining WorkingHours.
+    - intersect / subtract / union: schedule algebra, linear in the number of intervals
+    - free_intervals: working intervals of a day minus busy ones, optionally only the
+      gaps long enough for a given duration
+    """
+    __slots__ = ('days',)
+
+    def __init__(self, days: Optional[Dict[str, List[Interval]]] = None):
+        self.days: Dict[str, List[Interval]] = {
+            day: merge_intervals(tuple(interval) for interval in intervals)
+            for day, intervals in (days or {}).items()
+            if intervals
+        }
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, datetime.time, datetime.time]]) -> "WeeklySchedule":
+        """
+        rows: (day_of_week, start_time, end_time), eg WorkingHours values.
+        An end time at or before the start time runs until midnight.
+        """
+        days = {}
+        for day_of_week, start_time, end_time in rows:
+            start = to_minutes(start_time)
+            end = to_minutes(end_time)
+            if end <= start:
+                end = MINUTES_PER_DAY
+            days.setdefault(day_of_week, []).append((start, end))
+        return cls(days)
+
+    @classmethod
+    def from_json(cls, data: Optional[dict]) -> "WeeklySchedule":
+        return cls(data or {})
+
+    def to_json(self) -> dict:
+        return {
+            day: [[start, end] for start, end in self.days[day]]
+            for day in DAYS
+            if day in self.days
+        }
+
+    def get_day(self, day_of_week: str) -> List[Interval]:
+        return self.days.get(day_of_week, [])
+
+    def get_date(self, value: datetime.date) -> List[Interval]:
+        return self.get_day(DAYS[value.weekday()])
+
+    def intersect(self, other: "WeeklySchedule") -> "WeeklySchedule":
+        return WeeklySchedule({
+            day: intersect_intervals(intervals, other.get_day(day))
+            for day, intervals in self.days.items()
+        })
+
+    def subtract(self, other: "WeeklySchedule") -> "WeeklySchedule":
+        return WeeklySchedule({
+            day: subtract_intervals(intervals, other.get_day(day))
+            for day, intervals in self.days.items()
+        })
+
+    def union(self, other: "WeeklySchedule") -> "WeeklySchedule":
+        return WeeklySchedule({
+            day: self.get_day(day) + other.get_day(day)
+            for day in set(self.days) | set(other.days)
+        })
+
+    def contains(self, day_of_week: str, start_time: datetime.time, end_time: datetime.time) -> bool:
+        start = to_minutes(start_time)
+        end = to_minutes(end_time) or MINUTES_PER_DAY
+        return any(
+            interval_start <= start and end <= interval_end
+            for interval_start, interval_end in self.get_day(day_of_week)
+        )
+
+    def free_intervals(
+        self,
+        day_of_week: str,
+        busy: Iterable[Tuple[datetime.time, datetime.time]] = (),
+        min_duration: Optional[datetime.timedelta] = None,
+    ) -> List[Interval]:
+        busy_intervals = merge_intervals(
+            (to_minutes(start), to_minutes(end) or MINUTES_PER_DAY) for start, end in busy
+        )
+        free = subtract_intervals(self.get_day(day_of_week), busy_intervals)
+        if min_duration:
+            min_minutes = min_duration.total_seconds() / 60
+            free = [(start, end) for start, end in free if end - start >= min_minutes]
+        return free
+
+    def total_minutes(self) -> int:
+        return sum(end - start for intervals in self.days.values() for start, end in intervals)
+
+    def __bool__(self) -> bool:
+        return bool(self.days)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WeeklySchedule) and self.days == other.days
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from business import models as business_models
+from business.utils.schedule import WeeklySchedule
+
+
+# (day_of_week, start_time, end_time, visit_type)
+Slot = Tuple[str, object, object, Optional[str]]
+
+# M2M field -> compact schedule field kept next to it on the owner
+COMPACT_FIELDS = {
+    "working_hours": "schedule",
+    "breaking_hours": "breaking_schedule",
+}
+
+
+class ScheduleWriter:
+    """
+    Bulk writes of WorkingHours through the M2M tables of businesses, employees and
+    services.
+    WorkingHours rows are shared value objects: one row per (day, start, end, visit type)
+    reused by every owner, so a write never updates a WorkingHours row in place.
+    - resolve_slots: existing rows for the slots plus one bulk insert for the missing ones
+    - replace: make the owners' schedule exactly the given slots, only the through rows
+      that differ are deleted or inserted
+    - add: link slots to one owner without touching the rest of its schedule
+    - refresh_compact: rebuild the owners' compact WeeklySchedule field, called after
+      every write here and from the m2m signals for writes done elsewhere
+    Query count depends on the number of owner models, not on the number of slots.
+    """
+
+    @staticmethod
+    def build_slot(entry: dict) -> Slot:
+        return (
+            entry["day_of_week"],
+            entry["start_time"],
+            entry["end_time"],
+            entry.get("visit_type", None),
+        )
+
+    @staticmethod
+    def get_slot(working_hours: business_models.WorkingHours) -> Slot:
+        return (
+            working_hours.day_of_week,
+            working_hours.start_time,
+            working_hours.end_time,
+            working_hours.visit_type,
+        )
+
+    @classmethod
+    def resolve_slots(cls, slots: Iterable[Slot]) -> Dict[Slot, business_models.WorkingHours]:
+        slots = set(slots)
+        if not slots:
+            return {}
+
+        resolved = {}
+        candidates = business_models.WorkingHours.objects.filter(
+            day_of_week__in={slot[0] for slot in slots},
+            start_time__in={slot[1] for slot in slots},
+            end_time__in={slot[2] for slot in slots},
+        ).order_by("id")
+        for working_hours in candidates:
+            slot = cls.get_slot(working_hours)
+            # older duplicates win, so every owner converges on the same row
+            if slot in slots and slot not in resolved:
+                resolved[slot] = working_hours
+
+        missing = [slot for slot in slots if slot not in resolved]
+        created = business_models.WorkingHours.objects.bulk_create([
+            business_models.WorkingHours(
+                day_of_week=day_of_week,
+                start_time=start_time,
+                end_time=end_time,
+                visit_type=visit_type,
+            )
+            for day_of_week, start_time, end_time, visit_type in missing
+        ])
+        resolved.update(zip(missing, created))
+        return resolved
+
+    @staticmethod
+    def get_through(model, field_name: str):
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        return through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+    @classmethod
+    def replace(cls, owners: List[Model], slots: Iterable[Slot], field_name: str = "working_hours") -> List[business_models.WorkingHours]:
+        """
+        Set the schedule of every owner (any mix of Business, Employee and Service) to slots.
+        """
+        with transaction.atomic():
+            resolved = cls.resolve_slots(slots)
+            desired_ids = {working_hours.id for working_hours in resolved.values()}
+
+            owners_by_model = defaultdict(list)
+            for owner in owners:
+                owners_by_model[type(owner)].append(owner.pk)
+
+            for model, owner_ids in owners_by_model.items():
+                through, owner_column, hours_column = cls.get_through(model, field_name)
+                current = set(
+                    through.objects.filter(**{f"{owner_column}_id__in": owner_ids})
+                    .values_list(f"{owner_column}_id", f"{hours_column}_id")
+                )
+                desired = {(owner_id, hours_id) for owner_id in owner_ids for hours_id in desired_ids}
+
+                if current - desired:
+                    through.objects.filter(
+                        **{f"{owner_column}_id__in": owner_ids}
+                    ).exclude(**{f"{hours_column}_id__in": desired_ids}).delete()
+
+                through.objects.bulk_create(
+                    [
+                        through(**{f"{owner_column}_id": owner_id, f"{hours_column}_id": hours_id})
+                        for owner_id, hours_id in desired - current
+                    ],
+                    ignore_conflicts=True,
+                )
+
+                cls.refresh_compact(model, owner_ids, field_name)
+                if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+                    model.objects.filter(pk__in=owner_ids).update(updated_at=timezone.now())
+
+        return list(resolved.values())
+
+    @classmethod
+    def add(cls, owner: Model, slots: Iterable[Slot], field_name: str = "working_hours") -> List[business_models.WorkingHours]:
+        """
+        Link slots to the owner, keeping the rest of its schedule.
+        """
+        with transaction.atomic():
+            resolved = cls.resolve_slots(slots)
+            through, owner_column, hours_column = cls.get_through(type(owner), field_name)
+            through.objects.bulk_create(
+                [
+                    through(**{f"{owner_column}_id": owner.pk, f"{hours_column}_id": working_hours.id})
+                    for working_hours in resolved.values()
+                ],
+                ignore_conflicts=True,
+            )
+            cls.refresh_compact(type(owner), [owner.pk], field_name)
+        return list(resolved.values())
+
+    @classmethod
+    def refresh_compact(cls, model, owner_ids: Iterable[int], field_name: str = "working_hours"):
+        """
+        One read of the through rows and one bulk update of the compact field.
+        """
+        owner_ids = list(owner_ids)
+        compact_field = COMPACT_FIELDS[field_name]
+        if not owner_ids:
+            return
+        through, owner_column, hours_column = cls.get_through(model, field_name)
+        rows = defaultdict(list)
+        for owner_id, day_of_week, start_time, end_time in through.objects.filter(
+            **{f"{owner_column}_id__in": owner_ids}
+        ).values_list(
+            f"{owner_column}_id",
+            f"{hours_column}__day_of_week",
+            f"{hours_column}__start_time",
+            f"{hours_column}__end_time",
+        ):
+            rows[owner_id].append((day_of_week, start_time, end_time))
+
+        model.objects.bulk_update(
+            [
+                model(pk=owner_id, **{compact_field: WeeklySchedule.from_rows(rows[owner_id]).to_json()})
+                for owner_id in owner_ids
+            ],
+            [compact_field],
+        )
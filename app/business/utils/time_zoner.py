@@ -1,13 +1,21 @@
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
-from datetime import datetime, date, time
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime, date, time, timedelta
 
 import pytz
 import settings
 from core.custom_logger import logger
 
 
+TIME_FORMAT = '%I:%M %p'
+DATE_FORMAT = '%d/%m/%Y'
+
+# bounded per process, entries are tiny
+OFFSET_CACHE_SIZE = 10000
+
+
 @dataclass
 class TimeZonerResult:
     start: str
@@ -15,6 +23,18 @@ class TimeZonerResult:
     range: str
 
 
+@dataclass(frozen=True)
+class LocalSchedule:
+    """
+    Booking date and times already converted to the user's timezone and formatted.
+    Fields are empty strings when the inputs they need are missing.
+    """
+    date: str
+    start: str
+    end: str
+    range: str
+
+
 class TimeZoner:
     """Utility class to convert naive times stored in the project default timezone
     (``settings.TIME_ZONE``) to a user's timezone and format them.
@@ -27,18 +47,89 @@ class TimeZoner:
       default timezone is used.
 
     Output format: "HH:MM AM/PM - HH:MM AM/PM" (12-hour clock) matching existing code.
+
+    tzinfo objects are cached per name and the shift between the default and the user
+    timezone is cached per day, so converting a chunk of bookings with convert_many is a
+    few additions per booking. Days with a DST change in either timezone take the full
+    localize/astimezone path.
     """
 
+    _offsets = {}
+
     @staticmethod
+    @lru_cache(maxsize=None)
     def _get_tz(tz_name: Optional[str]) -> pytz.BaseTzInfo:
         if not tz_name:
             return pytz.timezone(settings.TIME_ZONE)
         try:
             return pytz.timezone(tz_name)
         except Exception:
+            # logged once per name, the result is cached
             logger.warning(f"Invalid timezone '{tz_name}', falling back to default.")
             return pytz.timezone(settings.TIME_ZONE)
 
+    @classmethod
+    def _day_shift(cls, booking_date: date, user_timezone: Optional[str]) -> Optional[timedelta]:
+        """
+        User local time minus default local time, if it is the same for the whole day.
+        """
+        key = (booking_date, user_timezone)
+        if key in cls._offsets:
+            return cls._offsets[key]
+
+        default_tz = cls._get_tz(None)
+        user_tz = cls._get_tz(user_timezone)
+        shifts = set()
+        default_offsets = set()
+        for moment in (time.min, time.max):
+            dt_default = default_tz.localize(datetime.combine(booking_date, moment))
+            default_offsets.add(dt_default.utcoffset())
+            shifts.add(dt_default.astimezone(user_tz).utcoffset() - dt_default.utcoffset())
+        shift = shifts.pop() if len(shifts) == 1 and len(default_offsets) == 1 else None
+
+        if len(cls._offsets) >= OFFSET_CACHE_SIZE:
+            cls._offsets.clear()
+        cls._offsets[key] = shift
+        return shift
+
+    @classmethod
+    def _to_user_datetime(cls, booking_date: date, value: time, user_timezone: Optional[str]) -> datetime:
+        naive = datetime.combine(booking_date, value)
+        shift = cls._day_shift(booking_date, user_timezone)
+        if shift is not None:
+            return naive + shift
+        return cls._get_tz(None).localize(naive).astimezone(cls._get_tz(user_timezone))
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def convert_schedule(
+        cls,
+        booking_date: Optional[date],
+        start_time: Optional[time],
+        end_time: Optional[time],
+        user_timezone: Optional[str],
+    ) -> LocalSchedule:
+        if not booking_date:
+            return LocalSchedule('', '', '', '')
+
+        # Treat noon as neutral reference to avoid DST midnight edge issues.
+        reference_time = start_time if start_time is not None else time(12, 0, 0)
+        date_str = cls._to_user_datetime(booking_date, reference_time, user_timezone).strftime(DATE_FORMAT)
+        start_str = cls._to_user_datetime(booking_date, start_time, user_timezone).strftime(TIME_FORMAT) if start_time else ''
+        end_str = cls._to_user_datetime(booking_date, end_time, user_timezone).strftime(TIME_FORMAT) if end_time else ''
+        range_str = f"{start_str} - {end_str}" if start_str and end_str else ''
+        return LocalSchedule(date=date_str, start=start_str, end=end_str, range=range_str)
+
+    @classmethod
+    def convert_many(
+        cls,
+        items: Iterable[Tuple[Optional[date], Optional[time], Optional[time], Optional[str]]],
+    ) -> List[LocalSchedule]:
+        """
+        Convert many (date, start_time, end_time, user_timezone) tuples in one call.
+        """
+        return [cls.convert_schedule(*item) for item in items]
+
     @classmethod
     def convert_time_range(
         cls,
@@ -50,28 +141,12 @@ class TimeZoner:
         """Convert a booking time range from default timezone to user's timezone.
         Returns empty strings if any input is missing.
         """
-        logger.info(f"Converting time range for date {booking_date} from default TZ to user TZ {user_timezone}")
         if not (booking_date and start_time and end_time):
             empty = ""
             return TimeZonerResult(empty, empty, empty)
 
-        default_tz = pytz.timezone(settings.TIME_ZONE)
-        user_tz = cls._get_tz(user_timezone)
-
-        # Combine date and times into naive datetimes and localize to default timezone.
-        start_dt_default = default_tz.localize(datetime.combine(booking_date, start_time))
-        end_dt_default = default_tz.localize(datetime.combine(booking_date, end_time))
-
-        # Convert to user's timezone.
-        start_dt_user = start_dt_default.astimezone(user_tz)
-        end_dt_user = end_dt_default.astimezone(user_tz)
-
-        start_str = start_dt_user.strftime('%I:%M %p')
-        end_str = end_dt_user.strftime('%I:%M %p')
-        range_str = f"{start_str} - {end_str}"
-
-        logger.info(f"range_str: {range_str}")
-        return TimeZonerResult(start=start_str, end=end_str, range=range_str)
+        result = cls.convert_schedule(booking_date, start_time, end_time, user_timezone)
+        return TimeZonerResult(start=result.start, end=result.end, range=result.range)
 
     @classmethod
     def convert_date(
@@ -79,7 +154,7 @@ class TimeZoner:
         booking_date: Optional[date],
         reference_time: Optional[time],
         user_timezone: Optional[str],
-        fmt: str = '%d/%m/%Y',
+        fmt: str = DATE_FORMAT,
     ) -> str:
         """Convert a booking date from default timezone to user's timezone.
 
@@ -89,11 +164,7 @@ class TimeZoner:
         """
         if not booking_date:
             return ""
-        default_tz = pytz.timezone(settings.TIME_ZONE)
-        user_tz = cls._get_tz(user_timezone)
         if reference_time is None:
             # Treat noon as neutral reference to avoid DST midnight edge issues.
             reference_time = time(12, 0, 0)
-        dt_default = default_tz.localize(datetime.combine(booking_date, reference_time))
-        dt_user = dt_default.astimezone(user_tz)
-        return dt_user.strftime(fmt)
+        return cls._to_user_datetime(booking_date, reference_time, user_timezone).strftime(fmt)
@@ -91,7 +91,7 @@ class SearchView(generics.ListAPIView):
         employees = []
         bookings = []
         user = self.request.user
-        business = business_models.Business.objects.filter(user=user).first()
+        business = user.primary_business
 
         if data_type in [
             business_enums.SearchDataTypeChoices.CLIENT.value,
@@ -0,0 +1,140 @@
+import json
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+import settings
+from core.redis import redis_storage
+from core.custom_logger import logger
+from core.token_blacklist import TokenBlacklist
+
+
+# fields that never leave the DB, they stay deferred on cached users
+SNAPSHOT_EXCLUDED_FIELDS = {'password'}
+
+REQUEST_AUTH_ATTR = '_jwt_auth_result'
+
+
+class UserSnapshotCache:
+    """
+    Redis snapshot of the User row used by authentication.
+    - get: User instance rebuilt from the snapshot, excluded fields are deferred so
+      save() on a cached user only writes the loaded fields
+    - set / invalidate: invalidate runs on every User save and delete
+    """
+
+    KEY_PREFIX = "auth_user"
+
+    @classmethod
+    def build_key(cls, user_id) -> str:
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @staticmethod
+    def get_snapshot_fields():
+        return [
+            field for field in get_user_model()._meta.concrete_fields
+            if field.name not in SNAPSHOT_EXCLUDED_FIELDS
+        ]
+
+    @classmethod
+    def get(cls, user_id):
+        try:
+            raw = redis_storage.connection.get(cls.build_key(user_id))
+        except RedisError as e:
+            logger.error(f"User snapshot cache unavailable: {e}")
+            return None
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        fields = cls.get_snapshot_fields()
+        if any(field.attname not in data for field in fields):
+            # written before a schema change
+            return None
+        values = [
+            None if data[field.attname] is None else field.to_python(data[field.attname])
+            for field in fields
+        ]
+        return get_user_model().from_db('default', [field.attname for field in fields], values)
+
+    @classmethod
+    def set(cls, user):
+        data = {}
+        for field in cls.get_snapshot_fields():
+            value = field.value_from_object(user)
+            data[field.attname] = None if value is None else field.value_to_string(user)
+        try:
+            redis_storage.connection.set(
+                cls.build_key(user.pk), json.dumps(data), ex=settings.AUTH_USER_CACHE_SECONDS
+            )
+        except RedisError as e:
+            logger.error(f"User snapshot cache unavailable: {e}")
+
+    @classmethod
+    def invalidate(cls, user_id):
+        try:
+            redis_storage.connection.delete(cls.build_key(user_id))
+        except RedisError as e:
+            logger.error(f"Could not invalidate user snapshot {user_id}: {e}")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that verifies the token once per request and rejects revoked
+    tokens (see TokenBlacklist).
+    The result (or the authentication error) is stored on the underlying HttpRequest,
+    so the middlewares and DRF share it, and the user comes from UserSnapshotCache.
+    """
+
+    def authenticate(self, request):
+        http_request = getattr(request, '_request', request)
+        cached = getattr(http_request, REQUEST_AUTH_ATTR, None)
+        if cached is None:
+            try:
+                cached = (super().authenticate(request), None)
+            except AuthenticationFailed as e:
+                cached = (None, e)
+            setattr(http_request, REQUEST_AUTH_ATTR, cached)
+
+        result, error = cached
+        if error is not None:
+            raise error
+        return result
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if TokenBlacklist.is_revoked(validated_token.payload):
+            raise InvalidToken(_("Token is blacklisted"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = UserSnapshotCache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            UserSnapshotCache.set(user)
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    @classmethod
+    def get_request_user(cls, request) -> Optional[object]:
+        """
+        Authenticated user for middlewares, None for anonymous or invalid tokens.
+        """
+        try:
+            result = cls().authenticate(request)
+        except AuthenticationFailed as e:
+            logger.debug(f"JWT authentication failed: {e}")
+            return None
+        return result[0] if result else None
@@ -0,0 +1,29 @@
+import hashlib
+
+
+class BloomFilter:
+    """
+    Fixed size in-process Bloom filter.
+    A miss is definite, a hit must be confirmed against the real store.
+    Members can't be removed, rebuild the filter instead.
+    """
+    __slots__ = ('size', 'hash_count', 'bits')
+
+    def __init__(self, size: int, hash_count: int):
+        self.size = size
+        self.hash_count = hash_count
+        self.bits = bytearray((size + 7) // 8)
+
+    def _positions(self, value: str):
+        # double hashing: k positions out of one 128 bit digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
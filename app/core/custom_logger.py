@@ -1,30 +1,110 @@
 import os
+import sys
+import random
+import threading
+import time
 from datetime import timedelta
 from loguru import logger
 
 
 LOG_DIR = "/app/logs"
+# settings.py imports this module, so logging is configured from the environment
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# one JSON object per line on stdout instead of the colored text format
+LOG_JSON = bool(int(os.environ.get("LOG_JSON", False)))
+# sinks are written by a background thread, callers only put the record on a queue
+LOG_ENQUEUE = bool(int(os.environ.get("LOG_ENQUEUE", True)))
+# per module sampling of records below WARNING, eg "notifications.task_sender=0.1,business.tasks=0.5"
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "")
+# max records below WARNING per module and second, 0 disables the limit
+LOG_RATE_LIMIT_PER_SECOND = int(os.environ.get("LOG_RATE_LIMIT_PER_SECOND", 0))
+
+WARNING_LEVEL_NO = logger.level("WARNING").no
+
+TEXT_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+
+def parse_sample_rates(value: str) -> dict:
+    rates = {}
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class LogSampler:
+    """
+    loguru filter that drops part of the records below WARNING, warnings and errors
+    always pass.
+    - sampling: keep a fraction of the records of a module (longest matching module
+      prefix in sample_rates), or of a single call with logger.bind(sample=0.01)
+    - rate limit: at most rate_limit records per module and second
+    """
+
+    def __init__(self, sample_rates: dict = None, rate_limit: int = 0):
+        self.sample_rates = sample_rates or {}
+        self.rate_limit = rate_limit
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def get_rate(self, name: str) -> float:
+        while name:
+            if name in self.sample_rates:
+                return self.sample_rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def is_limited(self, name: str) -> bool:
+        window = int(time.monotonic())
+        with self._lock:
+            current, count = self._windows.get(name, (window, 0))
+            if current != window:
+                count = 0
+            self._windows[name] = (window, count + 1)
+        return count >= self.rate_limit
+
+    def __call__(self, record) -> bool:
+        if record["level"].no >= WARNING_LEVEL_NO:
+            return True
+        name = record["name"] or ""
+        rate = record["extra"].get("sample", self.get_rate(name))
+        if rate < 1 and random.random() >= rate:
+            return False
+        if self.rate_limit and self.is_limited(name):
+            return False
+        return True
+
+
 try:
     os.makedirs(LOG_DIR, exist_ok=True)
-    logger.info(f"Logs directory setuped: {os.path.abspath(LOG_DIR)}")
 except Exception as e:
     logger.error(f"Error in logs directory creation: {e}")
 
 logger.remove()
 
+sampler = LogSampler(parse_sample_rates(LOG_SAMPLE_RATES), LOG_RATE_LIMIT_PER_SECOND)
+
 logger.add(
-    sink=lambda msg: print(msg, end=""),
-    level="INFO",
-    colorize=True,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+    sink=sys.stdout,
+    level=LOG_LEVEL,
+    colorize=not LOG_JSON,
+    serialize=LOG_JSON,
+    enqueue=LOG_ENQUEUE,
+    filter=sampler,
+    format=TEXT_FORMAT,
 )
 
 logger.add(
     sink=f"{LOG_DIR}/logs.log",
-    level="DEBUG",
+    # not DEBUG, so debug calls stay a level check when the console is at INFO
+    level="SUCCESS",
     filter=lambda record: record["level"].name in {"WARNING", "ERROR", "SUCCESS"},
+    enqueue=LOG_ENQUEUE,
     rotation=timedelta(days=1),
     retention=timedelta(days=7),
     compression="zip",
     format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
\ No newline at end of file
+)
+
+logger.debug(f"Logs directory setuped: {os.path.abspath(LOG_DIR)}")
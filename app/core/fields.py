@@ -1,6 +1,8 @@
 from rest_framework.fields import ListField
 from rest_framework import serializers
 
+from core.images import IMAGE_FIELDS, ImageDerivatives
+
 
 class ManyToManyFormDataField(ListField):
     """
@@ -68,3 +70,29 @@ class ReadWriteSerializerMethodField(serializers.SerializerMethodField):
 
     def to_internal_value(self, data):
         return {self.field_name: data}
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only URLs of the resized variants of a model image, see core.images.ImageDerivatives. Is None until the
+    variants of the current image are generated, clients then fall back to the original image. E. g.
+
+    class GallerySerializer(...):
+        image_variants = ImageVariantsField()
+
+    class EmployeeSerializer(...):
+        avatar_variants = ImageVariantsField(source="user")  # variants of employee.user.avatar
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "*")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        field_name, variants_field = IMAGE_FIELDS[instance._meta.label]
+        field_file = getattr(instance, field_name)
+        variants = getattr(instance, variants_field)
+        if not ImageDerivatives.is_current(field_file.name, variants):
+            return None
+        return ImageDerivatives.urls(variants, field_file.storage)
@@ -1,14 +1,67 @@
 """GoogleCloudStorage extension classes for MEDIA and STATIC uploads"""
 from urllib.parse import urljoin
 from django.conf import settings
+from django.core.files.storage import default_storage
 from storages.backends.gcloud import GoogleCloudStorage
 from storages.utils import setting
 from google.cloud import storage
 import datetime
+import os
+import threading
 import requests
 
+from core.custom_logger import logger
 
-class GoogleCloudMediaFileStorage(GoogleCloudStorage):
+
+# max calls in one GCS batch request
+GCS_BATCH_SIZE = 100
+
+_client_lock = threading.Lock()
+_clients = {}
+
+
+def get_storage_client():
+    """
+    Process-wide storage client, auth tokens and HTTP connections are reused between calls.
+    Keyed by pid so forked workers create their own instead of sharing the parent's sockets.
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(pid)
+            if client is None:
+                _clients.clear()
+                client = storage.Client(project=setting("GS_PROJECT_ID"), credentials=setting("GS_CREDENTIALS"))
+                _clients[pid] = client
+    return client
+
+
+def delete_media_files(names, storage_backend=None):
+    """
+    Deletes media files, in GCS batch requests when media is on the bucket.
+    """
+    storage_backend = storage_backend or default_storage
+    names = [name for name in dict.fromkeys(names) if name]
+    if isinstance(storage_backend, GoogleCloudMediaFileStorage):
+        return storage_backend.delete_blobs(names)
+    for name in names:
+        try:
+            storage_backend.delete(name)
+        except Exception as e:
+            logger.warning("Could not delete media file {}: {}", name, e)
+    return len(names)
+
+
+class PooledClientMixin:
+    """Storage backends share the process-wide client instead of creating one per instance."""
+
+    @property
+    def client(self):
+        return get_storage_client()
+
+
+class GoogleCloudMediaFileStorage(PooledClientMixin, GoogleCloudStorage):
     """Google file storage class which gives a media file path from MEDIA_URL
     not google generated one."""
     bucket_name = setting('GS_MEDIA_BUCKET_NAME')
@@ -16,6 +69,35 @@ class GoogleCloudMediaFileStorage(GoogleCloudStorage):
     def url(self, name):
         """Gives correct MEDIA_URL and not google generated url."""
         return urljoin(settings.MEDIA_URL, name)
+
+    @classmethod
+    def get_bucket(cls):
+        return get_storage_client().bucket(cls.bucket_name)
+
+    @classmethod
+    def delete_blobs(cls, blob_names, batch_size=GCS_BATCH_SIZE):
+        """
+        Deletes blobs in batch requests of batch_size calls, missing blobs are ignored.
+        Returns the number of blobs sent for deletion.
+        """
+        blob_names = list(blob_names)
+        client = get_storage_client()
+        bucket = cls.get_bucket()
+        for start in range(0, len(blob_names), batch_size):
+            chunk = blob_names[start:start + batch_size]
+            try:
+                with client.batch(raise_exception=False):
+                    for blob_name in chunk:
+                        bucket.delete_blob(blob_name)
+            except Exception as e:
+                logger.warning("Could not delete {} blobs from {}: {}", len(chunk), cls.bucket_name, e)
+        return len(blob_names)
+
+    @classmethod
+    def iter_blobs(cls, prefix=None):
+        """Yields (name, updated) of every blob in the bucket, listed page by page."""
+        for blob in get_storage_client().list_blobs(cls.bucket_name, prefix=prefix, fields="items(name,updated),nextPageToken"):
+            yield blob.name, blob.updated
     
     @classmethod
     def get_file_number_of_plays(cls, file_url):
@@ -25,8 +107,7 @@ class GoogleCloudMediaFileStorage(GoogleCloudStorage):
             blob_name = file_url.replace(settings.MEDIA_URL, "")
             
             # Initialize the Google Cloud Storage client
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(cls.bucket_name)
+            bucket = cls.get_bucket()
             blob = bucket.get_blob(blob_name)
             
             objs = {
@@ -63,42 +144,59 @@ class GoogleCloudMediaFileStorage(GoogleCloudStorage):
         try:
             blob_name = file_url.replace(settings.MEDIA_URL, "")
             print("blob_name: ", blob_name)
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(cls.bucket_name)
-            blob = bucket.blob(blob_name)
+            blob = cls.get_bucket().blob(blob_name)
             blob.delete()
         except Exception as e:
             print("Error deleting file: ", e)
             return False
     
     @classmethod
-    def get_singed_put_url(cls, blob_name, model_name=None, instance_uid=None):
+    def get_singed_put_url(
+        cls,
+        blob_name,
+        model_name=None,
+        instance_uid=None,
+        content_type="application/octet-stream",
+        expiration=datetime.timedelta(minutes=20),
+        headers=None,
+    ):
+        """
+        V4 signed PUT url of a blob. The uploader has to send the same Content-Type and headers,
+        e.g. {"x-goog-content-length-range": "0,<max bytes>"} to let the bucket reject bigger files.
+        """
         blob_path = f"files/{blob_name}"
         if model_name:
             blob_path = f"{model_name}/{blob_name}"
         if model_name and instance_uid:
             blob_path = f"{model_name}/{instance_uid}/{blob_name}"
         
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(cls.bucket_name)
-        blob = bucket.blob(blob_path)
+        blob = cls.get_bucket().blob(blob_path)
 
         url = blob.generate_signed_url(
             version="v4",
-            expiration=datetime.timedelta(minutes=20),
+            expiration=expiration,
             method="PUT",
-            content_type="application/octet-stream",
+            content_type=content_type,
+            headers=headers,
         )
         public_url = f"https://storage.googleapis.com/{cls.bucket_name}/{blob_path}"
         return url, public_url
 
+    @classmethod
+    def get_blob_stat(cls, blob_name):
+        """Returns {"size", "content_type"} of an uploaded blob, None if it does not exist."""
+        blob = cls.get_bucket().get_blob(blob_name)
+        if blob is None:
+            return None
+        return {"size": blob.size, "content_type": blob.content_type}
+
     @classmethod
     def upload_file(cls, url, file_bytes):
         response = requests.put(url, data=file_bytes, headers={"Content-Type": "application/octet-stream"})
         print("response.text: ", response.text)
         return response.status_code == 200
 
-class GoogleCloudStaticFileStorage(GoogleCloudStorage):
+class GoogleCloudStaticFileStorage(PooledClientMixin, GoogleCloudStorage):
     """Google file storage class which gives a media file path from MEDIA_URL
     not google generated one."""
 
@@ -0,0 +1,168 @@
+import io
+import os
+from typing import Dict, Iterable, Optional
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from core.authentication import UserSnapshotCache
+from core.custom_logger import logger
+from core.gcloud import delete_media_files
+
+
+# longest edge in pixels, images are never upscaled
+VARIANTS = {
+    "thumb": 160,
+    "card": 640,
+    "full": 1600,
+}
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# model label -> (image field, JSON field holding its variants)
+IMAGE_FIELDS = {
+    "business.Gallery": ("image", "image_variants"),
+    "business.Service": ("image", "image_variants"),
+    "business.Employee": ("avatar", "avatar_variants"),
+    "business.ServiceCategory": ("logo", "logo_variants"),
+    "user.User": ("avatar", "avatar_variants"),
+}
+
+
+class ImageDerivatives:
+    """
+    Resized WebP and JPEG copies of uploaded images, stored next to the original as
+    <original>__<model><pk>_<variant>.<ext>. The owning row is part of the name because
+    rows can share an original, e.g. an employee avatar copied from its user.
+    The variants of a field are kept in a JSON field of the same row:
+    {"source": <original name>, "thumb": {"webp": <name>, "jpeg": <name>, "width": .., "height": ..}, ...}
+    A variants dict whose source is not the current file name is stale and is never served.
+    """
+
+    @staticmethod
+    def variant_name(source: str, owner: str, variant: str, ext: str) -> str:
+        base, _ = os.path.splitext(source)
+        return f"{base}__{owner}_{variant}.{ext}"
+
+    @staticmethod
+    def to_rgb(image: Image.Image) -> Image.Image:
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            return background
+        return image.convert("RGB")
+
+    @classmethod
+    def generate(cls, field_file, owner: str) -> dict:
+        """
+        Render and store every variant of field_file, returns the variants dict.
+        owner: <model><pk> of the row the variants belong to.
+        """
+        with field_file.open("rb") as source:
+            image = Image.open(source)
+            image.load()
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        storage = field_file.storage
+        variants = {"source": field_file.name}
+        for variant, edge in VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            entry = {"width": resized.width, "height": resized.height}
+            for ext, (image_format, params) in FORMATS.items():
+                frame = resized if image_format == "WEBP" else cls.to_rgb(resized)
+                buffer = io.BytesIO()
+                frame.save(buffer, image_format, **params)
+                name = cls.variant_name(field_file.name, owner, variant, ext)
+                if storage.exists(name):
+                    storage.delete(name)
+                entry[ext] = storage.save(name, ContentFile(buffer.getvalue()))
+            variants[variant] = entry
+        return variants
+
+    @staticmethod
+    def iter_names(variants: Optional[dict]):
+        for variant in VARIANTS:
+            entry = (variants or {}).get(variant) or {}
+            for ext in FORMATS:
+                if entry.get(ext):
+                    yield entry[ext]
+
+    @classmethod
+    def delete(cls, storage, variants: Optional[dict], keep: Iterable[str] = ()):
+        keep = set(keep)
+        delete_media_files([name for name in cls.iter_names(variants) if name not in keep], storage)
+
+    @staticmethod
+    def rows_updated(label: str, pk: int):
+        """
+        Call after a queryset update of the variants, update() skips the save signals
+        that drop cached copies of the row.
+        """
+        if label == "user.User":
+            UserSnapshotCache.invalidate(pk)
+
+    @classmethod
+    def process(cls, label: str, pk: int, stale: Optional[dict] = None) -> bool:
+        """
+        Generate the variants of one row and store them, unless the image changed
+        meanwhile. stale: previous variants, deleted once the new ones are stored.
+        """
+        model = apps.get_model(label)
+        field_name, variants_field = IMAGE_FIELDS[label]
+        instance = model.objects.filter(pk=pk).only("pk", field_name).first()
+        if instance is None:
+            return False
+        field_file = getattr(instance, field_name)
+        storage = model._meta.get_field(field_name).storage
+
+        variants = {}
+        if field_file:
+            try:
+                variants = cls.generate(field_file, owner=f"{model._meta.model_name}{pk}")
+            except Exception as e:
+                logger.error(f"Could not generate variants of {label} {pk} ({field_file.name}): {e}")
+                return False
+
+        rows = model.objects.filter(pk=pk)
+        if field_file:
+            rows = rows.filter(**{field_name: field_file.name})
+        updated = rows.update(**{variants_field: variants})
+        if not updated:
+            # the image was replaced while rendering, its own task renders the new one
+            cls.delete(storage, variants)
+            return False
+        cls.rows_updated(label, pk)
+        cls.delete(storage, stale, keep=cls.iter_names(variants))
+        return True
+
+    @staticmethod
+    def is_current(source: Optional[str], variants: Optional[dict]) -> bool:
+        return bool(source) and bool(variants) and variants.get("source") == source
+
+    @staticmethod
+    def urls(variants: Optional[dict], storage) -> Optional[Dict[str, dict]]:
+        """
+        {"thumb": {"webp": url, "jpeg": url, "width": .., "height": ..}, "card": .., "full": ..}
+        or None when the variants are not generated yet.
+        """
+        if not variants or not variants.get("source"):
+            return None
+        result = {}
+        for variant in VARIANTS:
+            entry = variants.get(variant)
+            if not entry:
+                return None
+            result[variant] = {
+                **{ext: storage.url(entry[ext]) for ext in FORMATS if entry.get(ext)},
+                "width": entry.get("width"),
+                "height": entry.get("height"),
+            }
+        return result
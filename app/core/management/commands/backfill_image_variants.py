@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.images import IMAGE_FIELDS, ImageDerivatives
+from core.tasks import generate_image_variants_task
+
+
+class Command(BaseCommand):
+    help = 'Generate the missing or stale image variants of existing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', choices=sorted(IMAGE_FIELDS), help='Model label, repeatable, default all')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows read per query')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many rows per model')
+        parser.add_argument('--sync', action='store_true', help='Render inline instead of queueing celery tasks')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        for label in options['model'] or sorted(IMAGE_FIELDS):
+            model = apps.get_model(label)
+            field_name, variants_field = IMAGE_FIELDS[label]
+            rows = (
+                model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .order_by('pk')
+                .values_list('pk', field_name, variants_field)
+            )
+
+            queued = 0
+            for pk, source, variants in rows.iterator(chunk_size=options['batch_size']):
+                if ImageDerivatives.is_current(source, variants):
+                    continue
+                stale = variants or None
+                if options['sync']:
+                    ImageDerivatives.process(label, pk, stale=stale)
+                else:
+                    generate_image_variants_task.delay(label, pk, stale)
+                queued += 1
+                if options['limit'] and queued >= options['limit']:
+                    break
+
+            action = 'Processed' if options['sync'] else 'Queued'
+            self.stdout.write(self.style.SUCCESS(f'{action} {queued} {label} rows'))
+
+# to run this command use: python manage.py backfill_image_variants [--model business.Gallery] [--batch-size 500] [--sync]
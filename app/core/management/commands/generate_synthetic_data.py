@@ -0,0 +1,349 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from business import enums as business_enums
+from business import models as business_models
+from business.utils.schedule_writer import ScheduleWriter
+from notifications import models as notification_models
+from onboarding import models as onboarding_models
+from rating import models as rating_models
+from user import enums as user_enums
+from user import models as user_models
+import settings
+
+
+# synthetic users are found again by this prefix, eg by run_benchmark
+EMAIL_PREFIX = "synthetic+"
+PASSWORD = "synthetic123"
+
+# (longitude, latitude), businesses are spread around these with a few km of noise
+CITIES = [
+    (19.8187, 41.3275),  # Tirana
+    (19.4565, 41.3231),  # Durres
+    (20.0847, 40.7086),  # Berat
+    (19.5033, 40.4661),  # Vlore
+    (-0.1276, 51.5072),  # London
+    (13.4050, 52.5200),  # Berlin
+]
+CITY_SPREAD_DEGREES = 0.05
+
+SCHEDULES = [
+    [(day.value, datetime.time(9, 0), datetime.time(18, 0), business_enums.VisitTypeChoices.ON_SITE)
+     for day in business_enums.DayOfWeekChoices if day != business_enums.DayOfWeekChoices.SUNDAY],
+    [(day.value, datetime.time(8, 0), datetime.time(14, 0), business_enums.VisitTypeChoices.ON_SITE)
+     for day in business_enums.DayOfWeekChoices],
+    [(day.value, datetime.time(12, 0), datetime.time(20, 0), business_enums.VisitTypeChoices.HOME_VISIT)
+     for day in business_enums.DayOfWeekChoices if day not in (
+         business_enums.DayOfWeekChoices.SATURDAY, business_enums.DayOfWeekChoices.SUNDAY)],
+]
+
+
+NOT_PRODUCTION_FLAG = '--i-know-this-is-not-production'
+
+
+def ensure_not_production(options: dict):
+    """
+    Load test commands write to the configured database, only run them with DEBUG on
+    or when the caller confirms the database is not production.
+    """
+    if settings.DEBUG or options['i_know_this_is_not_production']:
+        return
+    raise CommandError(f'DEBUG is off, refusing to touch this database. Pass {NOT_PRODUCTION_FLAG} if it is not production.')
+
+
+def chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic businesses, clients, bookings, ratings and notifications for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--businesses', type=int, default=100)
+        parser.add_argument('--services', type=int, default=8, help='Services per business')
+        parser.add_argument('--employees', type=int, default=4, help='Employees per business')
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--ratings', type=int, default=20000)
+        parser.add_argument('--notifications', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=60, help='Bookings are spread over this many days around today')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(NOT_PRODUCTION_FLAG, action='store_true')
+
+    def handle(self, *args, **options):
+        ensure_not_production(options)
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.run_tag = str(int(time.time()))
+        self.password = make_password(PASSWORD)
+
+        categories = self.create_categories()
+        owners = self.create_users(options['businesses'], 'owner')
+        businesses = self.create_businesses(owners, categories)
+        services = self.create_services(businesses, categories, options['services'])
+        employees = self.create_employees(businesses, services, options['employees'])
+        self.create_schedules(businesses, services, employees)
+
+        clients = self.create_users(options['clients'], 'client')
+        self.create_costumers(clients)
+        bookings = self.create_bookings(clients, businesses, services, employees, options['bookings'], options['days'])
+        self.create_ratings(bookings, options['ratings'])
+        self.create_notifications(clients, options['notifications'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done, run {self.run_tag}: {len(businesses)} businesses, {len(services)} services, '
+            f'{len(employees)} employees, {len(clients)} clients, {options["bookings"]} bookings'
+        ))
+
+    def log(self, message: str):
+        self.stdout.write(f'[{self.run_tag}] {message}')
+
+    def random_point(self) -> Point:
+        longitude, latitude = self.random.choice(CITIES)
+        return Point(
+            longitude + self.random.gauss(0, CITY_SPREAD_DEGREES),
+            latitude + self.random.gauss(0, CITY_SPREAD_DEGREES),
+            srid=4326,
+        )
+
+    def create_categories(self):
+        categories = list(business_models.ServiceCategory.objects.filter(parent__isnull=False).select_related('parent'))
+        if categories:
+            return categories
+
+        for name in ('Hair', 'Nails', 'Massage', 'Makeup', 'Barber'):
+            parent = business_models.ServiceCategory.objects.create(name=name)
+            categories += business_models.ServiceCategory.objects.bulk_create([
+                business_models.ServiceCategory(
+                    name=f'{name} {index}',
+                    parent=parent,
+                    duration=datetime.timedelta(minutes=30 * (1 + index % 3)),
+                )
+                for index in range(4)
+            ])
+        self.log(f'Created {len(categories)} categories')
+        return categories
+
+    def create_users(self, total: int, kind: str):
+        users = []
+        for start, size in chunks(total, self.batch_size):
+            with transaction.atomic():
+                settings_rows = user_models.UserNotificationSettings.objects.bulk_create(
+                    [user_models.UserNotificationSettings() for _ in range(size)]
+                )
+                users += get_user_model().objects.bulk_create([
+                    get_user_model()(
+                        email=f'{EMAIL_PREFIX}{kind}-{self.run_tag}-{start + index}@example.com',
+                        password=self.password,
+                        name=f'{kind.title()} {start + index}',
+                        notification_settings=settings_rows[index],
+                        is_email_verified=True,
+                    )
+                    for index in range(size)
+                ])
+        self.log(f'Created {len(users)} {kind} users')
+        return users
+
+    def create_businesses(self, owners, categories):
+        businesses = []
+        for start, size in chunks(len(owners), self.batch_size):
+            rows = []
+            for owner in owners[start:start + size]:
+                location = self.random_point()
+                category = self.random.choice(categories)
+                rows.append(business_models.Business(
+                    user=owner,
+                    name=owner.name,
+                    store_name=f'Studio {owner.id}',
+                    address=f'Synthetic street {owner.id}',
+                    location=location,
+                    longitude=location.x,
+                    latitude=location.y,
+                    category=category.parent,
+                    visit_type=self.random.choice(business_enums.VisitTypeChoices.values),
+                    business_type=business_enums.BusinessTypeChoices.BUSINESS,
+                ))
+            with transaction.atomic():
+                created = business_models.Business.objects.bulk_create(rows)
+                business_models.BusinessNotificationSenderSettings.objects.bulk_create([
+                    business_models.BusinessNotificationSenderSettings(business=business)
+                    for business in created
+                ])
+                business_models.Business.categories.through.objects.bulk_create([
+                    business_models.Business.categories.through(business_id=business.id, servicecategory_id=category.id)
+                    for business in created
+                    for category in self.random.sample(categories, 3)
+                ])
+                # bulk_create skips the signals that keep these in sync
+                get_user_model().objects.bulk_update(
+                    [
+                        get_user_model()(
+                            pk=business.user_id,
+                            role=user_enums.UserRoleChoices.BUSINESS.value,
+                            primary_business_id=business.id,
+                        )
+                        for business in created
+                    ],
+                    ['role', 'primary_business'],
+                )
+            businesses += created
+        self.log(f'Created {len(businesses)} businesses')
+        return businesses
+
+    def create_services(self, businesses, categories, per_business: int):
+        rows = [
+            business_models.Service(
+                business=business,
+                name=f'Service {index}',
+                duration=datetime.timedelta(minutes=30 * (1 + index % 3)),
+                price=self.random.randint(10, 120),
+                category=self.random.choice(categories),
+            )
+            for business in businesses
+            for index in range(per_business)
+        ]
+        services = business_models.Service.objects.bulk_create(rows, batch_size=self.batch_size)
+        business_models.Service.categories.through.objects.bulk_create(
+            [
+                business_models.Service.categories.through(service_id=service.id, servicecategory_id=service.category_id)
+                for service in services
+            ],
+            batch_size=self.batch_size,
+        )
+        self.log(f'Created {len(services)} services')
+        return services
+
+    def create_employees(self, businesses, services, per_business: int):
+        rows = [
+            business_models.Employee(business=business, name=f'Employee {index}')
+            for business in businesses
+            for index in range(per_business)
+        ]
+        employees = business_models.Employee.objects.bulk_create(rows, batch_size=self.batch_size)
+
+        services_by_business = {}
+        for service in services:
+            services_by_business.setdefault(service.business_id, []).append(service)
+        through = business_models.Employee.services.through
+        through.objects.bulk_create(
+            [
+                through(employee_id=employee.id, service_id=service.id)
+                for employee in employees
+                for service in services_by_business.get(employee.business_id, [])
+                if self.random.random() < 0.6
+            ],
+            batch_size=self.batch_size,
+        )
+        self.log(f'Created {len(employees)} employees')
+        return employees
+
+    def create_schedules(self, businesses, services, employees):
+        # one ScheduleWriter call per schedule template, owners share the WorkingHours rows
+        owners_by_schedule = {index: [] for index in range(len(SCHEDULES))}
+        for owner in [*businesses, *services, *employees]:
+            owners_by_schedule[self.random.randrange(len(SCHEDULES))].append(owner)
+        for index, owners in owners_by_schedule.items():
+            for start, size in chunks(len(owners), self.batch_size):
+                ScheduleWriter.replace(owners[start:start + size], SCHEDULES[index])
+        self.log('Created working hours')
+
+    def create_costumers(self, clients):
+        onboarding_models.Costumer.objects.bulk_create(
+            [onboarding_models.Costumer(user=client, name=client.name) for client in clients],
+            batch_size=self.batch_size,
+        )
+        get_user_model().objects.filter(pk__in=[client.pk for client in clients]).update(
+            role=user_enums.UserRoleChoices.COSTUMER.value,
+        )
+
+    def create_bookings(self, clients, businesses, services, employees, total: int, days: int):
+        services_by_business = {}
+        for service in services:
+            services_by_business.setdefault(service.business_id, []).append(service)
+        employees_by_business = {}
+        for employee in employees:
+            employees_by_business.setdefault(employee.business_id, []).append(employee)
+
+        today = timezone.localdate()
+        statuses = business_enums.BookingStatusChoices.values
+        through = business_models.UserBusinesBooking.services.through
+        # (id, business_id, user_id, employee_id) only, millions of instances do not fit in memory
+        bookings = []
+        for start, size in chunks(total, self.batch_size):
+            rows = []
+            for _ in range(size):
+                business = self.random.choice(businesses)
+                booking_date = today + datetime.timedelta(days=self.random.randint(-days // 2, days // 2))
+                hour = self.random.randint(8, 18)
+                business_employees = employees_by_business.get(business.id) or [None]
+                rows.append(business_models.UserBusinesBooking(
+                    user=self.random.choice(clients),
+                    business=business,
+                    employee=self.random.choice(business_employees),
+                    date=booking_date,
+                    day_of_week=business_enums.DayOfWeekChoices.values[booking_date.weekday()],
+                    start_time=datetime.time(hour, 0),
+                    end_time=datetime.time(hour, 30),
+                    visit_type=business_enums.VisitTypeChoices.ON_SITE,
+                    status=self.random.choice(statuses),
+                    was_user_reminded=booking_date < today,
+                    was_user_reminded_daily=booking_date < today,
+                ))
+            with transaction.atomic():
+                created = business_models.UserBusinesBooking.objects.bulk_create(rows)
+                through.objects.bulk_create([
+                    through(userbusinesbooking_id=booking.id, service_id=service.id)
+                    for booking in created
+                    for service in self.random.sample(
+                        services_by_business.get(booking.business_id, []),
+                        min(2, len(services_by_business.get(booking.business_id, []))),
+                    )
+                ])
+            bookings += [(booking.id, booking.business_id, booking.user_id, booking.employee_id) for booking in created]
+            self.log(f'Created {len(bookings)} bookings')
+        return bookings
+
+    def create_ratings(self, bookings, total: int):
+        sample = self.random.sample(bookings, min(total, len(bookings)))
+        for start, size in chunks(len(sample), self.batch_size):
+            rating_models.Rating.objects.bulk_create([
+                rating_models.Rating(
+                    user_id=user_id,
+                    booking_id=booking_id,
+                    business_id=business_id,
+                    employee_id=employee_id,
+                    rating=self.random.choices([5, 4, 3, 2, 1], weights=[50, 25, 12, 8, 5])[0],
+                    comment='Synthetic review',
+                )
+                for booking_id, business_id, user_id, employee_id in sample[start:start + size]
+            ])
+        self.log(f'Created {len(sample)} ratings')
+
+    def create_notifications(self, clients, total: int):
+        now = timezone.now()
+        for start, size in chunks(total, self.batch_size):
+            rows = []
+            for _ in range(size):
+                sent_at = now - datetime.timedelta(minutes=self.random.randint(0, 60 * 24 * 90))
+                rows.append(notification_models.NotificationObject(
+                    user=self.random.choice(clients),
+                    title='Synthetic notification',
+                    body='Your booking was confirmed',
+                    is_sent=True,
+                    sent_at=sent_at,
+                    read_at=sent_at if self.random.random() < 0.7 else None,
+                ))
+            notification_models.NotificationObject.objects.bulk_create(rows)
+            self.log(f'Created {start + size} notifications')
+
+# to run this command use: python manage.py generate_synthetic_data [--i-know-this-is-not-production] --businesses 1000 --clients 50000 --bookings 2000000 --seed 1
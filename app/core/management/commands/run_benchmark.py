@@ -0,0 +1,221 @@
+import datetime
+import json
+import os
+import random
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from business import models as business_models
+from core.management.commands.generate_synthetic_data import (
+    EMAIL_PREFIX,
+    CITIES,
+    NOT_PRODUCTION_FLAG,
+    ensure_not_production,
+)
+from user import enums as user_enums
+
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'benchmarks')
+DEFAULT_REQUESTS_FILE = os.path.join(BENCHMARKS_DIR, 'request_mix.jsonl')
+DEFAULT_BASELINE_FILE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+# how many synthetic objects are loaded to fill the path placeholders
+SAMPLE_SIZE = 500
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Replay a weighted request mix against the synthetic dataset and report latency, queries and memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests-file', default=DEFAULT_REQUESTS_FILE)
+        parser.add_argument('--requests', type=int, default=1000, help='Number of measured requests')
+        parser.add_argument('--warmup', type=int, default=50)
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE_FILE)
+        parser.add_argument('--save-baseline', action='store_true')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p90 slowdown against the baseline')
+        parser.add_argument('--trace-memory', action='store_true', help='Peak Python allocations per request, slow')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(NOT_PRODUCTION_FLAG, action='store_true')
+
+    def handle(self, *args, **options):
+        # requests run against the configured database, and a mix entry can use any method
+        ensure_not_production(options)
+        # testserver host, locmem mail backend
+        setup_test_environment()
+        self.random = random.Random(options['seed'])
+        self.client = APIClient()
+
+        mix = self.load_mix(options['requests_file'])
+        self.load_samples()
+
+        for _ in range(options['warmup']):
+            self.run_request(self.random.choices(mix, weights=[entry.get('weight', 1) for entry in mix])[0])
+
+        if options['trace_memory']:
+            tracemalloc.start()
+        measurements = defaultdict(lambda: {'latency': [], 'queries': [], 'memory': [], 'errors': 0})
+        for _ in range(options['requests']):
+            entry = self.random.choices(mix, weights=[item.get('weight', 1) for item in mix])[0]
+            result = self.run_request(entry, trace_memory=options['trace_memory'])
+            stats = measurements[entry['name']]
+            stats['latency'].append(result['latency'])
+            stats['queries'].append(result['queries'])
+            stats['memory'].append(result['memory'])
+            if result['status'] >= 400:
+                stats['errors'] += 1
+        if options['trace_memory']:
+            tracemalloc.stop()
+
+        report = self.build_report(measurements)
+        self.print_report(report)
+
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as baseline_file:
+                json.dump(report, baseline_file, indent=4, sort_keys=True)
+                baseline_file.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Saved baseline to {options["baseline"]}'))
+        elif os.path.exists(options['baseline']):
+            with open(options['baseline']) as baseline_file:
+                self.compare(report, json.load(baseline_file), options['tolerance'])
+
+    def load_mix(self, path: str) -> List[dict]:
+        with open(path) as requests_file:
+            mix = [json.loads(line) for line in requests_file if line.strip()]
+        if not mix:
+            raise CommandError(f'No requests in {path}')
+        return mix
+
+    def load_samples(self):
+        User = get_user_model()
+        synthetic = User.objects.filter(email__startswith=EMAIL_PREFIX)
+        self.users = {
+            'client': list(synthetic.filter(role=user_enums.UserRoleChoices.COSTUMER.value)[:SAMPLE_SIZE]),
+            'owner': list(
+                synthetic.filter(role=user_enums.UserRoleChoices.BUSINESS.value)
+                .select_related('primary_business')[:SAMPLE_SIZE]
+            ),
+        }
+        if not self.users['client'] or not self.users['owner']:
+            raise CommandError('No synthetic users found, run generate_synthetic_data first')
+
+        businesses = business_models.Business.objects.filter(user__email__startswith=EMAIL_PREFIX)
+        self.samples = {
+            'business_uid': list(businesses.values_list('uid', flat=True)[:SAMPLE_SIZE]),
+            'service_uid': list(
+                business_models.Service.objects.filter(business__in=businesses).values_list('uid', flat=True)[:SAMPLE_SIZE]
+            ),
+            'employee_uid': list(
+                business_models.Employee.objects.filter(business__in=businesses).values_list('uid', flat=True)[:SAMPLE_SIZE]
+            ),
+        }
+
+    def resolve(self, value: str, user) -> str:
+        if '{' not in value:
+            return value
+        longitude, latitude = self.random.choice(CITIES)
+        start_date = timezone.localdate() + datetime.timedelta(days=self.random.randint(0, 14))
+        placeholders = {
+            'longitude': longitude,
+            'latitude': latitude,
+            'start_date': start_date.isoformat(),
+            'end_date': (start_date + datetime.timedelta(days=6)).isoformat(),
+            'owner_business_uid': getattr(user.primary_business, 'uid', ''),
+        }
+        for name, values in self.samples.items():
+            if f'{{{name}}}' in value and values:
+                placeholders[name] = self.random.choice(values)
+        return value.format(**placeholders)
+
+    def run_request(self, entry: dict, trace_memory: bool = False) -> dict:
+        user = self.random.choice(self.users[entry.get('user', 'client')])
+        self.client.force_authenticate(user=user)
+        path = self.resolve(entry['path'], user)
+        params = {key: self.resolve(str(value), user) for key, value in entry.get('params', {}).items()}
+
+        counter = QueryCounter()
+        if trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = getattr(self.client, entry.get('method', 'get').lower())(path, params)
+        latency = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        return {'latency': latency, 'queries': counter.count, 'memory': memory, 'status': response.status_code}
+
+    def build_report(self, measurements: Dict[str, dict]) -> dict:
+        report = {}
+        for name, stats in sorted(measurements.items()):
+            latency_ms = [value * 1000 for value in stats['latency']]
+            report[name] = {
+                'requests': len(latency_ms),
+                'errors': stats['errors'],
+                'p50_ms': round(percentile(latency_ms, 50), 2),
+                'p90_ms': round(percentile(latency_ms, 90), 2),
+                'p99_ms': round(percentile(latency_ms, 99), 2),
+                'queries_mean': round(sum(stats['queries']) / len(stats['queries']), 2),
+                'queries_max': max(stats['queries']),
+                'peak_alloc_kb': round(max(stats['memory']) / 1024, 1),
+            }
+        # ru_maxrss is in KB on Linux
+        report['_process'] = {'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+        return report
+
+    def print_report(self, report: dict):
+        header = f'{"endpoint":<26}{"n":>6}{"err":>5}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"queries":>9}{"max q":>7}{"alloc kb":>10}'
+        self.stdout.write(header)
+        for name, row in report.items():
+            if name.startswith('_'):
+                continue
+            self.stdout.write(
+                f'{name:<26}{row["requests"]:>6}{row["errors"]:>5}{row["p50_ms"]:>10}{row["p90_ms"]:>10}'
+                f'{row["p99_ms"]:>10}{row["queries_mean"]:>9}{row["queries_max"]:>7}{row["peak_alloc_kb"]:>10}'
+            )
+        self.stdout.write(f'max rss: {report["_process"]["max_rss_kb"]} kb')
+
+    def compare(self, report: dict, baseline: dict, tolerance: float):
+        regressions = []
+        for name, row in report.items():
+            base = baseline.get(name)
+            if name.startswith('_') or not base:
+                continue
+            if row['p90_ms'] > base['p90_ms'] * (1 + tolerance):
+                regressions.append(f'{name}: p90 {base["p90_ms"]}ms -> {row["p90_ms"]}ms')
+            if row['queries_max'] > base['queries_max']:
+                regressions.append(f'{name}: max queries {base["queries_max"]} -> {row["queries_max"]}')
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+# to run this command use: python manage.py run_benchmark [--i-know-this-is-not-production] --requests 2000 --seed 1 [--save-baseline] [--trace-memory]
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from core.media_sweeper import OrphanMediaSweeper
+import settings
+
+
+class Command(BaseCommand):
+    help = 'List or delete media files no row references anymore'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help='Delete the orphans, only counted by default')
+        parser.add_argument('--grace-hours', type=int, default=settings.MEDIA_ORPHAN_SWEEP_GRACE_HOURS)
+        parser.add_argument('--max-deletes', type=int, default=settings.MEDIA_ORPHAN_SWEEP_MAX_DELETES)
+
+    def handle(self, *args, **options):
+        stats = OrphanMediaSweeper(
+            grace=datetime.timedelta(hours=options['grace_hours']),
+            max_deletes=options['max_deletes'],
+            dry_run=not options['delete'],
+        ).sweep()
+        self.stdout.write(
+            f'{stats["stored"]} stored, {stats["referenced"]} referenced, '
+            f'{stats["orphans"]} orphans, {stats["deleted"]} deleted'
+        )
+
+# to run this command use: python manage.py sweep_orphan_media [--delete] [--grace-hours 24]
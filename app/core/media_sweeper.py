@@ -0,0 +1,120 @@
+import datetime
+import os
+from typing import Iterator, Optional, Set, Tuple
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+from core.custom_logger import logger
+from core.gcloud import GoogleCloudMediaFileStorage, delete_media_files
+from core.images import IMAGE_FIELDS, ImageDerivatives
+from core.models import safe_file_path
+from onboarding import enums as onboarding_enums
+
+
+# direct uploads that were not attached yet are referenced by their upload row only
+DIRECT_UPLOAD_MODEL = "onboarding.DirectUpload"
+DIRECT_UPLOAD_PREFIX = "uploads"
+
+
+class OrphanMediaSweeper:
+    """
+    Deletes media files no model references anymore: originals of deleted rows, replaced
+    images, abandoned direct uploads.
+    - referenced: every FileField/ImageField value, the image variants and the pending direct uploads
+    - only top level directories that hold referenced files are swept, anything else in the
+      bucket is left alone
+    - files younger than grace are kept, they can belong to a transaction that did not commit yet
+    """
+
+    def __init__(self, grace: datetime.timedelta, max_deletes: int, dry_run: bool = True, storage=None):
+        self.grace = grace
+        self.max_deletes = max_deletes
+        self.dry_run = dry_run
+        self.storage = storage or default_storage
+
+    @staticmethod
+    def iter_file_fields() -> Iterator[Tuple[type, models.FileField]]:
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    yield model, field
+
+    @classmethod
+    def upload_directories(cls) -> Set[str]:
+        """
+        Top level directories the file fields upload to, kept even when every row of a model is gone.
+        """
+        directories = {DIRECT_UPLOAD_PREFIX}
+        for model, field in cls.iter_file_fields():
+            if field.upload_to is safe_file_path:
+                directories.add(model.__name__.lower())
+            elif isinstance(field.upload_to, str) and field.upload_to.strip("/"):
+                directories.add(cls.top_directory(field.upload_to.strip("/") + "/"))
+        return directories
+
+    def referenced_names(self) -> Set[str]:
+        names = set()
+        for model, field in self.iter_file_fields():
+            field_name = field.name
+            rows = model._base_manager.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            names.update(rows.values_list(field_name, flat=True).iterator(chunk_size=2000))
+
+        for label, (_, variants_field) in IMAGE_FIELDS.items():
+            rows = apps.get_model(label)._base_manager.exclude(**{variants_field: {}})
+            for variants in rows.values_list(variants_field, flat=True).iterator(chunk_size=2000):
+                names.update(ImageDerivatives.iter_names(variants))
+
+        statuses = onboarding_enums.DirectUploadStatusChoices
+        direct_upload = apps.get_model(DIRECT_UPLOAD_MODEL)
+        names.update(
+            direct_upload.objects.filter(
+                status__in=(statuses.PENDING, statuses.CONFIRMED),
+            ).values_list("object_name", flat=True)
+        )
+        return names
+
+    def iter_stored(self) -> Iterator[Tuple[str, Optional[datetime.datetime]]]:
+        if isinstance(self.storage, GoogleCloudMediaFileStorage):
+            yield from GoogleCloudMediaFileStorage.iter_blobs()
+            return
+
+        pending = [""]
+        while pending:
+            directory = pending.pop()
+            subdirectories, files = self.storage.listdir(directory)
+            pending.extend(os.path.join(directory, subdirectory) for subdirectory in subdirectories)
+            for file_name in files:
+                name = os.path.join(directory, file_name)
+                yield name, self.storage.get_modified_time(name)
+
+    @staticmethod
+    def top_directory(name: str) -> str:
+        return name.split("/", 1)[0] if "/" in name else ""
+
+    def sweep(self) -> dict:
+        referenced = self.referenced_names()
+        swept_directories = {self.top_directory(name) for name in referenced} | self.upload_directories()
+        swept_directories.discard("")
+        cutoff = timezone.now() - self.grace
+
+        stats = {"stored": 0, "referenced": len(referenced), "orphans": 0, "deleted": 0}
+        orphans = []
+        for name, updated in self.iter_stored():
+            stats["stored"] += 1
+            if name in referenced or self.top_directory(name) not in swept_directories:
+                continue
+            if updated is None or updated > cutoff:
+                continue
+            stats["orphans"] += 1
+            if len(orphans) < self.max_deletes:
+                orphans.append(name)
+
+        if orphans and not self.dry_run:
+            stats["deleted"] = delete_media_files(orphans, self.storage)
+        logger.info(
+            "Orphan media sweep{}: {}", " (dry run)" if self.dry_run else "", stats,
+        )
+        return stats
@@ -0,0 +1,199 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    In-process histogram with Prometheus text output, one series per label values.
+    Each worker process exports its own series.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts, sum, count
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @staticmethod
+    def format_labels(pairs) -> str:
+        return ",".join(
+            '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+            for name, value in pairs
+        )
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(buckets), total, count) for labels, (buckets, total, count) in self._series.items()}
+        for labels, (buckets, total, count) in sorted(series.items()):
+            pairs = list(zip(self.label_names, labels))
+            for bound, bucket_count in zip(self.buckets, buckets):
+                lines.append(f'{self.name}_bucket{{{self.format_labels(pairs + [("le", bound)])}}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{self.format_labels(pairs + [("le", "+Inf")])}}} {count}')
+            lines.append(f"{self.name}_sum{{{self.format_labels(pairs)}}} {total}")
+            lines.append(f"{self.name}_count{{{self.format_labels(pairs)}}} {count}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Wall time of the request.", ("view", "method", "status"), DURATION_BUCKETS
+)
+DB_QUERIES = Histogram("http_request_db_queries", "DB queries per request.", ("view",), COUNT_BUCKETS)
+DB_DURATION = Histogram("http_request_db_duration_seconds", "DB time per request.", ("view",), DURATION_BUCKETS)
+REDIS_CALLS = Histogram("http_request_redis_calls", "Redis round trips per request.", ("view",), COUNT_BUCKETS)
+REDIS_DURATION = Histogram("http_request_redis_duration_seconds", "Redis time per request.", ("view",), DURATION_BUCKETS)
+SERIALIZER_DURATION = Histogram(
+    "http_request_serializer_duration_seconds", "Serializer time per request.", ("view",), DURATION_BUCKETS
+)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size.", ("view",), SIZE_BUCKETS)
+
+REGISTRY = [
+    REQUEST_DURATION,
+    DB_QUERIES,
+    DB_DURATION,
+    REDIS_CALLS,
+    REDIS_DURATION,
+    SERIALIZER_DURATION,
+    RESPONSE_SIZE,
+]
+
+
+def render_metrics() -> str:
+    return "\n".join(line for histogram in REGISTRY for line in histogram.render()) + "\n"
+
+
+FINGERPRINT_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint_sql(sql: str) -> str:
+    """
+    SQL with literals and placeholder lists collapsed, so the same query with other
+    parameters or IN list lengths groups together.
+    """
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class RequestStats:
+    """
+    Counters of the request being handled, filled by the DB execute wrapper, the
+    instrumented Redis client and the serializer timers.
+    """
+    __slots__ = (
+        "db_queries", "db_time", "redis_calls", "redis_time",
+        "serializer_time", "serializer_depth", "sql",
+    )
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.redis_calls = 0
+        self.redis_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        # (sql, duration), fingerprinted only for slow requests
+        self.sql: List[Tuple[str, float]] = []
+
+    def db_execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_queries += 1
+            self.db_time += duration
+            self.sql.append((sql, duration))
+
+    def top_queries(self, limit: int = 5) -> List[Dict]:
+        grouped = defaultdict(lambda: [0, 0.0])
+        for sql, duration in self.sql:
+            entry = grouped[fingerprint_sql(sql)]
+            entry[0] += 1
+            entry[1] += duration
+        worst = sorted(grouped.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"fingerprint": fingerprint, "count": count, "time_ms": round(total * 1000, 2)}
+            for fingerprint, (count, total) in worst
+        ]
+
+
+current_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_redis_call(duration: float):
+    stats = current_stats.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_time += duration
+
+
+@contextmanager
+def measure_serializer():
+    """
+    Time spent in serializers, nested serializers are counted once.
+    """
+    stats = current_stats.get()
+    if stats is None:
+        yield
+        return
+    stats.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_depth -= 1
+        if stats.serializer_depth == 0:
+            stats.serializer_time += time.perf_counter() - start
+
+
+class InstrumentedProperty(property):
+    pass
+
+
+def instrument_serializers():
+    """
+    Wrap the data property of DRF serializers with measure_serializer.
+    """
+    from rest_framework import serializers
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        original = serializer_class.__dict__["data"]
+        if isinstance(original, InstrumentedProperty):
+            continue
+
+        def data(self, _getter=original.fget):
+            with measure_serializer():
+                return _getter(self)
+
+        serializer_class.data = InstrumentedProperty(data, doc=original.__doc__)
@@ -1,13 +1,17 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
 from django.http import JsonResponse
 from django.contrib.auth import get_user_model
 from django.utils.deprecation import MiddlewareMixin
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from user.models import UserDevice
+from user.device_blacklist import DeviceBlacklist
 from django.utils import translation
-from rest_framework.request import Request
 
 import settings
+from core.authentication import CachedJWTAuthentication
+from core.custom_logger import logger
+from core import metrics
 
 
 User = get_user_model()
@@ -24,32 +28,103 @@ class CostumAuthenticationMiddleware(MiddlewareMixin):
             return None
             
         try:
-            # Try to authenticate the user using JWT
-            jwt_auth = JWTAuthentication()
-            auth_result = jwt_auth.authenticate(request)
+            # Token is verified once here, DRF reuses the result stored on the request
+            user = CachedJWTAuthentication.get_request_user(request)
             
-            if auth_result is not None:
-                user, token = auth_result
-                
+            if user is not None:
                 # Check device blacklist
                 device_id = request.headers.get(settings.DEVICE_ID_HEADER, None)
                 if device_id:
-                    if UserDevice.objects.filter(device_id=device_id, user=user, is_blacklisted=True).exists():
+                    if DeviceBlacklist.is_blacklisted(user.id, device_id):
                         return JsonResponse(
                             {"detail": "This device is blacklisted."},
                             status=403
                         )
-            else:
-                print("No authenticated user found")
                 
-        except (InvalidToken, TokenError) as e:
-            print("JWT authentication failed:", e)
         except Exception as e:
-            print("Error in CostumAuthenticationMiddleware:", e)
+            logger.error(f"Error in CostumAuthenticationMiddleware: {e}")
             
         return None
 
 
+class RequestMetricsMiddleware:
+    """
+    Records per resolved view: wall time, DB queries and time, Redis calls and time,
+    serializer time and response size, into the histograms of core.metrics.
+    Requests slower than SLOW_REQUEST_MS are logged with their worst SQL fingerprints.
+    Must be the first middleware so the wall time covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if settings.REQUEST_METRICS_ENABLED:
+            metrics.instrument_serializers()
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats = metrics.RequestStats()
+        token = metrics.current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.db_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            metrics.current_stats.reset(token)
+        duration = time.perf_counter() - start
+
+        try:
+            self.observe(request, response, stats, duration)
+        except Exception as e:
+            logger.error(f"Error in RequestMetricsMiddleware: {e}")
+        return response
+
+    @staticmethod
+    def get_view_name(request) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        view = getattr(match.func, "view_class", match.func)
+        return f"{view.__module__}.{view.__name__}"
+
+    @staticmethod
+    def get_response_size(response) -> int:
+        if response.has_header("Content-Length"):
+            return int(response["Content-Length"])
+        if getattr(response, "streaming", False):
+            return 0
+        return len(response.content)
+
+    def observe(self, request, response, stats: metrics.RequestStats, duration: float):
+        view = self.get_view_name(request)
+        metrics.REQUEST_DURATION.observe((view, request.method, str(response.status_code)), duration)
+        metrics.DB_QUERIES.observe((view,), stats.db_queries)
+        metrics.DB_DURATION.observe((view,), stats.db_time)
+        metrics.REDIS_CALLS.observe((view,), stats.redis_calls)
+        metrics.REDIS_DURATION.observe((view,), stats.redis_time)
+        metrics.SERIALIZER_DURATION.observe((view,), stats.serializer_time)
+        metrics.RESPONSE_SIZE.observe((view,), self.get_response_size(response))
+
+        if duration * 1000 >= settings.SLOW_REQUEST_MS:
+            top_queries = stats.top_queries()
+            logger.bind(
+                view=view,
+                path=request.path,
+                status=response.status_code,
+                db_queries=stats.db_queries,
+                top_queries=top_queries,
+            ).warning(
+                f"Slow request {request.method} {request.path} ({view}): {duration * 1000:.0f}ms, "
+                f"db {stats.db_queries} queries/{stats.db_time * 1000:.0f}ms, "
+                f"redis {stats.redis_calls} calls/{stats.redis_time * 1000:.0f}ms, "
+                f"serializers {stats.serializer_time * 1000:.0f}ms; "
+                f"worst sql: {top_queries[:3]}"
+            )
+
+
 class LocaleTimeZoneMiddleware(MiddlewareMixin):
     """
     This is a very simple middleware that parses a request
@@ -80,7 +155,6 @@ class LocaleTimeZoneMiddleware(MiddlewareMixin):
 
     def _get_user(self, request):
         try:
-            user = JWTAuthentication().authenticate(Request(request))
-            return user[0]
+            return CachedJWTAuthentication.get_request_user(request)
         except Exception:
             return None
\ No newline at end of file
@@ -1,7 +1,7 @@
 from collections import OrderedDict
 from math import ceil
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -51,3 +51,44 @@ class DefaultPager(PageNumberPagination):
                 "results": schema,
             },
         }
+
+
+class DefaultCursorPager(CursorPagination):
+    """
+    Keyset pagination for large, append-only lists: every page is an index range
+    scan on the first ordering field, no COUNT(*).
+    The cursor keeps only the position on ordering[0], rows sharing that value are told
+    apart by an offset within them; the later fields just make their order stable.
+    Use a first field that rarely repeats, e.g. a timestamp.
+    """
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-id")
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("page_size", self.get_page_size(self.request)),
+                    ("page_size_query_param", self.page_size_query_param),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                },
+                "results": schema,
+            },
+        }
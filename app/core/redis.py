@@ -1,11 +1,44 @@
 from django.conf import settings
 
+import threading
+import time
+
 import redis
+from redis.client import Pipeline
+
+from core.custom_logger import logger
+from core.metrics import record_redis_call
+
+
+class InstrumentedPipeline(Pipeline):
+    def execute(self, raise_on_error=True):
+        start = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            record_redis_call(time.perf_counter() - start)
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Redis client that reports round trips and their time to the request metrics,
+    a pipeline counts as one call.
+    """
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            record_redis_call(time.perf_counter() - start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
 
 
 class RedisStorage:
     def __init__(self):
-        self.connection = redis.Redis(
+        self.connection = InstrumentedRedis(
             host=settings.REDIS_SERVER,
             db=settings.REDIS_APP_DB,
             password=settings.REDIS_PASSWORD,
@@ -15,3 +48,66 @@ class RedisStorage:
     
 
 redis_storage = RedisStorage()
+
+
+def subscribe_in_thread(channel: str, handler):
+    """
+    Run handler(message) for every message published on channel, in a daemon thread of
+    the current process. Returns the thread, or None if Redis is unavailable.
+    The thread stops on connection errors, callers should keep a periodic refresh.
+    """
+    def on_error(error, pubsub, thread):
+        logger.error(f"Redis subscriber for {channel} stopped: {error}")
+        thread.stop()
+        pubsub.close()
+
+    try:
+        pubsub = redis_storage.connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: handler})
+        return pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=on_error)
+    except redis.RedisError as e:
+        logger.error(f"Could not subscribe to {channel}: {e}")
+        return None
+
+
+class ChannelSubscription:
+    """
+    Keeps one subscribe_in_thread subscriber of the process alive. After a failed
+    subscription the next attempt waits MIN_RETRY_SECONDS, doubling up to MAX_RETRY_SECONDS,
+    so requests don't each try to reach a Redis that is down.
+    """
+
+    MIN_RETRY_SECONDS = 1
+    MAX_RETRY_SECONDS = 60
+
+    def __init__(self, channel: str, handler):
+        self.channel = channel
+        self.handler = handler
+        self.thread = None
+        self.retry_at = 0.0
+        self.retry_delay = self.MIN_RETRY_SECONDS
+        self.lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def should_subscribe(self) -> bool:
+        return not self.is_alive() and time.monotonic() >= self.retry_at
+
+    def ensure(self) -> bool:
+        """
+        True when a new subscriber started, state that depends on messages missed meanwhile
+        should be dropped by the caller.
+        """
+        if not self.should_subscribe():
+            return False
+        with self.lock:
+            if not self.should_subscribe():
+                return False
+            self.thread = subscribe_in_thread(self.channel, self.handler)
+            if self.thread is None:
+                self.retry_at = time.monotonic() + self.retry_delay
+                self.retry_delay = min(self.retry_delay * 2, self.MAX_RETRY_SECONDS)
+                return False
+            self.retry_delay = self.MIN_RETRY_SECONDS
+            return True
@@ -0,0 +1,78 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from core.images import IMAGE_FIELDS, ImageDerivatives
+from core.tasks import generate_image_variants_task, delete_media_files_task
+
+
+class MediaDeletionBatch:
+    """
+    Collects the media files deleted within one transaction and deletes them with a single
+    task once it commits, e.g. the variants of every gallery image of a deleted business.
+    Outside of a transaction every add is its own task.
+    """
+    _local = threading.local()
+
+    def __init__(self):
+        self.names = []
+
+    def flush(self):
+        if self.names:
+            delete_media_files_task.delay(self.names)
+
+    @classmethod
+    def add(cls, names):
+        names = list(names)
+        if not names:
+            return
+        connection = transaction.get_connection()
+        batch = getattr(cls._local, "batch", None)
+        # the callback list is cleared on commit and rollback, a listed batch is still open
+        if batch is not None and connection.in_atomic_block and any(
+            entry[1] == batch.flush for entry in connection.run_on_commit
+        ):
+            batch.names.extend(names)
+            return
+        batch = cls()
+        batch.names.extend(names)
+        cls._local.batch = batch
+        transaction.on_commit(batch.flush)
+
+
+def on_image_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    Render the variants of a new or replaced image once the transaction commits.
+    Variants of the previous image are cleared right away so they are never served.
+    """
+    label = sender._meta.label
+    field_name, variants_field = IMAGE_FIELDS[label]
+    if update_fields is not None and field_name not in update_fields:
+        return
+    if {field_name, variants_field} & instance.get_deferred_fields():
+        return
+    source = getattr(instance, field_name).name or None
+    variants = getattr(instance, variants_field, None) or {}
+    if variants.get("source") == source:
+        return
+
+    stale = variants or None
+    if stale:
+        sender.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+        ImageDerivatives.rows_updated(label, instance.pk)
+        setattr(instance, variants_field, {})
+    if source:
+        transaction.on_commit(lambda: generate_image_variants_task.delay(label, instance.pk, stale))
+    elif stale:
+        MediaDeletionBatch.add(ImageDerivatives.iter_names(stale))
+
+
+def on_image_deleted(sender, instance, **kwargs):
+    _, variants_field = IMAGE_FIELDS[sender._meta.label]
+    MediaDeletionBatch.add(ImageDerivatives.iter_names(getattr(instance, variants_field, None)))
+
+
+for model_label in IMAGE_FIELDS:
+    post_save.connect(on_image_saved, sender=model_label, dispatch_uid=f"image_variants_save_{model_label}")
+    post_delete.connect(on_image_deleted, sender=model_label, dispatch_uid=f"image_variants_delete_{model_label}")
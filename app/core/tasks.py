@@ -1,8 +1,14 @@
 from celery import shared_task
 from celery.signals import worker_init, worker_shutdown
 
+import datetime
+
 from core.redis import redis_storage
 from core.custom_logger import logger
+from core.gcloud import delete_media_files
+from core.images import ImageDerivatives
+from core.media_sweeper import OrphanMediaSweeper
+import settings
 
 
 @worker_init.connect
@@ -26,3 +32,31 @@ def test_task():
     print("Celery health check done.")
     logger.info("Celery health check done.")
     return "Celery health check done."
+
+
+@shared_task(name="generate_image_variants")
+def generate_image_variants_task(label, pk, stale=None):
+    """
+    Render the thumb/card/full WebP and JPEG variants of one image field.
+    """
+    return ImageDerivatives.process(label, pk, stale=stale)
+
+
+@shared_task(name="delete_media_files")
+def delete_media_files_task(names):
+    """
+    Deletes media files of default storage, in GCS batch requests on the bucket.
+    """
+    return delete_media_files(names)
+
+
+@shared_task(name="sweep_orphan_media")
+def sweep_orphan_media_task():
+    """
+    Deletes media files no row references anymore, see core.media_sweeper.OrphanMediaSweeper.
+    """
+    return OrphanMediaSweeper(
+        grace=datetime.timedelta(hours=settings.MEDIA_ORPHAN_SWEEP_GRACE_HOURS),
+        max_deletes=settings.MEDIA_ORPHAN_SWEEP_MAX_DELETES,
+        dry_run=settings.MEDIA_ORPHAN_SWEEP_DRY_RUN,
+    ).sweep()
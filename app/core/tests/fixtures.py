@@ -0,0 +1,207 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from business import enums as business_enums
+from business import models as business_models
+from business.utils.schedule_writer import ScheduleWriter
+from notifications import models as notification_models
+from onboarding import enums as onboarding_enums
+from onboarding import models as onboarding_models
+from rating import models as rating_models
+from shared import models as shared_models
+
+
+PASSWORD = "testpass123"
+
+# Tirana, every distance filter in the fixtures is centered here
+LONGITUDE = 19.8187
+LATITUDE = 41.3275
+
+WORKING_SLOTS = [
+    (day.value, datetime.time(9, 0), datetime.time(18, 0), business_enums.VisitTypeChoices.ON_SITE)
+    for day in business_enums.DayOfWeekChoices
+]
+BREAKING_SLOTS = [
+    (day.value, datetime.time(13, 0), datetime.time(14, 0), None)
+    for day in business_enums.DayOfWeekChoices
+]
+
+
+def create_user(email: str, **extra_fields):
+    return get_user_model().objects.create_user(email=email, password=PASSWORD, **extra_fields)
+
+
+def seed_dataset(clients: int = 3, services: int = 3, employees: int = 2, images: int = 3) -> dict:
+    """
+    Small but representative dataset: one business with categories, gallery, services,
+    employees and schedules, clients with bookings, ratings, favorites and
+    notifications, and a freelancer applying to the business.
+    List sizes are above one so N+1 queries show up in query counts.
+    Returns the named objects used to build URLs and authenticate.
+    """
+    owner = create_user("owner@example.com", name="Owner", surname="Business")
+
+    parent_category = business_models.ServiceCategory.objects.create(name="Hair")
+    categories = [
+        business_models.ServiceCategory.objects.create(
+            name=f"Hair {index}",
+            parent=parent_category,
+            duration=datetime.timedelta(minutes=30),
+        )
+        for index in range(2)
+    ]
+
+    business = business_models.Business.objects.create(
+        user=owner,
+        name="Owner",
+        store_name="Fixture Studio",
+        address="Fixture street 1",
+        longitude=LONGITUDE,
+        latitude=LATITUDE,
+        category=parent_category,
+        visit_type=business_enums.VisitTypeChoices.ON_SITE,
+        apply_for_weeks=business_enums.ApplyForWeeksChoices.ALL_WEEKS,
+    )
+    business.categories.set(categories)
+
+    gallery = [
+        business_models.Gallery.objects.create(name=f"image {index}", image=f"fixtures/{index}.jpg", is_main=index == 0)
+        for index in range(images)
+    ]
+    business.images.set(gallery)
+    business.socials.add(
+        business_models.SocialMedia.objects.create(
+            platform=business_enums.SocialMediaChoices.INSTAGRAM,
+            url="https://instagram.com/fixture",
+        )
+    )
+
+    service_objects = []
+    for index in range(services):
+        service = business_models.Service.objects.create(
+            business=business,
+            name=f"Service {index}",
+            duration=datetime.timedelta(minutes=30),
+            price=10 + index,
+            category=categories[index % len(categories)],
+            image=f"fixtures/service_{index}.jpg",
+        )
+        service.categories.set(categories)
+        service.images.set(gallery[:2])
+        service_objects.append(service)
+
+    employee_objects = []
+    for index in range(employees):
+        employee = business_models.Employee.objects.create(
+            business=business,
+            name=f"Employee {index}",
+            avatar=f"fixtures/employee_{index}.jpg",
+        )
+        employee.services.set(service_objects)
+        employee_objects.append(employee)
+
+    ScheduleWriter.replace([business, *service_objects, *employee_objects], WORKING_SLOTS)
+    ScheduleWriter.replace([business], BREAKING_SLOTS, field_name="breaking_hours")
+
+    tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+    client_users = []
+    bookings = []
+    ratings = []
+    for index in range(clients):
+        user = create_user(f"client{index}@example.com", name=f"Client {index}")
+        onboarding_models.Costumer.objects.create(user=user, name=user.name)
+        business_models.BusinessClient.objects.create(
+            user=user,
+            business=business,
+            status=business_enums.ClientStatusChoices.ACCEPTED,
+        )
+        client_users.append(user)
+
+        for slot in range(2):
+            start = datetime.time(10 + slot, 0)
+            booking = business_models.UserBusinesBooking.objects.create(
+                user=user,
+                business=business,
+                employee=employee_objects[slot % len(employee_objects)],
+                start_time=start,
+                end_time=datetime.time(10 + slot, 30),
+                day_of_week=business_enums.DayOfWeekChoices.values[tomorrow.weekday()],
+                date=tomorrow,
+                visit_type=business_enums.VisitTypeChoices.ON_SITE,
+                status=business_enums.BookingStatusChoices.CONFIRMED,
+            )
+            booking.services.set(service_objects[:2])
+            booking.categories.set(categories)
+            bookings.append(booking)
+
+        ratings.append(
+            rating_models.Rating.objects.create(
+                user=user,
+                booking=bookings[-1],
+                business=business,
+                employee=bookings[-1].employee,
+                rating=5,
+                comment="Great",
+            )
+        )
+        rating_models.UserBusinessFavorite.objects.create(user=user, business=business)
+        rating_models.UserBusinessSave.objects.create(user=user, business=business)
+        rating_models.UserEmployeeFavorite.objects.create(user=user, employee=employee_objects[0])
+
+        for notification in range(3):
+            notification_models.NotificationObject.objects.create(
+                user=user,
+                title=f"Notification {notification}",
+                body="Body",
+                is_sent=True,
+                sent_at=timezone.now(),
+            )
+
+    rating_models.Rating.objects.create(
+        user=owner,
+        business=business,
+        reply_to=ratings[0],
+        comment="Thank you",
+    )
+
+    freelancer_user = create_user("freelancer@example.com", name="Freelancer")
+    freelancer = onboarding_models.FreeLancer.objects.create(
+        user=freelancer_user,
+        longitude=LONGITUDE,
+        latitude=LATITUDE,
+    )
+    freelancer.services_offered.set(categories)
+    onboarding_models.FreelancerBusinessApply.objects.create(freelancer=freelancer, business=business)
+
+    direct_upload = onboarding_models.DirectUpload.objects.create(
+        user=owner,
+        kind=onboarding_enums.DirectUploadKindChoices.GALLERY_IMAGE,
+        target_uid=business.uid,
+        object_name="uploads/fixture/image.jpg",
+        content_type="image/jpeg",
+        size=1024,
+        expires_at=timezone.now() + datetime.timedelta(minutes=20),
+    )
+
+    shared_models.PolicyLinks.objects.create(
+        terms_and_conditions="https://example.com/terms",
+        privacy_policy="https://example.com/privacy",
+        cookie_policy="https://example.com/cookies",
+    )
+
+    # role and primary_business were set by the user signals, reload them
+    return {
+        "owner": get_user_model().objects.get(pk=owner.pk),
+        "client": get_user_model().objects.get(pk=client_users[0].pk),
+        "freelancer_user": get_user_model().objects.get(pk=freelancer_user.pk),
+        "business": business,
+        "service": service_objects[0],
+        "employee": employee_objects[0],
+        "booking": bookings[0],
+        "rating": ratings[0],
+        "business_client": business_models.BusinessClient.objects.get(user=client_users[0], business=business),
+        "freelancer": freelancer,
+        "direct_upload": direct_upload,
+    }
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.bloom import BloomFilter
+from core.redis import ChannelSubscription
+
+
+class BloomFilterTests(SimpleTestCase):
+
+    def test_membership(self):
+        bloom = BloomFilter(size=1024, hash_count=5)
+        bloom.add("1:device-a")
+
+        self.assertIn("1:device-a", bloom)
+        self.assertNotIn("1:device-b", bloom)
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(size=1 << 16, hash_count=7)
+        members = [f"{user_id}:device-{user_id}" for user_id in range(5000)]
+        for member in members:
+            bloom.add(member)
+
+        self.assertTrue(all(member in bloom for member in members))
+        # about 1% expected for 5000 members in 65536 bits with 7 hashes
+        false_positives = sum(f"{user_id}:other" in bloom for user_id in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class ChannelSubscriptionTests(SimpleTestCase):
+
+    def test_backs_off_while_redis_is_down(self):
+        subscription = ChannelSubscription("test:channel", handler=lambda message: None)
+
+        with mock.patch("core.redis.subscribe_in_thread", return_value=None) as subscribe:
+            self.assertFalse(subscription.ensure())
+            self.assertFalse(subscription.ensure())
+            self.assertEqual(subscribe.call_count, 1)
+
+            subscription.retry_at = 0
+            subscription.ensure()
+            self.assertEqual(subscribe.call_count, 2)
+            self.assertEqual(subscription.retry_delay, ChannelSubscription.MIN_RETRY_SECONDS * 4)
+
+    def test_resubscribes_after_the_thread_stopped(self):
+        subscription = ChannelSubscription("test:channel", handler=lambda message: None)
+        thread = mock.Mock()
+        thread.is_alive.return_value = True
+
+        with mock.patch("core.redis.subscribe_in_thread", return_value=thread) as subscribe:
+            self.assertTrue(subscription.ensure())
+            self.assertFalse(subscription.ensure())
+            thread.is_alive.return_value = False
+            self.assertTrue(subscription.ensure())
+            self.assertEqual(subscribe.call_count, 2)
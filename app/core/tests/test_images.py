@@ -0,0 +1,108 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase
+from PIL import Image
+
+from business import models as business_models
+from core.authentication import UserSnapshotCache
+from core.fields import ImageVariantsField
+from core.images import ImageDerivatives
+
+LABEL = "business.Gallery"
+
+
+class ImageDerivativesTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.media_root, base_url="/media/")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        field = business_models.Gallery._meta.get_field("image")
+        patcher = mock.patch.object(field, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def store_image(self, name: str, size=(800, 600)) -> str:
+        buffer = io.BytesIO()
+        Image.new("RGB", size, (200, 30, 30)).save(buffer, "PNG")
+        return self.storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_process_stores_variants_and_deletes_stale(self):
+        source = self.store_image("gallery/a/source.png")
+        old_variant = self.storage.save("gallery/a/old__gallery1_thumb.webp", ContentFile(b"old"))
+        gallery = business_models.Gallery.objects.create(name="Gallery", image=source)
+
+        self.assertTrue(ImageDerivatives.process(LABEL, gallery.pk, stale={"thumb": {"webp": old_variant}}))
+
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.image_variants["source"], source)
+        self.assertEqual(gallery.image_variants["thumb"]["width"], 160)
+        for name in ImageDerivatives.iter_names(gallery.image_variants):
+            self.assertTrue(self.storage.exists(name))
+            self.assertIn(f"__gallery{gallery.pk}_", name)
+        self.assertFalse(self.storage.exists(old_variant))
+
+    def test_rows_sharing_a_source_keep_their_own_variants(self):
+        source = self.store_image("gallery/a/shared.png")
+        first = business_models.Gallery.objects.create(name="First", image=source)
+        second = business_models.Gallery.objects.create(name="Second", image=source)
+
+        ImageDerivatives.process(LABEL, first.pk)
+        ImageDerivatives.process(LABEL, second.pk)
+        second.refresh_from_db()
+        ImageDerivatives.process(LABEL, second.pk, stale=second.image_variants)
+
+        first.refresh_from_db()
+        for name in ImageDerivatives.iter_names(first.image_variants):
+            self.assertTrue(self.storage.exists(name))
+
+    def test_image_replaced_while_rendering(self):
+        source = self.store_image("gallery/a/source.png")
+        replacement = self.store_image("gallery/a/replacement.png")
+        gallery = business_models.Gallery.objects.create(name="Gallery", image=source)
+        generate = ImageDerivatives.generate
+        rendered = {}
+
+        def generate_and_replace(field_file, owner):
+            rendered.update(generate(field_file, owner))
+            business_models.Gallery.objects.filter(pk=gallery.pk).update(image=replacement)
+            return rendered
+
+        with mock.patch.object(ImageDerivatives, "generate", side_effect=generate_and_replace):
+            self.assertFalse(ImageDerivatives.process(LABEL, gallery.pk))
+
+        gallery.refresh_from_db()
+        self.assertFalse(gallery.image_variants)
+        for name in ImageDerivatives.iter_names(rendered):
+            self.assertFalse(self.storage.exists(name))
+
+    def test_field_serves_current_variants_only(self):
+        source = self.store_image("gallery/a/source.png")
+        gallery = business_models.Gallery.objects.create(name="Gallery", image=source)
+        ImageDerivatives.process(LABEL, gallery.pk)
+        gallery.refresh_from_db()
+        field = ImageVariantsField()
+
+        self.assertEqual(set(field.to_representation(gallery)), {"thumb", "card", "full"})
+
+        gallery.image = self.store_image("gallery/a/replacement.png")
+        self.assertIsNone(field.to_representation(gallery))
+
+    def test_avatar_variants_drop_the_user_snapshot(self):
+        field = get_user_model()._meta.get_field("avatar")
+        patcher = mock.patch.object(field, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = get_user_model().objects.create_user(email="avatar@example.com", password="testpass123")
+        get_user_model().objects.filter(pk=user.pk).update(avatar=self.store_image("avatars/a/me.png"))
+        UserSnapshotCache.set(get_user_model().objects.get(pk=user.pk))
+
+        self.assertTrue(ImageDerivatives.process("user.User", user.pk))
+
+        self.assertIsNone(UserSnapshotCache.get(user.pk))
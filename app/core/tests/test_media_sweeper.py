@@ -0,0 +1,70 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase
+
+from business import models as business_models
+from core.media_sweeper import OrphanMediaSweeper
+
+
+class OrphanMediaSweeperTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.media_root)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def store(self, name: str, age_hours: int = 48) -> str:
+        name = self.storage.save(name, ContentFile(b"content"))
+        modified = time.time() - age_hours * 3600
+        os.utime(self.storage.path(name), (modified, modified))
+        return name
+
+    def sweep(self, dry_run=False):
+        return OrphanMediaSweeper(
+            grace=datetime.timedelta(hours=24),
+            max_deletes=100,
+            dry_run=dry_run,
+            storage=self.storage,
+        ).sweep()
+
+    def test_sweep_deletes_old_orphans_only(self):
+        referenced = self.store("gallery/a/referenced.jpg")
+        business_models.Gallery.objects.create(name="Referenced", image=referenced)
+        orphan = self.store("gallery/b/orphan.jpg")
+        young_orphan = self.store("gallery/c/young.jpg", age_hours=1)
+        unmanaged = self.store("exports/report.csv")
+
+        stats = self.sweep()
+
+        self.assertEqual(stats["orphans"], 1)
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(referenced))
+        self.assertTrue(self.storage.exists(young_orphan))
+        self.assertTrue(self.storage.exists(unmanaged))
+
+    def test_sweep_keeps_image_variants(self):
+        source = self.store("gallery/a/source.jpg")
+        variant = self.store("gallery/a/source__gallery1_thumb.webp")
+        business_models.Gallery.objects.create(
+            name="Source",
+            image=source,
+            image_variants={"source": source, "thumb": {"webp": variant}},
+        )
+
+        self.sweep()
+
+        self.assertTrue(self.storage.exists(variant))
+
+    def test_dry_run_deletes_nothing(self):
+        orphan = self.store("gallery/b/orphan.jpg")
+
+        stats = self.sweep(dry_run=True)
+
+        self.assertEqual(stats["orphans"], 1)
+        self.assertTrue(self.storage.exists(orphan))
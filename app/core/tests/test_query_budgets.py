@@ -0,0 +1,160 @@
+import json
+import os
+from collections import defaultdict
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from rest_framework.test import APIClient
+
+from core.metrics import fingerprint_sql
+from core.tests.fixtures import seed_dataset
+
+
+CURR_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_FILE = os.path.join(CURR_DIR, "query_budgets.json")
+
+# rewrite the budget file with the measured values instead of asserting:
+# QUERY_BUDGETS_UPDATE=1 python manage.py test core.tests.test_query_budgets
+UPDATE_BUDGETS = bool(int(os.environ.get("QUERY_BUDGETS_UPDATE", False)))
+
+
+def load_budgets() -> dict:
+    with open(BUDGETS_FILE) as budgets_file:
+        return json.load(budgets_file)
+
+
+def iter_routes(patterns, prefix=""):
+    """
+    (route, callback) of every URL pattern, routes as written in the urls modules.
+    """
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.callback
+
+
+def handles_get(callback) -> bool:
+    actions = getattr(callback, "actions", None)
+    if actions is not None:
+        return "get" in actions
+    view_class = getattr(callback, "view_class", None)
+    return view_class is not None and hasattr(view_class, "get")
+
+
+def get_api_get_routes() -> list:
+    return sorted(
+        route for route, callback in iter_routes(get_resolver().url_patterns)
+        if route.startswith("api/") and handles_get(callback)
+    )
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper recording every query with the rows it returned.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        rowcount = context["cursor"].rowcount
+        is_select = sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        self.queries.append((sql, rowcount if is_select and rowcount > 0 else 0))
+        return result
+
+    @property
+    def rows(self) -> int:
+        return sum(rows for _, rows in self.queries)
+
+    def report(self, limit: int = 10) -> str:
+        grouped = defaultdict(lambda: [0, 0])
+        for sql, rows in self.queries:
+            entry = grouped[fingerprint_sql(sql)]
+            entry[0] += 1
+            entry[1] += rows
+        worst = sorted(grouped.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return "\n".join(
+            f"  {count}x, {rows} rows: {fingerprint}" for fingerprint, (count, rows) in worst
+        )
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every GET endpoint under api/ is called against the fixture dataset and must stay
+    within the query and fetched rows budget of core/tests/query_budgets.json.
+    Budget entries:
+    - user: fixture user to authenticate as (owner, client, freelancer_user), none for anonymous
+    - kwargs: URL kwarg -> fixture object whose uid fills it
+    - params: query string
+    - max_queries / max_rows
+    """
+
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixtures = seed_dataset()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def build_path(self, route: str, kwargs: dict) -> str:
+        path = route
+        for name, fixture in kwargs.items():
+            for converter in ("uuid", "str", "int", "slug"):
+                path = path.replace(f"<{converter}:{name}>", str(self.fixtures[fixture].uid))
+        return "/" + path
+
+    def measure(self, route: str, budget: dict):
+        user = budget.get("user")
+        if user:
+            self.client.force_authenticate(user=self.fixtures[user])
+        else:
+            self.client.force_authenticate(user=None)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.client.get(self.build_path(route, budget.get("kwargs", {})), budget.get("params", {}))
+        return response, recorder
+
+    def test_every_endpoint_has_budget(self):
+        budgets = load_budgets()
+        routes = get_api_get_routes()
+        self.assertEqual(
+            sorted(set(routes) - set(budgets)), [],
+            "GET endpoints without a query budget, add them to core/tests/query_budgets.json",
+        )
+        self.assertEqual(sorted(set(budgets) - set(routes)), [], "Budgets of removed endpoints")
+
+    def test_query_budgets(self):
+        budgets = load_budgets()
+        measured = {}
+        for route, budget in budgets.items():
+            with self.subTest(route=route):
+                response, recorder = self.measure(route, budget)
+                self.assertLess(
+                    response.status_code, 400,
+                    f"{route} returned {response.status_code}, fix the budget entry parameters",
+                )
+                measured[route] = dict(budget, max_queries=len(recorder.queries), max_rows=recorder.rows)
+                if UPDATE_BUDGETS:
+                    continue
+
+                self.assertLessEqual(
+                    len(recorder.queries), budget["max_queries"],
+                    f"{route}: {len(recorder.queries)} queries, budget {budget['max_queries']}\n{recorder.report()}",
+                )
+                self.assertLessEqual(
+                    recorder.rows, budget["max_rows"],
+                    f"{route}: {recorder.rows} rows fetched, budget {budget['max_rows']}\n{recorder.report()}",
+                )
+
+        if UPDATE_BUDGETS:
+            with open(BUDGETS_FILE, "w") as budgets_file:
+                json.dump(measured, budgets_file, indent=4, sort_keys=True)
+                budgets_file.write("\n")
@@ -1,36 +1,169 @@
+import threading
+import time
+from typing import Optional, Tuple
 
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
-from core.redis import redis_storage
+from core.redis import redis_storage, ChannelSubscription
+from core.custom_logger import logger
 import settings
 
 
 class TokenBlacklist:
+    """
+    Token revocation keyed by jti, plus a per user "tokens issued before" watermark.
+    - blacklist: revoke one token until it expires
+    - revoke_all: revoke every token of a user issued before now, one key per user,
+      optionally sparing the caller's token family (the iat its access and refresh
+      tokens share, simplejwt copies it from the refresh token)
+    - is_revoked: check a validated token payload; jtis known not to be revoked are
+      cached in the worker for TOKEN_BLACKLIST_LOCAL_CACHE_SECONDS, revocations are
+      pushed to every worker over pub/sub
+    """
 
     TOKEN_EXPIRATION_MAP = {
-        "access": settings.SIMPLE_JWT.get('ACCESS_TOKEN_LIFETIME', 3600),
-        "refresh": settings.SIMPLE_JWT.get('REFRESH_TOKEN_LIFETIME', 86400)
+        "access": int(settings.SIMPLE_JWT.get('ACCESS_TOKEN_LIFETIME').total_seconds()),
+        "refresh": int(settings.SIMPLE_JWT.get('REFRESH_TOKEN_LIFETIME').total_seconds()),
     }
 
+    JTI_KEY_PREFIX = "tbl:j"
+    WATERMARK_KEY_PREFIX = "tbl:u"
+    CHANNEL = "tbl:revocations"
+
+    _not_revoked = {}
+    _watermarks = {}
+    _subscription = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def build_key(cls, jti: str) -> str:
+        return f"{cls.JTI_KEY_PREFIX}:{jti}"
+
+    @classmethod
+    def build_watermark_key(cls, user_id) -> str:
+        return f"{cls.WATERMARK_KEY_PREFIX}:{user_id}"
+
     @staticmethod
-    def blacklist(token, token_type="access"):
+    def get_payload(token) -> dict:
+        if isinstance(token, (str, bytes)):
+            # signature and expiry are checked, the token type is not
+            return UntypedToken(token).payload
+        return token.payload
+
+    @classmethod
+    def blacklist(cls, token, token_type="access"):
         """
-        Blacklist a token by storing it in Redis.
+        Blacklist a token (raw string or simplejwt token) by its jti until it expires.
         """
-        print("Blacklisting token:", token, "of type:", token_type)
-        key = TokenBlacklist.build_key(token, token_type)
-        redis_storage.connection.set(key, "blacklisted", ex=TokenBlacklist.TOKEN_EXPIRATION_MAP[token_type])
+        payload = cls.get_payload(token)
+        expires_in = int(payload.get('exp', 0) - time.time())
+        if expires_in <= 0:
+            expires_in = cls.TOKEN_EXPIRATION_MAP[token_type]
+        jti = payload[api_settings.JTI_CLAIM]
+        pipe = redis_storage.connection.pipeline()
+        pipe.set(cls.build_key(jti), 1, ex=expires_in)
+        pipe.publish(cls.CHANNEL, f"j:{jti}")
+        pipe.execute()
+        # pub/sub delivery is asynchronous, this worker must not serve its cached answer meanwhile
+        cls._not_revoked.pop(jti, None)
+
+    @classmethod
+    def revoke_all(cls, user_id, issued_before: Optional[int] = None, keep_issued_at: Optional[int] = None) -> int:
+        """
+        Revoke every token of the user issued before issued_before (epoch seconds, now
+        by default), except the tokens issued at keep_issued_at.
+        """
+        issued_before = int(issued_before or time.time())
+        watermark = f"{issued_before}:{keep_issued_at}" if keep_issued_at else str(issued_before)
+        pipe = redis_storage.connection.pipeline()
+        # older tokens are expired once the longest lifetime has passed
+        pipe.set(cls.build_watermark_key(user_id), watermark, ex=cls.TOKEN_EXPIRATION_MAP["refresh"])
+        pipe.publish(cls.CHANNEL, f"u:{user_id}:{watermark}")
+        pipe.execute()
+        cls.set_local_watermark(user_id, cls.parse_watermark(watermark))
+        return issued_before
 
     @staticmethod
-    def is_blacklisted(token, token_type="access"):
+    def parse_watermark(value) -> Tuple[int, Optional[int]]:
         """
-        Check if a token is blacklisted.
+        "<issued_before>" or "<issued_before>:<kept iat>" -> (issued_before, kept iat)
         """
-        key = TokenBlacklist.build_key(token, token_type)
-        return redis_storage.connection.exists(key)
-    
+        if isinstance(value, bytes):
+            value = value.decode()
+        issued_before, _, kept = str(value).partition(':')
+        return int(issued_before), int(kept) if kept else None
+
     @staticmethod
-    def build_key(token, token_type="access"):
+    def is_below_watermark(issued_at: int, watermark: Tuple[int, Optional[int]]) -> bool:
+        issued_before, kept = watermark
+        return issued_at < issued_before and issued_at != kept
+
+    @classmethod
+    def handle_message(cls, message):
+        kind, _, value = message['data'].partition(':')
+        if kind == 'j':
+            cls._not_revoked.pop(value, None)
+        elif kind == 'u':
+            user_id, _, watermark = value.partition(':')
+            cls.set_local_watermark(user_id, cls.parse_watermark(watermark))
+
+    @classmethod
+    def set_local_watermark(cls, user_id, watermark: Tuple[int, Optional[int]]):
+        user_id = str(user_id)
+        # the same second can be revoked again with another kept family, the latest wins
+        if watermark[0] >= cls._watermarks.get(user_id, (0, None))[0]:
+            cls._watermarks[user_id] = watermark
+
+    @classmethod
+    def ensure_subscribed(cls):
+        if cls._subscription is None:
+            with cls._lock:
+                if cls._subscription is None:
+                    cls._subscription = ChannelSubscription(cls.CHANNEL, cls.handle_message)
+        if cls._subscription.ensure():
+            # messages were missed while unsubscribed
+            cls._not_revoked.clear()
+
+    @classmethod
+    def is_revoked(cls, payload: dict) -> bool:
+        jti = payload.get(api_settings.JTI_CLAIM)
+        user_id = str(payload.get(api_settings.USER_ID_CLAIM))
+        issued_at = payload.get('iat', 0)
+
+        cls.ensure_subscribed()
+        if cls.is_below_watermark(issued_at, cls._watermarks.get(user_id, (0, None))):
+            return True
+        now = time.monotonic()
+        if cls._not_revoked.get(jti, 0) > now:
+            return False
+
+        try:
+            pipe = redis_storage.connection.pipeline(transaction=False)
+            pipe.exists(cls.build_key(jti))
+            pipe.get(cls.build_watermark_key(user_id))
+            is_blacklisted, watermark = pipe.execute()
+        except RedisError as e:
+            logger.error(f"Token blacklist unavailable: {e}")
+            return False
+
+        if watermark:
+            watermark = cls.parse_watermark(watermark)
+            cls.set_local_watermark(user_id, watermark)
+            if cls.is_below_watermark(issued_at, watermark):
+                return True
+        if is_blacklisted:
+            return True
+
+        if len(cls._not_revoked) >= settings.TOKEN_BLACKLIST_LOCAL_CACHE_SIZE:
+            cls._not_revoked.clear()
+        cls._not_revoked[jti] = now + settings.TOKEN_BLACKLIST_LOCAL_CACHE_SECONDS
+        return False
+
+    @classmethod
+    def is_blacklisted(cls, token, token_type="access") -> bool:
         """
-        Build the Redis key for a blacklisted token.
+        Check if a token (raw string or simplejwt token) is blacklisted.
         """
-        return f"blacklisted_{token_type}_token:{token}"
+        return cls.is_revoked(cls.get_payload(token))
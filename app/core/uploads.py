@@ -0,0 +1,103 @@
+import datetime
+from typing import Optional, Tuple
+from uuid import uuid4
+
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from core.gcloud import GoogleCloudMediaFileStorage
+
+
+# prefix of every direct upload, blobs are uploads/<upload uid>/<random name>.<ext>
+UPLOADS_PREFIX = "uploads"
+LOCAL_UPLOAD_SALT = "core.uploads.local"
+# extension of the stored object by validated content type, see DIRECT_UPLOAD_IMAGE_TYPES / DIRECT_UPLOAD_VIDEO_TYPES
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "video/mp4": ".mp4",
+    "video/quicktime": ".mov",
+    "video/webm": ".webm",
+}
+
+
+class DirectUploadBackend:
+    """
+    Where clients PUT their files without streaming them through the API workers:
+    - put_url: url, method and headers the client must use
+    - stat: size and content type of an uploaded object, None if nothing was uploaded
+    Objects are stored under the same names the model file fields use, so an uploaded
+    object is attached by assigning its name to the field.
+    """
+
+    @staticmethod
+    def object_name(upload_uid, content_type: str) -> str:
+        # never the extension of the client file name, a .html or .svg must not be served as an image
+        ext = CONTENT_TYPE_EXTENSIONS.get(content_type, "")
+        return f"{UPLOADS_PREFIX}/{upload_uid}/{uuid4()}{ext}"
+
+    def put_url(self, name: str, content_type: str, max_size: int, expires_in: datetime.timedelta) -> Tuple[str, dict]:
+        raise NotImplementedError
+
+    def stat(self, name: str, content_type: Optional[str] = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    def delete(self, name: str):
+        default_storage.delete(name)
+
+
+class GoogleCloudUploadBackend(DirectUploadBackend):
+    """
+    V4 signed PUT urls straight to the media bucket. The bucket enforces the size through
+    x-goog-content-length-range. Works against fake-gcs-server through STORAGE_EMULATOR_HOST.
+    """
+
+    def put_url(self, name, content_type, max_size, expires_in):
+        headers = {"x-goog-content-length-range": f"0,{max_size}"}
+        directory, blob_name = name.rsplit("/", 1)
+        url, _ = GoogleCloudMediaFileStorage.get_singed_put_url(
+            blob_name,
+            model_name=directory,
+            content_type=content_type,
+            expiration=expires_in,
+            headers=headers,
+        )
+        return url, {"Content-Type": content_type, **headers}
+
+    def stat(self, name, content_type=None):
+        return GoogleCloudMediaFileStorage.get_blob_stat(name)
+
+
+class LocalUploadBackend(DirectUploadBackend):
+    """
+    Stand-in for local development and tests: the PUT goes to core.views.local_upload_view,
+    authorized by a signed token instead of a bucket signature, and lands in default_storage.
+    """
+
+    def put_url(self, name, content_type, max_size, expires_in):
+        token = signing.dumps(
+            {"name": name, "content_type": content_type, "max_size": max_size},
+            salt=LOCAL_UPLOAD_SALT,
+        )
+        return f"{reverse('local_upload')}?token={token}", {"Content-Type": content_type}
+
+    def stat(self, name, content_type=None):
+        if not default_storage.exists(name):
+            return None
+        # the filesystem does not keep the content type, the declared one is trusted
+        return {"size": default_storage.size(name), "content_type": content_type}
+
+    @staticmethod
+    def load_token(token: str, max_age: datetime.timedelta) -> dict:
+        """
+        Raises signing.BadSignature (or its SignatureExpired subclass) on a tampered or old token.
+        """
+        return signing.loads(token, salt=LOCAL_UPLOAD_SALT, max_age=max_age)
+
+
+def get_upload_backend() -> DirectUploadBackend:
+    if isinstance(default_storage, GoogleCloudMediaFileStorage):
+        return GoogleCloudUploadBackend()
+    return LocalUploadBackend()
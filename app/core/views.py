@@ -0,0 +1,59 @@
+import datetime
+
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+import settings
+from core.metrics import render_metrics
+from core.uploads import LocalUploadBackend
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request):
+    """
+    Request metrics of this worker process in Prometheus text format.
+    METRICS_TOKEN must be sent as "Authorization: Bearer <token>". Without a token the
+    endpoint only exists in DEBUG.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    else:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+def local_upload_view(request):
+    """
+    Receives the PUT of a direct upload when media is stored on the local filesystem,
+    the signed token plays the role of the bucket signature. See core.uploads.LocalUploadBackend.
+    """
+    try:
+        upload = LocalUploadBackend.load_token(
+            request.GET.get("token", ""),
+            max_age=datetime.timedelta(minutes=settings.DIRECT_UPLOAD_URL_EXPIRATION_MINUTES),
+        )
+    except signing.BadSignature:
+        return HttpResponse(status=403)
+
+    if request.content_type != upload["content_type"]:
+        return HttpResponse(status=400)
+    content = request.read(upload["max_size"] + 1)
+    if len(content) > upload["max_size"]:
+        return HttpResponse(status=413)
+
+    if default_storage.exists(upload["name"]):
+        default_storage.delete(upload["name"])
+    default_storage.save(upload["name"], ContentFile(content))
+    return HttpResponse(status=200)
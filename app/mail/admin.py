@@ -2,27 +2,31 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 from django.utils.safestring import mark_safe
 from mail import models
+from mail.renderer import MailRenderer
 
 
 @admin.register(models.Mail)
 class MailAdmin(UnfoldModelAdmin):
     search_fields = ['user__email']
-    list_display = ['user', 'email', 'subject', 'is_send', 'created_at',]
-    list_filter = ['is_send']
+    list_display = ['user', 'email', 'subject', 'template', 'is_send', 'created_at',]
+    list_filter = ['is_send', 'template']
+    exclude = ['body', 'compressed_body']
 
     # make all field read-only
     def get_readonly_fields(self, request, obj=None):
-        fields = [f.name for f in self.model._meta.fields]
+        fields = [f.name for f in self.model._meta.fields if f.name not in self.exclude]
         preview_body = 'preview_body'
         if preview_body not in fields:
             fields.append(preview_body)
         return fields
     
     def preview_body(self, obj):
-        if obj.body:
+        # rendered on demand, template based rows don't store the html
+        body = MailRenderer.render_logged(obj)
+        if body:
             return mark_safe(
                 f'<div style="border: 1px solid #ccc; padding: 10px; '
-                f'width: 600px; height: 400px; overflow: auto;">{obj.body}</div>'
+                f'width: 600px; height: 400px; overflow: auto;">{body}</div>'
             )
         return "-"
     
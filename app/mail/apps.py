@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MailConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mail'
+
+    def ready(self):
+        import mail.signals
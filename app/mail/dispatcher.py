@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+import settings
+from core.custom_logger import logger
+from mail.models import Mail
+from mail.renderer import MailRenderer
+
+
+@dataclass
+class OutgoingMail:
+    subject: str
+    body: str
+    raw_text: str
+    email: str
+    name: Optional[str] = ''
+    user: Optional[object] = None
+    code: Optional[str] = None
+    template: Optional[str] = None
+    variables: Optional[dict] = None
+
+    def __post_init__(self):
+        # snapshot now, handlers keep mutating the same dict for the next recipient
+        if self.variables is not None:
+            self.variables = MailRenderer.pack_variables(self.variables)
+
+    @property
+    def recipient(self) -> str:
+        return f'{self.name} <{self.email}>' if self.name and '@' not in self.name else self.email
+
+
+class MailDispatcher:
+    """
+    Sends mails over one backend connection per batch and logs them with a single
+    bulk insert.
+    - build_message: EmailMultiAlternatives with the html body and shared inline images
+    - send_batch: send a list of OutgoingMail, returns the created Mail rows
+    """
+
+    @staticmethod
+    def build_message(mail: OutgoingMail, connection=None) -> EmailMultiAlternatives:
+        msg = EmailMultiAlternatives(
+            mail.subject,
+            mail.raw_text,
+            f'{settings.PROJECT_NAME} <{settings.DEFAULT_EMAIL_FROM}>',
+            [mail.recipient],
+            connection=connection,
+        )
+        msg.attach_alternative(mail.body, 'text/html')
+        for mime_img in MailRenderer.get_inline_images():
+            msg.attach(mime_img)
+        return msg
+
+    @classmethod
+    def send_one(cls, mail: OutgoingMail, connection) -> Tuple[bool, Optional[str]]:
+        try:
+            connection.send_messages([cls.build_message(mail, connection)])
+            return True, None
+        except Exception as e:
+            logger.error(f"Error sending mail to {mail.email}: {e}")
+            return False, str(e)
+
+    @classmethod
+    def send_batch(cls, mails: List[OutgoingMail]) -> List[Mail]:
+        if not mails:
+            return []
+
+        connection = get_connection()
+        results = []
+        try:
+            connection.open()
+        except Exception as e:
+            # every send below will fail the same way and gets logged with the error
+            logger.error(f"Error opening mail connection: {e}")
+        try:
+            for mail in mails:
+                results.append(cls.send_one(mail, connection))
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.error(f"Error closing mail connection: {e}")
+
+        MailRenderer.remember_templates(mail.template for mail in mails if mail.template)
+        records = [
+            Mail(
+                user=mail.user,
+                subject=mail.subject,
+                body='' if mail.template else mail.body,
+                template=mail.template,
+                template_version=MailRenderer.get_template(mail.template).version if mail.template else None,
+                variables=mail.variables,
+                email=mail.email,
+                code=mail.code,
+                is_send=is_send,
+                error=error,
+            )
+            for mail, (is_send, error) in zip(mails, results)
+        ]
+        return Mail.objects.bulk_create(records, batch_size=settings.MAIL_BATCH_SIZE)
@@ -1,111 +1,19 @@
-import os
-import base64
-from typing import Optional, Tuple
-
-from django.core.mail import EmailMultiAlternatives
-from email.mime.image import MIMEImage
-
 import settings
-from mail.models import Mail, MailLogo
+from mail.renderer import MailRenderer
+from mail.dispatcher import MailDispatcher, OutgoingMail
 from user.models import User
 
 
-CURR_DIR = os.path.dirname(os.path.abspath(__file__))
-IMAGES_DIR = os.path.join(CURR_DIR, 'templates', 'images')
-
 def get_logo_url() -> str:
-    logo = MailLogo.objects.filter(is_default=True).first()
-    if logo:
-        return logo.logo.url
-    return ''
-
-def attach_inline_images(msg: EmailMultiAlternatives) -> None:
-    """
-    Attach commonly used images to the email using CID.
-    """
-    images = {
-        'logo.png': 'logo_cid',
-        'facebook.png': 'facebook_cid',
-        'instagram.png': 'instagram_cid',
-        'x.png': 'x_cid',
-    }
-
-    for filename, cid in images.items():
-        image_path = os.path.join(IMAGES_DIR, filename)
-        if not os.path.exists(image_path):
-            continue
-        with open(image_path, 'rb') as img:
-            mime_img = MIMEImage(img.read())
-            mime_img.add_header('Content-ID', f'<{cid}>')
-            mime_img.add_header('Content-Disposition', 'inline', filename=filename)
-            msg.attach(mime_img)
-
-
-def body_replace(body: str, variables: dict) -> str:
-    """
-    Replace variables in templates.
-    """
-    shared_keys = {
-        '{{logo}}': 'cid:logo_cid',
-        '{{facebook_icon}}': 'cid:facebook_cid',
-        '{{instagram_icon}}': 'cid:instagram_cid',
-        '{{x_icon}}': 'cid:x_cid',
-    }
-
-    for key, value in shared_keys.items():
-        body = body.replace(key, str(value))
-
-    for key, value in variables.items():
-        body = body.replace(key, str(value))
-    
-    return body
-
-
-def single_sender_wrapper(subject: str, body: str, raw_text: str, email: str, name: Optional[str] = '') -> Tuple[bool, Optional[str]]:
-    """
-    Email sender wrapper
-    """
-    recipient = f'{name} <{email}>' if name and '@' not in name else email
-
-    msg = EmailMultiAlternatives(
-        subject,
-        raw_text,
-        f'{settings.PROJECT_NAME} <{settings.DEFAULT_EMAIL_FROM}>',
-        [recipient],
-    )
-    msg.attach_alternative(body, 'text/html')
-
-    # Attach inline images
-    attach_inline_images(msg)
-
-    try:
-        msg.send()
-        return True, None
-    except Exception as e:
-        print('Error:', e)
-        return False, str(e)
-
-
-def create_model(subject: str, body: str, email: str, user: Optional[User] = None, code: str = None) -> Mail:
-    mail = Mail.objects.create(
-        user=user,
-        subject=subject,
-        body=body,
-        email=email,
-        code=code,
-    )
-    mail.save()
-    return mail
+    return MailRenderer.get_logo_url()
 
 
 # -------- Handlers below updated to use CID-based images -------- #
 
 def verify_email_handler(email: str, code: str, url=f'{settings.FRONTEND_VERIFY_EMAIL_URL}'):
     SUBJECT = f'Verify your email for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/verify_email.html'
-
-    with open(TEMPLATE, 'r') as f:
-        body = f.read()
+    TEMPLATE = 'verify_email.html'
+    mails = []
 
     variables = {
         '{{code}}': code,
@@ -113,22 +21,29 @@ def verify_email_handler(email: str, code: str, url=f'{settings.FRONTEND_VERIFY_
         '{{logo}}': get_logo_url(),
     }
 
-    body = body_replace(body, variables)
-
-    mail = create_model(SUBJECT, body, email, user=None, code=code)
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Verify your email",
+            email=email,
+            name=email,
+            user=None,
+            code=code,
+        )
+    )
 
-    res, error = single_sender_wrapper(SUBJECT, body, "Verify your email", email, email)
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    MailDispatcher.send_batch(mails)
 
 
 def password_reset_request_handler(user: User, code: str, url=f'{settings.FRONTEND_VERIFY_EMAIL_URL}'):
     SUBJECT = f'Reset your password for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/reset_password.html'
-
-    with open(TEMPLATE, 'r') as f:
-        body = f.read()
+    TEMPLATE = 'reset_password.html'
+    mails = []
 
     variables = {
         '{{code}}': code,
@@ -137,24 +52,31 @@ def password_reset_request_handler(user: User, code: str, url=f'{settings.FRONTE
         '{{deep_link}}': settings.APP_DEEP_LINK,
     }
 
-    body = body_replace(body, variables)
-
-    mail = create_model(SUBJECT, body, user.email, user, code)
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Reset your password",
+            email=user.email,
+            name=f'{user.name} {user.surname}',
+            user=user,
+            code=code,
+        )
+    )
 
-    res, error = single_sender_wrapper(SUBJECT, body, "Reset your password", user.email, f'{user.name} {user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    MailDispatcher.send_batch(mails)
 
 
 def booking_mail_handler(booking):
     if not booking.user.send_email_notification or not booking.user.notification_settings.booking_email:
         return
     SUBJECT = f'Booking for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/booking.html'
-
-    with open(TEMPLATE, 'r') as f:
-        orginal_body = f.read()
+    TEMPLATE = 'booking.html'
+    mails = []
 
     variables = {
         '{{username}}': booking.user.name,
@@ -169,36 +91,49 @@ def booking_mail_handler(booking):
         '{{currency}}': booking.currency,
     }
 
-    body = body_replace(orginal_body, variables)
-
-    mail = create_model(SUBJECT, body, booking.user.email, user=booking.user)
-
-    res, error = single_sender_wrapper(SUBJECT, body, "Booking", booking.user.email, f'{booking.user.name} {booking.user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Booking",
+            email=booking.user.email,
+            name=f'{booking.user.name} {booking.user.surname}',
+            user=booking.user,
+        )
+    )
 
     variables.update({
         '{{username}}': booking.business.user.name,
         '{{text}}': f"You have a new booking! for {booking.business.store_name}.",
     })
     
-    body = body_replace(orginal_body, variables)
-    mail = create_model(SUBJECT, body, booking.business.user.email, user=booking.business.user)
-    res, error = single_sender_wrapper(SUBJECT, body, "Booking", booking.business.user.email, f'{booking.business.user.name} {booking.business.user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
-    
+    body = MailRenderer.render(TEMPLATE, variables)
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Booking",
+            email=booking.business.user.email,
+            name=f'{booking.business.user.name} {booking.business.user.surname}',
+            user=booking.business.user,
+        )
+    )
+
+    MailDispatcher.send_batch(mails)
+
 
 def cancellation_mail_handler(booking):
     if not booking.user.send_email_notification or not booking.user.notification_settings.booking_cancellation_email:
         return
     SUBJECT = f'Booking cancellation for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/booking.html'
-
-    with open(TEMPLATE, 'r') as f:
-        body = f.read()
+    TEMPLATE = 'booking.html'
+    mails = []
 
     variables = {
         '{{username}}': booking.user.name,
@@ -213,24 +148,30 @@ def cancellation_mail_handler(booking):
         '{{currency}}': booking.currency,
     }
 
-    body = body_replace(body, variables)
-
-    mail = create_model(SUBJECT, body, booking.user.email, user=booking.user)
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Booking cancellation",
+            email=booking.user.email,
+            name=f'{booking.user.name} {booking.user.surname}',
+            user=booking.user,
+        )
+    )
 
-    res, error = single_sender_wrapper(SUBJECT, body, "Booking cancellation", booking.user.email, f'{booking.user.name} {booking.user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    MailDispatcher.send_batch(mails)
 
 
 def apply_mail_handler(apply):
     if not apply.business.user.send_email_notification or not apply.business.user.notification_settings.apply_notification_email:
         return
     SUBJECT = f'Freelancer Apply for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/apply.html'
-
-    with open(TEMPLATE, 'r') as f:
-        body = f.read()
+    TEMPLATE = 'apply.html'
+    mails = []
 
     variables = {
         '{{logo}}': get_logo_url(),
@@ -240,24 +181,30 @@ def apply_mail_handler(apply):
         '{{services}}': apply.business.category.name,
     }
 
-    body = body_replace(body, variables)
-
-    mail = create_model(SUBJECT, body, apply.business.user.email, user=apply.business.user)
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Apply",
+            email=apply.business.user.email,
+            name=f'{apply.business.user.name} {apply.business.user.surname}',
+            user=apply.business.user,
+        )
+    )
 
-    res, error = single_sender_wrapper(SUBJECT, body, "Apply", apply.business.user.email, f'{apply.business.user.name} {apply.business.user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    MailDispatcher.send_batch(mails)
 
 
 def apply_response_mail_handler(apply):
     if not apply.freelancer.user.send_email_notification or not apply.freelancer.user.notification_settings.apply_response_notification_email:
         return
     SUBJECT = f'Freelancer Apply for {settings.PROJECT_NAME}'
-    TEMPLATE = 'mail/templates/apply_response.html'
-
-    with open(TEMPLATE, 'r') as f:
-        body = f.read()
+    TEMPLATE = 'apply_response.html'
+    mails = []
 
     variables = {
         '{{logo}}': get_logo_url(),
@@ -266,11 +213,19 @@ def apply_response_mail_handler(apply):
         '{{location}}': apply.business.address,
     }
 
-    body = body_replace(body, variables)
-
-    mail = create_model(SUBJECT, body, apply.freelancer.user.email, user=apply.freelancer.user)
+    body = MailRenderer.render(TEMPLATE, variables)
+
+    mails.append(
+        OutgoingMail(
+            subject=SUBJECT,
+            body=body,
+            template=TEMPLATE,
+            variables=variables,
+            raw_text="Apply response",
+            email=apply.freelancer.user.email,
+            name=f'{apply.freelancer.user.name} {apply.freelancer.user.surname}',
+            user=apply.freelancer.user,
+        )
+    )
 
-    res, error = single_sender_wrapper(SUBJECT, body, "Apply response", apply.freelancer.user.email, f'{apply.freelancer.user.name} {apply.freelancer.user.surname}')
-    mail.is_send = res
-    mail.error = error
-    mail.save()
+    MailDispatcher.send_batch(mails)
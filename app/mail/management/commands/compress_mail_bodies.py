@@ -0,0 +1,43 @@
+import zlib
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from mail.models import Mail
+
+
+class Command(BaseCommand):
+    help = 'Compress the rendered body of legacy Mail rows in place, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        total = 0
+
+        while True:
+            batch = list(
+                Mail.objects.filter(id__gt=last_id, template__isnull=True)
+                .exclude(body='')
+                .order_by('id')
+                .only('id', 'body')[:batch_size]
+            )
+            if not batch:
+                break
+
+            for mail in batch:
+                mail.compressed_body = zlib.compress(mail.body.encode('utf-8'), 9)
+                mail.body = ''
+
+            with transaction.atomic():
+                Mail.objects.bulk_update(batch, ['compressed_body', 'body'])
+
+            last_id = batch[-1].id
+            total += len(batch)
+            self.stdout.write(f'Compressed {total} mails (last id {last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'Done, compressed {total} mails'))
+
+# to run this command use: python manage.py compress_mail_bodies --batch-size 1000
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mail', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mail',
+            name='body',
+            field=models.TextField(blank=True, default='', help_text='Rendered body, only kept for mails sent without a template'),
+        ),
+        migrations.AddField(
+            model_name='mail',
+            name='compressed_body',
+            field=models.BinaryField(blank=True, help_text='zlib compressed body of mails logged before template references', null=True),
+        ),
+        migrations.AddField(
+            model_name='mail',
+            name='template',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Template'),
+        ),
+        migrations.AddField(
+            model_name='mail',
+            name='template_version',
+            field=models.CharField(blank=True, max_length=16, null=True, verbose_name='Template version'),
+        ),
+        migrations.AddField(
+            model_name='mail',
+            name='variables',
+            field=models.JSONField(blank=True, null=True, verbose_name='Template variables'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mail', '0003_mail_template_reference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MailTemplateSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Template')),
+                ('version', models.CharField(max_length=16, verbose_name='Template version')),
+                ('source', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'version'), name='unique_mail_template_version')],
+            },
+        ),
+    ]
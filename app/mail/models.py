@@ -17,7 +17,33 @@ class Mail(models.Model):
     is_send = models.BooleanField(default=False)
     subject = models.CharField(max_length=500, verbose_name=_("Subject"))
     code = models.CharField(max_length=50, blank=True, null=True)
-    body = models.TextField()
+    body = models.TextField(
+        blank=True,
+        default="",
+        help_text=_("Rendered body, only kept for mails sent without a template"),
+    )
+    compressed_body = models.BinaryField(
+        blank=True,
+        null=True,
+        help_text=_("zlib compressed body of mails logged before template references"),
+    )
+    template = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        verbose_name=_("Template"),
+    )
+    template_version = models.CharField(
+        max_length=16,
+        blank=True,
+        null=True,
+        verbose_name=_("Template version"),
+    )
+    variables = models.JSONField(
+        blank=True,
+        null=True,
+        verbose_name=_("Template variables"),
+    )
     error = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(
         verbose_name=_("Created at"), auto_now=True, editable=False
@@ -27,6 +53,25 @@ class Mail(models.Model):
         return f"{self.email}"
     
 
+class MailTemplateSource(models.Model):
+    """
+    Source of every template version a logged Mail refers to, so old mails render
+    with the template they were sent with.
+    """
+    name = models.CharField(max_length=255, verbose_name=_("Template"))
+    version = models.CharField(max_length=16, verbose_name=_("Template version"))
+    source = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["name", "version"], name="unique_mail_template_version"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.version})"
+
+
 class MailLogo(models.Model):
     logo = models.ImageField(upload_to="mail_logo")
     is_default = models.BooleanField(default=False)
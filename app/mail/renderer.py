@@ -0,0 +1,172 @@
+import hashlib
+import os
+import re
+import time
+import zlib
+from email.mime.image import MIMEImage
+from typing import Dict, Iterable, List, Optional, Set
+
+import settings
+from mail.models import MailLogo, MailTemplateSource
+
+
+CURR_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(CURR_DIR, 'templates')
+IMAGES_DIR = os.path.join(TEMPLATES_DIR, 'images')
+
+PLACEHOLDER_RE = re.compile(r'(\{\{\w+\}\})')
+
+# shared keys win over handler variables, same as the old sequential replace
+SHARED_KEYS = {
+    '{{logo}}': 'cid:logo_cid',
+    '{{facebook_icon}}': 'cid:facebook_cid',
+    '{{instagram_icon}}': 'cid:instagram_cid',
+    '{{x_icon}}': 'cid:x_cid',
+}
+
+INLINE_IMAGES = {
+    'logo.png': 'logo_cid',
+    'facebook.png': 'facebook_cid',
+    'instagram.png': 'instagram_cid',
+    'x.png': 'x_cid',
+}
+
+
+class CompiledMailTemplate:
+    """
+    Mail template split once into literal and {{placeholder}} segments.
+    Rendering substitutes every placeholder in a single pass; unknown placeholders are
+    left untouched.
+    """
+    __slots__ = ('segments', 'version')
+
+    def __init__(self, source: str):
+        # re.split with a capturing group alternates literal, placeholder, literal, ...
+        self.segments: List[str] = PLACEHOLDER_RE.split(source)
+        self.version = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+
+    def render(self, variables: dict) -> str:
+        values = {**variables, **SHARED_KEYS}
+        segments = self.segments
+        parts = []
+        for index, segment in enumerate(segments):
+            if index % 2:
+                value = values.get(segment)
+                parts.append(segment if value is None else str(value))
+            else:
+                parts.append(segment)
+        return ''.join(parts)
+
+    @property
+    def source(self) -> str:
+        return ''.join(self.segments)
+
+
+class MailRenderer:
+    """
+    Process wide cache for compiled mail templates, inline image MIME parts and the
+    default logo url.
+    - render: render a template from mail/templates by file name
+    - get_inline_images: MIME parts built once and reused for every message
+    - get_logo_url: default MailLogo url, cached for MAIL_LOGO_CACHE_SECONDS
+    - remember_templates: store the source of the current template versions once
+    - render_logged: rebuild the body of a logged Mail from its template reference
+    """
+
+    _templates: Dict[str, CompiledMailTemplate] = {}
+    _remembered: Set[str] = set()
+    _inline_images: Optional[List[MIMEImage]] = None
+    _logo_url: Optional[str] = None
+    _logo_url_expires_at: float = 0
+
+    @classmethod
+    def get_template(cls, name: str) -> CompiledMailTemplate:
+        template = cls._templates.get(name)
+        if template is None:
+            with open(os.path.join(TEMPLATES_DIR, name), 'r') as f:
+                template = CompiledMailTemplate(f.read())
+            cls._templates[name] = template
+        return template
+
+    @classmethod
+    def render(cls, name: str, variables: dict) -> str:
+        return cls.get_template(name).render(variables)
+
+    @classmethod
+    def get_inline_images(cls) -> List[MIMEImage]:
+        if cls._inline_images is None:
+            images = []
+            for filename, cid in INLINE_IMAGES.items():
+                image_path = os.path.join(IMAGES_DIR, filename)
+                if not os.path.exists(image_path):
+                    continue
+                with open(image_path, 'rb') as img:
+                    mime_img = MIMEImage(img.read())
+                mime_img.add_header('Content-ID', f'<{cid}>')
+                mime_img.add_header('Content-Disposition', 'inline', filename=filename)
+                images.append(mime_img)
+            cls._inline_images = images
+        return cls._inline_images
+
+    @classmethod
+    def get_logo_url(cls) -> str:
+        now = time.monotonic()
+        if cls._logo_url is None or now >= cls._logo_url_expires_at:
+            logo = MailLogo.objects.filter(is_default=True).first()
+            cls._logo_url = logo.logo.url if logo else ''
+            cls._logo_url_expires_at = now + settings.MAIL_LOGO_CACHE_SECONDS
+        return cls._logo_url
+
+    @classmethod
+    def clear_logo_url(cls):
+        cls._logo_url = None
+
+    @staticmethod
+    def pack_variables(variables: dict) -> dict:
+        """
+        Compact JSON form of handler variables: {'{{code}}': 1234} -> {'code': '1234'}
+        """
+        return {
+            key.strip('{}'): str(value)
+            for key, value in variables.items()
+            if key not in SHARED_KEYS
+        }
+
+    @staticmethod
+    def unpack_variables(variables: Optional[dict]) -> dict:
+        return {f'{{{{{key}}}}}': value for key, value in (variables or {}).items()}
+
+    @classmethod
+    def remember_templates(cls, names: Iterable[str]):
+        """
+        Saves the source of each template version the first time this process logs it.
+        """
+        sources = []
+        for name in set(names) - cls._remembered:
+            template = cls.get_template(name)
+            sources.append(MailTemplateSource(name=name, version=template.version, source=template.source))
+        if sources:
+            MailTemplateSource.objects.bulk_create(sources, ignore_conflicts=True)
+            cls._remembered.update(source.name for source in sources)
+
+    @classmethod
+    def get_logged_template(cls, mail) -> Optional[CompiledMailTemplate]:
+        template = cls.get_template(mail.template)
+        if not mail.template_version or mail.template_version == template.version:
+            return template
+        stored = MailTemplateSource.objects.filter(name=mail.template, version=mail.template_version).first()
+        return CompiledMailTemplate(stored.source) if stored else None
+
+    @classmethod
+    def render_logged(cls, mail) -> str:
+        """
+        Body of a logged Mail: re-rendered from the template version it was sent with and
+        its variables, or the legacy compressed / plain body for older rows.
+        """
+        if mail.template:
+            template = cls.get_logged_template(mail)
+            if template is not None:
+                return template.render(cls.unpack_variables(mail.variables))
+        if mail.compressed_body:
+            return zlib.decompress(bytes(mail.compressed_body)).decode('utf-8')
+        return mail.body
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from mail.models import MailLogo
+from mail.renderer import MailRenderer
+
+
+@receiver(post_save, sender=MailLogo)
+@receiver(post_delete, sender=MailLogo)
+def clear_mail_logo_cache(sender, instance, **kwargs):
+    MailRenderer.clear_logo_url()
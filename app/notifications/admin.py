@@ -4,8 +4,21 @@ from unfold.admin import StackedInline, TabularInline
 from notifications import models as notifications_models
 
 
+class NotificationDeliveryInline(TabularInline):
+    model = notifications_models.NotificationDelivery
+    extra = 0
+    can_delete = False
+    readonly_fields = [
+        'push_id',
+        'is_sent',
+        'error',
+        'created_at',
+    ]
+
+
 @admin.register(notifications_models.NotificationObject)
 class NotificationObjectAdmin(UnfoldModelAdmin):
+    inlines = [NotificationDeliveryInline]
     list_display = [
         'uid',
         'normalized_id',
@@ -27,7 +40,7 @@ class NotificationObjectAdmin(UnfoldModelAdmin):
     ]
     search_fields = [
         'uid',
-        'push_id',
+        'deliveries__push_id',
         'user__email',
         'title',
         'body',
@@ -49,6 +62,30 @@ class NotificationObjectAdmin(UnfoldModelAdmin):
     ]
 
 
+@admin.register(notifications_models.NotificationObjectArchive)
+class NotificationObjectArchiveAdmin(UnfoldModelAdmin):
+    list_display = [
+        'uid',
+        'period',
+        'user',
+        'title',
+        'notification_type',
+        'sent_at',
+        'archived_at',
+    ]
+    list_filter = [
+        'period',
+        'notification_type',
+    ]
+    search_fields = [
+        'uid',
+        'user__email',
+    ]
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # @admin.register(notifications_models.CostumNotification)
 class CostumNotificationAdmin(UnfoldModelAdmin):
     list_display = [
@@ -0,0 +1,84 @@
+import time
+from typing import Optional
+
+from celery import current_app as celery_app
+from redis.exceptions import RedisError
+
+import settings
+from core.redis import redis_storage
+from core.custom_logger import logger
+
+
+class NotificationCoalescer:
+    """
+    Coalesce push/mail tasks per (user, object, notification type) in Redis.
+    - schedule: enqueue the task once per quiet window; later calls inside the window
+      are absorbed, the task reads the latest object state when it runs.
+    - release: called by the task before delivery so the next change schedules again.
+    - per sender rate ceiling: a sender above NOTIFICATION_RATE_LIMIT_PER_USER tasks per
+      NOTIFICATION_RATE_LIMIT_WINDOW_SECONDS stops enqueueing until the window resets.
+    """
+
+    PENDING_KEY_PREFIX = "notification_coalesce"
+    RATE_KEY_PREFIX = "notification_rate"
+
+    @classmethod
+    def build_key(cls, task_name: str, notification_type: str, user_id: int, object_uid: str) -> str:
+        return f"{cls.PENDING_KEY_PREFIX}:{user_id}:{object_uid}:{notification_type}:{task_name}"
+
+    @classmethod
+    def schedule(
+        cls,
+        task_name: str,
+        notification_type: str,
+        user_id: int,
+        object_uid: str,
+        sender_id: Optional[int] = None,
+        window: Optional[int] = None,
+        object_kwarg: str = "booking_uid",
+    ) -> bool:
+        """
+        Returns True if a task was enqueued, False if it was coalesced or throttled.
+        """
+        window = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS if window is None else window
+        key = cls.build_key(task_name, notification_type, user_id, object_uid)
+        kwargs = {
+            object_kwarg: object_uid,
+            "coalesce_key": key,
+        }
+        try:
+            # the marker outlives the window so a busy queue doesn't let duplicates through
+            is_first = redis_storage.connection.set(key, 1, nx=True, ex=window * 2 + 60)
+            if not is_first:
+                return False
+            if sender_id and cls.is_rate_limited(sender_id):
+                redis_storage.connection.delete(key)
+                logger.warning(f"Notification rate ceiling reached for sender {sender_id}, dropping {task_name}")
+                return False
+        except RedisError as e:
+            logger.error(f"Notification coalescer unavailable, sending {task_name} directly: {e}")
+            kwargs.pop("coalesce_key")
+            window = 0
+
+        celery_app.send_task(task_name, kwargs=kwargs, countdown=window)
+        return True
+
+    @classmethod
+    def release(cls, key: Optional[str]):
+        if not key:
+            return
+        try:
+            redis_storage.connection.delete(key)
+        except RedisError as e:
+            logger.error(f"Could not release coalesce key {key}: {e}")
+
+    @classmethod
+    def is_rate_limited(cls, sender_id: int) -> bool:
+        rate_window = settings.NOTIFICATION_RATE_LIMIT_WINDOW_SECONDS
+        bucket = int(time.time() // rate_window)
+        key = f"{cls.RATE_KEY_PREFIX}:{sender_id}:{bucket}"
+        pipe = redis_storage.connection.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, rate_window)
+        count, _ = pipe.execute()
+        return count > settings.NOTIFICATION_RATE_LIMIT_PER_USER
@@ -13,6 +13,15 @@ class NotificationType(TextChoices):
     CLIENT_INVITATION = 'CLIENT_INVITATION', 'CLIENT_INVITATION'
 
 
+class NotificationAudience(TextChoices):
+    CUSTOMER = 'CUSTOMER', 'CUSTOMER'
+    CUSTOMER_WITH_EMPLOYEE = 'CUSTOMER_WITH_EMPLOYEE', 'CUSTOMER_WITH_EMPLOYEE'
+    CUSTOMER_DAILY = 'CUSTOMER_DAILY', 'CUSTOMER_DAILY'
+    BUSINESS = 'BUSINESS', 'BUSINESS'
+    BUSINESS_DAILY = 'BUSINESS_DAILY', 'BUSINESS_DAILY'
+    FREELANCER = 'FREELANCER', 'FREELANCER'
+
+
 class CostumNotificationTypeChoices(TextChoices):
     COSTUM = 'COSTUM', 'COSTUM'
     NEW_MESSAGE = 'NEW_MESSAGE', 'New message'
@@ -1,7 +1,7 @@
 from enum import Enum
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 
 from firebase_admin.messaging import Message, Notification, send
 from firebase_admin.messaging import Notification, MulticastMessage, \
@@ -14,6 +14,7 @@ from notifications import models as notifications_models
 from user.models import UserPushToken
 
 from notifications.firebase_client import FireBaseClient
+from notifications.unread_counter import UnreadCounter
 
 User = get_user_model()
 
@@ -49,9 +50,6 @@ class FirePush:
 
     @staticmethod
     def send_push(fire_push: PushSchema, notifications_instances=None):
-        if not notifications_instances:
-            notifications_instances = []
-        
         o = 'send_push'
         if not fire_push.data.get('click_action'):
             fire_push.data['click_action'] = 'FLUTTER_NOTIFICATION_CLICK'
@@ -64,17 +62,18 @@ class FirePush:
             token=fire_push.push_id,
             data=fire_push.parsed_data
         )
-        notification = FirePush.create_notification_object(fire_push)
+        token_users = FirePush.get_token_users([fire_push.push_id])
+        errors = {}
         try:
             send(message)
             print("Sent push notification successfully")
-            FirePush.mark_notification_as_sent(notification)
         except Exception as e:
             print(f"Error sending push notification: {e}")
-            FirePush.mark_notification_as_fail(notification, str(e))
+            errors[fire_push.push_id] = str(e)
 
-        notifications_instances.append(notification)
-        FirePush.create_notification_objects_batch(notifications_instances)
+        notifications = FirePush.log_notifications(fire_push, [fire_push.push_id], token_users, errors)
+        if notifications_instances is not None:
+            notifications_instances.extend(notifications)
 
     @staticmethod
     def send_msg(fire_msg: MsgSchema):
@@ -100,18 +99,22 @@ class FirePush:
             cls.send_push(msg, notifications_instances)
 
     @staticmethod
-    def create_notification_object(notification: PushSchema, normalized_id=None) -> notifications_models.NotificationObject:
+    def get_token_users(tokens: List[str]) -> Dict[str, int]:
+        """
+        push_id -> user_id for all tokens in one query.
+        Must run before failed tokens are deleted.
+        """
+        return dict(
+            UserPushToken.objects.filter(push_id__in=tokens).values_list('push_id', 'user_id')
+        )
+
+    @staticmethod
+    def create_notification_object(notification: PushSchema, normalized_id=None, user_id=None) -> notifications_models.NotificationObject:
         if not normalized_id:
             normalized_id = f"{timezone.now().timestamp()}-{notification.title}-{notification.body}"
-        token = UserPushToken.objects.filter(push_id=notification.push_id).first()
-        if not token:
-            user = None
-        else:
-            user = token.user
         instance = notifications_models.NotificationObject(
-            push_id=notification.push_id,
             normalized_id=normalized_id,
-            user=user,
+            user_id=user_id,
             title=notification.title,
             body=notification.body,
             data=notification.data,
@@ -155,34 +158,60 @@ class FirePush:
                 body=message.body,
             ),
         )
-        notif_logs = [
-            cls.create_notification_object(
-                PushSchema(push_id=token, title=message.title, body=message.body, data=message.data),
-                normalized_id=normalized_id,
-            ) for token in tokens
-        ]
-        failed_tokens = []
-        error_logs = []
+        token_users = cls.get_token_users(tokens)
+        errors = {}
         result: BatchResponse = send_each_for_multicast(multicast_message)
         if result.failure_count > 0:
             responses = result.responses
             for idx, resp in enumerate(responses):
                 if not resp.success:
                     print(f"Failed to send notification with: {resp.exception}")
-                    failed_tokens.append(tokens[idx])
-                    error_logs.append(str(resp.exception))
-            UserPushToken.objects.filter(push_id__in=failed_tokens).delete()
-            tokens = set(tokens) - set(failed_tokens)
-        cls.log_notifications(notif_logs, failed_tokens, error_logs)
+                    errors[tokens[idx]] = str(resp.exception)
+            UserPushToken.objects.filter(push_id__in=list(errors)).delete()
+        cls.log_notifications(message, tokens, token_users, errors, normalized_id=normalized_id)
         return result
     
     @classmethod
-    def log_notifications(cls, notif_logs: List[notifications_models.NotificationObject], failed_tokens=[], error_logs=[]):
-        failed_notif_logs = [notif for notif in notif_logs if notif.push_id in failed_tokens]
-        success_notif_logs = [notif for notif in notif_logs if notif.push_id not in failed_tokens]
-        for notif in failed_notif_logs:
-            cls.mark_notification_as_fail(notif, error_logs[failed_tokens.index(notif.push_id)])
-        for notif in success_notif_logs:
-            cls.mark_notification_as_sent(notif)
-        cls.create_notification_objects_batch(notif_logs)
-        print("Logged notifications successfully")
\ No newline at end of file
+    def log_notifications(
+        cls,
+        message: PushSchema,
+        tokens: List[str],
+        token_users: Dict[str, int],
+        errors: Dict[str, str],
+        normalized_id=None,
+    ) -> List[notifications_models.NotificationObject]:
+        """
+        One logical NotificationObject per user and one NotificationDelivery per token.
+        The logical row counts as sent when any of the user's devices received it.
+        """
+        user_tokens = {}
+        for token in tokens:
+            user_tokens.setdefault(token_users.get(token), []).append(token)
+
+        notifications = []
+        for user_id, user_push_ids in user_tokens.items():
+            notification = cls.create_notification_object(message, normalized_id=normalized_id, user_id=user_id)
+            delivered = [token for token in user_push_ids if token not in errors]
+            if delivered:
+                cls.mark_notification_as_sent(notification)
+            else:
+                cls.mark_notification_as_fail(notification, errors[user_push_ids[0]])
+                # keeps failed rows in the inbox ordering
+                notification.sent_at = timezone.now()
+            notifications.append(notification)
+        cls.create_notification_objects_batch(notifications)
+
+        deliveries = [
+            notifications_models.NotificationDelivery(
+                notification=notification,
+                push_id=token,
+                is_sent=token not in errors,
+                error=errors.get(token),
+            )
+            for notification, user_push_ids in zip(notifications, user_tokens.values())
+            for token in user_push_ids
+        ]
+        notifications_models.NotificationDelivery.objects.bulk_create(deliveries)
+        UnreadCounter.increment_many({user_id: 1 for user_id in user_tokens if user_id})
+        print("Logged notifications successfully")
+        return notifications
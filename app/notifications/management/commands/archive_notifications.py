@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+import settings
+from notifications.retention import NotificationRetention
+
+
+class Command(BaseCommand):
+    help = 'Move notifications older than NOTIFICATION_RETENTION_DAYS to the archive table, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        cutoff = NotificationRetention.cutoff()
+        total = 0
+        while True:
+            archived = NotificationRetention.archive_batch(cutoff=cutoff, batch_size=options['batch_size'])
+            if not archived:
+                break
+            total += archived
+            self.stdout.write(f'Archived {total} notifications')
+
+        self.stdout.write(self.style.SUCCESS(f'Done, archived {total} notifications created before {cutoff}'))
+
+# to run this command use: python manage.py archive_notifications --batch-size 5000
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:00
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0008_notificationobject_normalized_id_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notificationobject',
+            name='notificatio_user_id_f96ba7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['user', 'normalized_id', '-sent_at'], name='notif_user_norm_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['user', '-sent_at'], name='notif_user_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='notif_created_brin_idx'),
+        ),
+        migrations.CreateModel(
+            name='NotificationObjectArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid', models.UUIDField(unique=True, verbose_name='uid')),
+                ('period', models.CharField(max_length=7, verbose_name='period')),
+                ('normalized_id', models.TextField(blank=True, null=True, verbose_name='normalized_id')),
+                ('push_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='push_id')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('body', models.TextField(blank=True, null=True, verbose_name='body')),
+                ('data', models.JSONField(blank=True, null=True, verbose_name='data')),
+                ('notification_type', models.CharField(blank=True, choices=[('COSTUM', 'COSTUM'), ('NEW_MESSAGE', 'New message'), ('BOOKING_CREATED', 'BOOKING_CREATED'), ('BOOKING_REMINDER', 'BOOKING_REMINDER'), ('BOOKING_UPDATED', 'BOOKING_UPDATED'), ('BOOKING_CANCELLED', 'BOOKING_CANCELLED'), ('APPLY', 'APPLY'), ('APPLY_RESPONSE', 'APPLY_RESPONSE'), ('CLIENT_INVITATION', 'CLIENT_INVITATION')], max_length=255, null=True, verbose_name='notification_type')),
+                ('is_sent', models.BooleanField(default=False, verbose_name='is_sent')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='sent_at')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='error')),
+                ('read_at', models.DateTimeField(blank=True, null=True, verbose_name='read_at')),
+                ('created_at', models.DateTimeField(blank=True, null=True, verbose_name='created_at')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='archived_at')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Archived notification',
+                'verbose_name_plural': 'Archived notifications',
+                'indexes': [models.Index(fields=['period', 'user'], name='notif_archive_period_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BATCH_SIZE = 5000
+
+
+def split_notifications(apps, schema_editor):
+    """
+    Fold the per-token rows of every (user, normalized_id) event into the newest row and
+    keep one delivery per token.
+    """
+    NotificationObject = apps.get_model('notifications', 'NotificationObject')
+    NotificationDelivery = apps.get_model('notifications', 'NotificationDelivery')
+
+    NotificationObject.objects.filter(sent_at__isnull=True).update(sent_at=models.F('created_at'))
+
+    rows = (
+        NotificationObject.objects.filter(push_id__isnull=False)
+        .order_by('user_id', 'normalized_id', '-sent_at', '-id')
+        .values_list('id', 'user_id', 'normalized_id', 'push_id', 'is_sent', 'error')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    kept = {}
+    deliveries = []
+    duplicates = []
+    for row_id, user_id, normalized_id, push_id, is_sent, error in rows:
+        key = (user_id, normalized_id) if normalized_id else (user_id, row_id)
+        # rows come newest first per event, the first one is kept as the logical row
+        notification_id = kept.setdefault(key, row_id)
+        if notification_id != row_id:
+            duplicates.append(row_id)
+        deliveries.append(
+            NotificationDelivery(
+                notification_id=notification_id,
+                push_id=push_id,
+                is_sent=is_sent,
+                error=error,
+            )
+        )
+        if len(deliveries) >= BATCH_SIZE:
+            NotificationDelivery.objects.bulk_create(deliveries)
+            deliveries = []
+        if len(kept) >= BATCH_SIZE:
+            # sorted by user first, keys of earlier users will not come back
+            kept = {key: value for key, value in kept.items() if key[0] == user_id}
+
+    NotificationDelivery.objects.bulk_create(deliveries)
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        NotificationObject.objects.filter(id__in=duplicates[start:start + BATCH_SIZE]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0009_notification_indexes_and_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('push_id', models.CharField(max_length=255, verbose_name='push_id')),
+                ('is_sent', models.BooleanField(default=False, verbose_name='is_sent')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created_at')),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='notifications.notificationobject', verbose_name='notification')),
+            ],
+            options={
+                'verbose_name': 'Notification delivery',
+                'verbose_name_plural': 'Notification deliveries',
+            },
+        ),
+        migrations.AlterField(
+            model_name='notificationobject',
+            name='push_id',
+            field=models.CharField(blank=True, help_text='Only set on notifications logged per token, see deliveries for newer ones.', max_length=255, null=True, verbose_name='push_id'),
+        ),
+        migrations.RunPython(split_notifications, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='notificationobject',
+            name='notif_user_norm_sent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notificationobject',
+            name='notif_user_sent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['user', '-sent_at', '-id'], name='notif_user_sent_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationobject',
+            index=models.Index(fields=['user', 'normalized_id'], name='notif_user_norm_idx'),
+        ),
+    ]
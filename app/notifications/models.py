@@ -1,5 +1,6 @@
 
 from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
 from django.utils.translation import gettext_lazy as _
 from uuid import uuid4
 
@@ -19,7 +20,11 @@ class NotificationObject(models.Model):
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         indexes = [
-            models.Index(fields=['user', 'normalized_id']),
+            # inbox: one logical row per user and event, newest first
+            models.Index(fields=['user', '-sent_at', '-id'], name='notif_user_sent_id_idx'),
+            models.Index(fields=['user', 'normalized_id'], name='notif_user_norm_idx'),
+            # rows are appended in time order, BRIN keeps retention scans cheap
+            BrinIndex(fields=['created_at'], name='notif_created_brin_idx'),
         ]
 
     uid = models.UUIDField(
@@ -40,6 +45,7 @@ class NotificationObject(models.Model):
         max_length=255,
         blank=True,
         null=True,
+        help_text=_('Only set on notifications logged per token, see deliveries for newer ones.'),
     )
     user = models.ForeignKey(
         "user.User",
@@ -113,8 +119,13 @@ class NotificationObject(models.Model):
         return f'{self.title}'
     
     def mark_as_read(self):
+        from notifications.unread_counter import UnreadCounter
+
+        was_unread = self.read_at is None
         self.read_at = timezone.now()
         self.save()
+        if was_unread and self.user_id:
+            UnreadCounter.decrement(self.user_id)
     
     def save(self, *args, **kwargs):
         if self.is_sent and not self.sent_at:
@@ -129,6 +140,135 @@ class NotificationObject(models.Model):
 
     
 
+class NotificationDelivery(models.Model):
+    """
+    Delivery of a logical NotificationObject to one push token.
+    """
+    class Meta:
+        verbose_name = _('Notification delivery')
+        verbose_name_plural = _('Notification deliveries')
+
+    notification = models.ForeignKey(
+        NotificationObject,
+        verbose_name=_('notification'),
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+    )
+    push_id = models.CharField(
+        verbose_name=_('push_id'),
+        max_length=255,
+    )
+    is_sent = models.BooleanField(
+        verbose_name=_('is_sent'),
+        default=False,
+    )
+    error = models.TextField(
+        verbose_name=_('error'),
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_('created_at'),
+        auto_now_add=True,
+    )
+
+    def __str__(self):
+        return f'{self.notification_id} - {self.push_id}'
+
+
+class NotificationObjectArchive(models.Model):
+    """
+    Notifications moved out of NotificationObject by the retention policy.
+    period is the 'YYYY-MM' month the notification was created in.
+    """
+    class Meta:
+        verbose_name = _('Archived notification')
+        verbose_name_plural = _('Archived notifications')
+        indexes = [
+            models.Index(fields=['period', 'user'], name='notif_archive_period_idx'),
+        ]
+
+    uid = models.UUIDField(
+        verbose_name=_('uid'),
+        unique=True,
+    )
+    period = models.CharField(
+        verbose_name=_('period'),
+        max_length=7,
+    )
+    normalized_id = models.TextField(
+        verbose_name=_('normalized_id'),
+        null=True,
+        blank=True,
+    )
+    push_id = models.CharField(
+        verbose_name=_('push_id'),
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    user = models.ForeignKey(
+        "user.User",
+        verbose_name=_('user'),
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+        null=True,
+        blank=True,
+    )
+    title = models.CharField(
+        verbose_name=_('title'),
+        max_length=255,
+    )
+    body = models.TextField(
+        verbose_name=_('body'),
+        null=True,
+        blank=True,
+    )
+    data = models.JSONField(
+        verbose_name=_('data'),
+        null=True,
+        blank=True,
+    )
+    notification_type = models.CharField(
+        verbose_name=_('notification_type'),
+        choices=NotificationType.choices,
+        max_length=255,
+        null=True,
+        blank=True,
+    )
+    is_sent = models.BooleanField(
+        verbose_name=_('is_sent'),
+        default=False,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name=_('sent_at'),
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(
+        verbose_name=_('error'),
+        null=True,
+        blank=True,
+    )
+    read_at = models.DateTimeField(
+        verbose_name=_('read_at'),
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_('created_at'),
+        null=True,
+        blank=True,
+    )
+    archived_at = models.DateTimeField(
+        verbose_name=_('archived_at'),
+        auto_now_add=True,
+    )
+
+    def __str__(self):
+        return f'{self.title}'
+
+
 class CostumNotification(models.Model):
 
     uid = models.UUIDField(
@@ -0,0 +1,239 @@
+from string import Formatter
+from typing import Dict, List, Tuple
+
+from notifications.enums import NotificationType, NotificationAudience
+
+
+DEFAULT_LANG_CODE = 'en'
+
+
+class CompiledTemplate:
+    """
+    Template string parsed once into literal and field segments.
+    Rendering is a single join over the segments, no re-parsing per call.
+    eg:
+        CompiledTemplate("Your booking for {business_name} has been confirmed.")
+    """
+    __slots__ = ('source', '_segments')
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments: List[Tuple[str, str]] = [
+            (literal, field_name)
+            for literal, field_name, _, _ in Formatter().parse(source)
+        ]
+
+    def render(self, context: dict) -> str:
+        return ''.join(
+            literal + (str(context[field_name]) if field_name else '')
+            for literal, field_name in self._segments
+        )
+
+
+class LocalizedTemplate:
+    """
+    Title and body templates for every supported language.
+    Unknown languages fall back to DEFAULT_LANG_CODE.
+    """
+    __slots__ = ('titles', 'bodies')
+
+    def __init__(self, title: Dict[str, str], body: Dict[str, str]):
+        self.titles = {lang: CompiledTemplate(text) for lang, text in title.items()}
+        self.bodies = {lang: CompiledTemplate(text) for lang, text in body.items()}
+
+    @staticmethod
+    def normalize_lang_code(lang_code: str) -> str:
+        return (lang_code or DEFAULT_LANG_CODE).lower().split('-')[0]
+
+    def render(self, lang_code: str, context: dict) -> Tuple[str, str]:
+        lang_code = self.normalize_lang_code(lang_code)
+        title = self.titles.get(lang_code) or self.titles[DEFAULT_LANG_CODE]
+        body = self.bodies.get(lang_code) or self.bodies[DEFAULT_LANG_CODE]
+        return title.render(context), body.render(context)
+
+
+BOOKING_CREATED_TITLE = {
+    'en': "Booking Created",
+    'sq': "Rezervimi u krijua",
+}
+BOOKING_CANCELLED_TITLE = {
+    'en': "Booking Cancelled",
+    'sq': "Rezervimi u anullua",
+}
+BOOKING_UPDATED_TITLE = {
+    'en': "Booking Updated",
+    'sq': "Rezervimi u përditësua",
+}
+BOOKING_REMINDER_TITLE = {
+    'en': "Booking Reminder",
+    'sq': "Kujtesë për rezervimin",
+}
+
+
+class NotificationTemplateRegistry:
+    """
+    Localized push templates keyed by NotificationType and audience.
+    Templates are compiled once at import time; adding a language only means
+    adding a key to the dictionaries below.
+    """
+
+    TEMPLATES: Dict[str, Dict[str, LocalizedTemplate]] = {
+        NotificationType.BOOKING_CREATED: {
+            NotificationAudience.CUSTOMER: LocalizedTemplate(
+                title=BOOKING_CREATED_TITLE,
+                body={
+                    'en': "Your booking for {business_name} has been confirmed.",
+                    'sq': "Rezervimi juaj për {business_name} është konfirmuar.",
+                },
+            ),
+            NotificationAudience.CUSTOMER_WITH_EMPLOYEE: LocalizedTemplate(
+                title=BOOKING_CREATED_TITLE,
+                body={
+                    'en': "Your booking with {employee_name} has been confirmed.",
+                    'sq': "Rezervimi juaj me {employee_name} është konfirmuar.",
+                },
+            ),
+            NotificationAudience.BUSINESS: LocalizedTemplate(
+                title=BOOKING_CREATED_TITLE,
+                body={
+                    'en': "You have a new booking for {business_name} with {user_name}.",
+                    'sq': "Keni një rezervim të ri për {business_name} me {user_name}.",
+                },
+            ),
+        },
+        NotificationType.BOOKING_CANCELLED: {
+            NotificationAudience.CUSTOMER: LocalizedTemplate(
+                title=BOOKING_CANCELLED_TITLE,
+                body={
+                    'en': "Your booking for {business_name} has been cancelled.",
+                    'sq': "Rezervimi juaj për {business_name} është anuluar.",
+                },
+            ),
+            NotificationAudience.CUSTOMER_WITH_EMPLOYEE: LocalizedTemplate(
+                title=BOOKING_CANCELLED_TITLE,
+                body={
+                    'en': "Your booking with {employee_name} has been cancelled.",
+                    'sq': "Rezervimi juaj me {employee_name} është anuluar.",
+                },
+            ),
+            NotificationAudience.BUSINESS: LocalizedTemplate(
+                title=BOOKING_CANCELLED_TITLE,
+                body={
+                    'en': "The booking with {user_name} has been cancelled.",
+                    'sq': "Rezervimi me {user_name} është anuluar.",
+                },
+            ),
+        },
+        NotificationType.BOOKING_UPDATED: {
+            NotificationAudience.CUSTOMER: LocalizedTemplate(
+                title=BOOKING_UPDATED_TITLE,
+                body={
+                    'en': "Your booking for {business_name} has been updated.",
+                    'sq': "Rezervimi juaj për {business_name} është përditësuar.",
+                },
+            ),
+            NotificationAudience.CUSTOMER_WITH_EMPLOYEE: LocalizedTemplate(
+                title=BOOKING_UPDATED_TITLE,
+                body={
+                    'en': "Your booking with {employee_name} has been updated.",
+                    'sq': "Rezervimi juaj me {employee_name} është përditësuar.",
+                },
+            ),
+            NotificationAudience.BUSINESS: LocalizedTemplate(
+                title=BOOKING_UPDATED_TITLE,
+                body={
+                    'en': "The booking with {user_name} has been updated.",
+                    'sq': "Rezervimi me {user_name} është përditësuar.",
+                },
+            ),
+        },
+        NotificationType.BOOKING_REMINDER: {
+            NotificationAudience.CUSTOMER: LocalizedTemplate(
+                title=BOOKING_REMINDER_TITLE,
+                body={
+                    'en': "Your upcoming appointment for {business_name} is scheduled for {date} at {start_time}.",
+                    'sq': "Takimi juaj i ardhshëm për {business_name} është planifikuar për {date} në {start_time}.",
+                },
+            ),
+            NotificationAudience.CUSTOMER_WITH_EMPLOYEE: LocalizedTemplate(
+                title=BOOKING_REMINDER_TITLE,
+                body={
+                    'en': "Your upcoming appointment with {employee_name} is scheduled for {date} at {start_time}.",
+                    'sq': "Takimi juaj i ardhshëm me {employee_name} është planifikuar për {date} në {start_time}.",
+                },
+            ),
+            NotificationAudience.BUSINESS: LocalizedTemplate(
+                title=BOOKING_REMINDER_TITLE,
+                body={
+                    'en': "You have an upcoming appointment with {user_name} on {date} at {start_time}.",
+                    'sq': "Keni një takim të ardhshëm me {user_name} më {date} në {start_time}.",
+                },
+            ),
+            NotificationAudience.CUSTOMER_DAILY: LocalizedTemplate(
+                title=BOOKING_REMINDER_TITLE,
+                body={
+                    'en': "Your upcoming {business_name} appointment is scheduled for {date} at {start_time}.",
+                    'sq': "Takimi juaj i ardhshëm në {business_name} është planifikuar për {date} në {start_time}.",
+                },
+            ),
+            NotificationAudience.BUSINESS_DAILY: LocalizedTemplate(
+                title=BOOKING_REMINDER_TITLE,
+                body={
+                    'en': "You have an upcoming appointment with {user_name} scheduled for {date} at {start_time}.",
+                    'sq': "Keni një takim të ardhshëm me {user_name} të planifikuar për {date} në {start_time}.",
+                },
+            ),
+        },
+        NotificationType.APPLY: {
+            NotificationAudience.BUSINESS: LocalizedTemplate(
+                title={
+                    'en': "Collaboration Request",
+                    'sq': "Kërkesë për bashkëpunim",
+                },
+                body={
+                    'en': (
+                        "You have received a collaboration request from {freelancer_name} "
+                        "{freelancer_surname} for your business {store_name}."
+                    ),
+                    'sq': (
+                        "Keni marrë një kërkesë bashkëpunimi nga {freelancer_name} "
+                        "{freelancer_surname} për biznesin tuaj {store_name}."
+                    ),
+                },
+            ),
+        },
+        NotificationType.APPLY_RESPONSE: {
+            NotificationAudience.FREELANCER: LocalizedTemplate(
+                title={
+                    'en': "Application Response",
+                    'sq': "Përgjigje e aplikimit",
+                },
+                body={
+                    'en': "Your application to {business_name} has been {status}.",
+                    'sq': "Aplikimi juaj te {business_name} është {status}.",
+                },
+            ),
+        },
+        NotificationType.CLIENT_INVITATION: {
+            NotificationAudience.CUSTOMER: LocalizedTemplate(
+                title={
+                    'en': "Client List Request",
+                    'sq': "Kërkesë për listën e klientëve",
+                },
+                body={
+                    'en': (
+                        "{store_name} would like to add you to their client list to make future bookings easier for you. "
+                        "If you accept, your email address and phone number will be shared with them."
+                    ),
+                    'sq': (
+                        "{store_name} dëshiron t'ju shtojë në listën e tyre të klientëve për t'ju lehtësuar rezervimet e ardhshme. "
+                        "Nëse pranoni, adresa juaj e emailit dhe numri i telefonit do t'u ndahen atyre."
+                    ),
+                },
+            ),
+        },
+    }
+
+    @classmethod
+    def get(cls, notification_type: str, audience: str) -> LocalizedTemplate:
+        return cls.TEMPLATES[NotificationType(notification_type)][NotificationAudience(audience)]
@@ -27,22 +27,11 @@ class NotificationFilter(filters.FilterSet):
         )
 
     def filter_order_by(self, queryset, name, value):
-        """Ensure DISTINCT ON(field) compatibility by always ordering first by that field.
-
-        PostgreSQL requires that the ORDER BY list starts with the DISTINCT ON
-        expressions. Since the view applies distinct('normalized_id'), any
-        subsequent re-ordering must keep 'normalized_id' as the leading order
-        expression to avoid: "SELECT DISTINCT ON expressions must match initial ORDER BY expressions".
-
-        We therefore prepend 'normalized_id' to the dynamic ordering field chosen
-        by the client. If the client passes an unknown value we just keep the
-        existing ordering (which already starts with normalized_id from the view).
+        """
+        Plain ORDER BY on sent_at with the id as tie breaker, served by the
+        (user, -sent_at, -id) index. Unknown values keep the view ordering.
         """
         order_field = self.ORDER_BY_MAP.get(value)
         if order_field:
-            # Prepend normalized_id so DISTINCT ON(normalized_id) remains valid
-            return queryset.order_by('normalized_id', order_field)
+            return queryset.order_by(order_field, '-id' if order_field.startswith('-') else 'id')
         return queryset
-    
-    
-
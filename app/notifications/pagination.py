@@ -0,0 +1,15 @@
+from core.pagination import DefaultCursorPager
+from notifications.notifications_filters import NotificationFilter
+
+
+class NotificationCursorPager(DefaultCursorPager):
+    """
+    Keyset pagination over the inbox, follows the order_by filter.
+    """
+    ordering = ('-sent_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        order_field = NotificationFilter.ORDER_BY_MAP.get(request.query_params.get('order_by'))
+        if order_field == 'sent_at':
+            return ('sent_at', 'id')
+        return self.ordering
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+import settings
+from notifications import models as notifications_models
+
+
+ARCHIVED_FIELDS = [
+    'uid',
+    'normalized_id',
+    'push_id',
+    'user_id',
+    'title',
+    'body',
+    'data',
+    'notification_type',
+    'is_sent',
+    'sent_at',
+    'error',
+    'read_at',
+    'created_at',
+]
+
+
+class NotificationRetention:
+    """
+    Retention policy for NotificationObject.
+    - cutoff: notifications created before it are out of the live table window
+    - archive_batch: move one batch of expired notifications to NotificationObjectArchive
+      (or just delete them when NOTIFICATION_ARCHIVE_ENABLED is off)
+    - archive_expired: run archive_batch until nothing is left
+    """
+
+    @staticmethod
+    def cutoff():
+        return timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+
+    @classmethod
+    def archive_batch(cls, cutoff=None, batch_size=None) -> int:
+        cutoff = cutoff or cls.cutoff()
+        batch_size = batch_size or settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+
+        with transaction.atomic():
+            rows = list(
+                notifications_models.NotificationObject.objects
+                .filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .select_for_update(skip_locked=True)
+                .values('id', *ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+
+            if settings.NOTIFICATION_ARCHIVE_ENABLED:
+                notifications_models.NotificationObjectArchive.objects.bulk_create(
+                    [
+                        notifications_models.NotificationObjectArchive(
+                            period=row['created_at'].strftime('%Y-%m'),
+                            **{field: row[field] for field in ARCHIVED_FIELDS},
+                        )
+                        for row in rows
+                    ],
+                    ignore_conflicts=True,
+                )
+            notifications_models.NotificationObject.objects.filter(
+                id__in=[row['id'] for row in rows]
+            ).delete()
+        return len(rows)
+
+    @classmethod
+    def archive_expired(cls, cutoff=None, batch_size=None) -> int:
+        cutoff = cutoff or cls.cutoff()
+        total = 0
+        while True:
+            archived = cls.archive_batch(cutoff=cutoff, batch_size=batch_size)
+            if not archived:
+                return total
+            total += archived
@@ -33,7 +33,6 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = notifications_models.NotificationObject
         fields = [
             'uid',
-            'push_id',
             'title',
             'notification_type',
             'body',
@@ -44,6 +43,10 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
 
 
+class NotificationUnreadCountSerializer(serializers.Serializer):
+    unread_count = serializers.IntegerField(read_only=True)
+
+
 class NotificationMarkReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = notifications_models.NotificationObject
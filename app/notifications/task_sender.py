@@ -1,8 +1,10 @@
+from collections import defaultdict
 from celery import current_app as celery_app
-from typing import List
+from typing import Dict, List, Tuple
 
 from notifications.fire_push import PushSchema
-from notifications.enums import NotificationType
+from notifications.enums import NotificationType, NotificationAudience
+from notifications.notification_templates import NotificationTemplateRegistry
 
 from core.custom_logger import logger
 
@@ -17,15 +19,10 @@ class NotificationTaskSender:
     - Send notifications using celery tasks
     - methods:
         - send: send a push notification
+        - send_templated: render a registered template per recipient language and send
+          one multicast per distinct message
         - get_user_push_ids: get push ids of users that have push notifications enabled
     """
-    
-
-    @staticmethod
-    def _localized_text(lang_owner, text_en: str, text_sq: str) -> str:
-        lang_code = getattr(lang_owner, 'lang_code', lang_owner)
-        lang_code = (lang_code or '').lower()
-        return text_sq if lang_code == 'sq' else text_en
 
     # ------------- MAIN SENDERS -------------
     @classmethod
@@ -52,330 +49,232 @@ class NotificationTaskSender:
             **filter_kwargs
         ).values_list('push_tokens__push_id', flat=True))
         push_ids = list(set([push_id for push_id in push_ids if push_id]))
-        logger.info(f"Push ids: {push_ids}")
+        logger.debug("Push ids count: {}", len(push_ids))
         return push_ids
 
-    # ------------- NOTIFICATION SENDERS -------------
+    @classmethod
+    def get_recipients_push_ids(cls, users_ids, filter_kwargs={}) -> List[Tuple[int, str, str]]:
+        """
+        Get (user_id, lang_code, push_id) rows of users that have push notifications enabled,
+        in a single query.
+        """
+        rows = User.objects.filter(
+            id__in=users_ids,
+            send_push_notifications=True,
+            **filter_kwargs
+        ).values_list('id', 'lang_code', 'push_tokens__push_id').distinct()
+        return [row for row in rows if row[2]]
 
     @classmethod
-    def send_booking_notification(cls, booking: business_models.UserBusinesBooking):
+    def send_templated(
+        cls,
+        notification_type: NotificationType,
+        recipients: List[Tuple[int, NotificationAudience]],
+        context: dict,
+        data: dict,
+        filter_kwargs={},
+    ):
         """
-        Send booking notification to the user and the business owner
+        Render the registered template once per (audience, lang_code) and group push ids by
+        the rendered text, so each distinct message is sent as one multicast.
+        - recipients: list of (user_id, audience)
         """
-        filter_kwargs = {
-            'notification_settings__booking_notification': True,
-        }
-        user_push_ids = cls.get_user_push_ids(users_ids=[booking.user.id], filter_kwargs=filter_kwargs)
-        business_push_ids = cls.get_user_push_ids(users_ids=[booking.business.user.id], filter_kwargs=filter_kwargs)
-        
-        title_en = "Booking Created"
-        title_sq = "Rezervimi u krijua"
-        body_en = f"Your booking for {booking.business.name} has been confirmed." if not booking.employee else f"Your booking with {booking.employee.name} has been confirmed."
-        body_sq = f"Rezervimi juaj për {booking.business.name} është konfirmuar." if not booking.employee else f"Rezervimi juaj me {booking.employee.name} është konfirmuar."
-        body = cls._localized_text(booking.user, body_en, body_sq)
-        title = cls._localized_text(booking.user, title_en, title_sq)
+        audiences_by_user: Dict[int, List[NotificationAudience]] = defaultdict(list)
+        for user_id, audience in recipients:
+            audiences_by_user[user_id].append(audience)
 
-        if user_push_ids:
-            notification = PushSchema(
-                title=title,
-                body=body,
-                push_id=user_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_CREATED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
+        rows = cls.get_recipients_push_ids(
+            users_ids=list(audiences_by_user.keys()),
+            filter_kwargs=filter_kwargs,
+        )
+
+        rendered: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        push_ids_by_message: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for user_id, lang_code, push_id in rows:
+            for audience in audiences_by_user[user_id]:
+                key = (audience, lang_code)
+                if key not in rendered:
+                    template = NotificationTemplateRegistry.get(notification_type, audience)
+                    rendered[key] = template.render(lang_code, context)
+                message_push_ids = push_ids_by_message[rendered[key]]
+                if push_id not in message_push_ids:
+                    message_push_ids.append(push_id)
+
+        for (title, body), push_ids in push_ids_by_message.items():
+            cls.send(
+                PushSchema(
+                    title=title,
+                    body=body,
+                    push_id=push_ids,
+                    data={
+                        'type': NotificationType(notification_type).value,
+                        **data,
+                    },
+                )
             )
 
-            cls.send(notification)
+    @staticmethod
+    def _booking_context(booking: business_models.UserBusinesBooking, with_schedule=False) -> dict:
+        context = {
+            'business_name': booking.business.name,
+            'employee_name': booking.employee.name if booking.employee else '',
+            'user_name': booking.user.name,
+        }
+        if with_schedule:
+            context.update({
+                'date': booking.date_str,
+                'start_time': booking.start_time_str,
+            })
+        return context
 
-        body_en = f"You have a new booking for {booking.business.name} with {booking.user.name}."
-        body_sq = f"Keni një rezervim të ri për {booking.business.name} me {booking.user.name}."
-        body = cls._localized_text(booking.business.user, body_en, body_sq)
-        title = cls._localized_text(booking.business.user, title_en, title_sq)
+    @staticmethod
+    def _booking_data(booking: business_models.UserBusinesBooking) -> dict:
+        return {
+            'booking_uid': str(booking.uid),
+            'business_uid': str(booking.business.uid),
+            'user_uid': str(booking.user.uid),
+        }
 
-        if business_push_ids:
-            notification = PushSchema(
-                title=title,
-                body=body,
-                push_id=business_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_CREATED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
+    @staticmethod
+    def _customer_audience(booking: business_models.UserBusinesBooking) -> NotificationAudience:
+        if booking.employee:
+            return NotificationAudience.CUSTOMER_WITH_EMPLOYEE
+        return NotificationAudience.CUSTOMER
+
+    # ------------- NOTIFICATION SENDERS -------------
+
+    @classmethod
+    def send_booking_notification(cls, booking: business_models.UserBusinesBooking):
+        """
+        Send booking notification to the user and the business owner
+        """
+        cls.send_templated(
+            NotificationType.BOOKING_CREATED,
+            recipients=[
+                (booking.user.id, cls._customer_audience(booking)),
+                (booking.business.user.id, NotificationAudience.BUSINESS),
+            ],
+            context=cls._booking_context(booking),
+            data=cls._booking_data(booking),
+            filter_kwargs={
+                'notification_settings__booking_notification': True,
+            },
+        )
 
-            cls.send(notification)
-    
     @classmethod
     def send_booking_cancellation_notification(cls, booking: business_models.UserBusinesBooking):
         """
         Send booking cancellation notification to the user and the business owner
         """
-        filter_kwargs = {
-            'notification_settings__booking_cancellation_notification': True,
-        }
-        user_push_ids = cls.get_user_push_ids(users_ids=[booking.user.id], filter_kwargs=filter_kwargs)
-        business_push_ids = cls.get_user_push_ids(users_ids=[booking.business.user.id], filter_kwargs=filter_kwargs)
-
-        title_en = "Booking Cancelled"
-        title_sq = "Rezervimi u anullua"
-        user_body_en = f"Your booking for {booking.business.name} has been cancelled." if not booking.employee else f"Your booking with {booking.employee.name} has been cancelled."
-        user_body_sq = f"Rezervimi juaj për {booking.business.name} është anuluar." if not booking.employee else f"Rezervimi juaj me {booking.employee.name} është anuluar."
-        business_body_en = f"The booking with {booking.user.name} has been cancelled."
-        business_body_sq = f"Rezervimi me {booking.user.name} është anuluar."
-
-        if user_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.user, title_en, title_sq),
-                body=cls._localized_text(booking.user, user_body_en, user_body_sq),
-                push_id=user_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_CANCELLED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
+        cls.send_templated(
+            NotificationType.BOOKING_CANCELLED,
+            recipients=[
+                (booking.user.id, cls._customer_audience(booking)),
+                (booking.business.user.id, NotificationAudience.BUSINESS),
+            ],
+            context=cls._booking_context(booking),
+            data=cls._booking_data(booking),
+            filter_kwargs={
+                'notification_settings__booking_cancellation_notification': True,
+            },
+        )
 
-        if business_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.business.user, title_en, title_sq),
-                body=cls._localized_text(booking.business.user, business_body_en, business_body_sq),
-                push_id=business_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_CANCELLED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
-    
     @classmethod
     def send_booking_updated_notification(cls, booking: business_models.UserBusinesBooking):
         """
         Send booking updated notification to the user and the business owner
         """
-        # Get the push ids of the user and the business owner
-        filter_kwargs = {
-            'notification_settings__booking_notification': True,
-        }
-        user_push_ids = cls.get_user_push_ids(users_ids=[booking.user.id], filter_kwargs=filter_kwargs)
-        business_push_ids = cls.get_user_push_ids(users_ids=[booking.business.user.id], filter_kwargs=filter_kwargs)
-
-        title_en = "Booking Updated"
-        title_sq = "Rezervimi u përditësua"
-        user_body_en = (
-            f"Your booking for {booking.business.name} has been updated."
-            if not booking.employee
-            else f"Your booking with {booking.employee.name} has been updated."
-        )
-        user_body_sq = (
-            f"Rezervimi juaj për {booking.business.name} është përditësuar."
-            if not booking.employee
-            else f"Rezervimi juaj me {booking.employee.name} është përditësuar."
+        cls.send_templated(
+            NotificationType.BOOKING_UPDATED,
+            recipients=[
+                (booking.user.id, cls._customer_audience(booking)),
+                (booking.business.user.id, NotificationAudience.BUSINESS),
+            ],
+            context=cls._booking_context(booking),
+            data=cls._booking_data(booking),
+            filter_kwargs={
+                'notification_settings__booking_notification': True,
+            },
         )
-        business_body_en = f"The booking with {booking.user.name} has been updated."
-        business_body_sq = f"Rezervimi me {booking.user.name} është përditësuar."
-
-        if user_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.user, title_en, title_sq),
-                body=cls._localized_text(booking.user, user_body_en, user_body_sq),
-                push_id=user_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_UPDATED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
-
-        if business_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.business.user, title_en, title_sq),
-                body=cls._localized_text(booking.business.user, business_body_en, business_body_sq),
-                push_id=business_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_UPDATED.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
 
     @classmethod
     def send_reminder_notification(cls, booking: business_models.UserBusinesBooking):
         """
         Send reminder notification to the user and the business owner
         """
-        # Get the push ids of the user and the business owner
-        filter_kwargs = {
-            'notification_settings__reminder_notification': True,
-        }
-        user_push_ids = cls.get_user_push_ids(users_ids=[booking.user.id], filter_kwargs=filter_kwargs)
-        business_push_ids = cls.get_user_push_ids(users_ids=[booking.business.user.id], filter_kwargs=filter_kwargs)
-
-        title_en = "Booking Reminder"
-        title_sq = "Kujtesë për rezervimin"
-        user_body_en = (
-            f"Your upcoming appointment for {booking.business.name} is scheduled for {booking.date_str} at {booking.start_time_str}."
-            if not booking.employee
-            else f"Your upcoming appointment with {booking.employee.name} is scheduled for {booking.date_str} at {booking.start_time_str}."
-        )
-        user_body_sq = (
-            f"Takimi juaj i ardhshëm për {booking.business.name} është planifikuar për {booking.date_str} në {booking.start_time_str}."
-            if not booking.employee
-            else f"Takimi juaj i ardhshëm me {booking.employee.name} është planifikuar për {booking.date_str} në {booking.start_time_str}."
+        cls.send_templated(
+            NotificationType.BOOKING_REMINDER,
+            recipients=[
+                (booking.user.id, cls._customer_audience(booking)),
+                (booking.business.user.id, NotificationAudience.BUSINESS),
+            ],
+            context=cls._booking_context(booking, with_schedule=True),
+            data=cls._booking_data(booking),
+            filter_kwargs={
+                'notification_settings__reminder_notification': True,
+            },
         )
-        business_body_en = f"You have an upcoming appointment with {booking.user.name} on {booking.date_str} at {booking.start_time_str}."
-        business_body_sq = f"Keni një takim të ardhshëm me {booking.user.name} më {booking.date_str} në {booking.start_time_str}."
-
-        if user_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.user, title_en, title_sq),
-                body=cls._localized_text(booking.user, user_body_en, user_body_sq),
-                push_id=user_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_REMINDER.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
-
-        if business_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.business.user, title_en, title_sq),
-                body=cls._localized_text(booking.business.user, business_body_en, business_body_sq),
-                push_id=business_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_REMINDER.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
 
     @classmethod
     def send_reminder_notification_daily(cls, booking: business_models.UserBusinesBooking):
         """
         Send reminder notification to the user and the business owner
         """
-        # Get the push ids of the user and the business owner
-        filter_kwargs = {
-            'notification_settings__reminder_notification': True,
-        }
-        user_push_ids = cls.get_user_push_ids(users_ids=[booking.user.id], filter_kwargs=filter_kwargs)
-        business_push_ids = cls.get_user_push_ids(users_ids=[booking.business.user.id], filter_kwargs=filter_kwargs)
-        
-        title_en = "Booking Reminder"
-        title_sq = "Kujtesë për rezervimin"
-        user_body_en = f"Your upcoming {booking.business.name} appointment is scheduled for {booking.date_str} at {booking.start_time_str}."
-        user_body_sq = f"Takimi juaj i ardhshëm në {booking.business.name} është planifikuar për {booking.date_str} në {booking.start_time_str}."
-        business_body_en = f"You have an upcoming appointment with {booking.user.name} scheduled for {booking.date_str} at {booking.start_time_str}."
-        business_body_sq = f"Keni një takim të ardhshëm me {booking.user.name} të planifikuar për {booking.date_str} në {booking.start_time_str}."
-
-        if user_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.user, title_en, title_sq),
-                body=cls._localized_text(booking.user, user_body_en, user_body_sq),
-                push_id=user_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_REMINDER.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
-        
-        if business_push_ids:
-            notification = PushSchema(
-                title=cls._localized_text(booking.business.user, title_en, title_sq),
-                body=cls._localized_text(booking.business.user, business_body_en, business_body_sq),
-                push_id=business_push_ids,
-                data={
-                    'type': NotificationType.BOOKING_REMINDER.value,
-                    'booking_uid': str(booking.uid),
-                    'business_uid': str(booking.business.uid),
-                    'user_uid': str(booking.user.uid),
-                },
-            )
-            cls.send(notification)
+        cls.send_templated(
+            NotificationType.BOOKING_REMINDER,
+            recipients=[
+                (booking.user.id, NotificationAudience.CUSTOMER_DAILY),
+                (booking.business.user.id, NotificationAudience.BUSINESS_DAILY),
+            ],
+            context=cls._booking_context(booking, with_schedule=True),
+            data=cls._booking_data(booking),
+            filter_kwargs={
+                'notification_settings__reminder_notification': True,
+            },
+        )
 
     @classmethod
     def send_apply_notification(cls, apply: onboarding_models.FreelancerBusinessApply):
-        
-        filter_kwargs = {
-            'notification_settings__apply_notification': True,
-        }
-        push_ids = cls.get_user_push_ids(users_ids=[apply.business.user.id], filter_kwargs=filter_kwargs)
-
-        if not push_ids:
-            return
-
-        title_en = "Collaboration Request"
-        title_sq = "Kërkesë për bashkëpunim"
-        body_en = (
-            f"You have received a collaboration request from {apply.freelancer.user.name} "
-            f"{apply.freelancer.user.surname} for your business {apply.business.store_name}."
-        )
-        body_sq = (
-            f"Keni marrë një kërkesë bashkëpunimi nga {apply.freelancer.user.name} "
-            f"{apply.freelancer.user.surname} për biznesin tuaj {apply.business.store_name}."
-        )
-
-        notification = PushSchema(
-            title=cls._localized_text(apply.business.user, title_en, title_sq),
-            body=cls._localized_text(apply.business.user, body_en, body_sq),
-            push_id=push_ids,
+        cls.send_templated(
+            NotificationType.APPLY,
+            recipients=[
+                (apply.business.user.id, NotificationAudience.BUSINESS),
+            ],
+            context={
+                'freelancer_name': apply.freelancer.user.name,
+                'freelancer_surname': apply.freelancer.user.surname,
+                'store_name': apply.business.store_name,
+            },
             data={
-                'type': NotificationType.APPLY.value,
                 'apply_uid': str(apply.uid),
                 'business_uid': str(apply.business.uid),
                 'freelancer_uid': str(apply.freelancer.uid),
             },
+            filter_kwargs={
+                'notification_settings__apply_notification': True,
+            },
         )
-        cls.send(notification)
 
     @classmethod
     def send_apply_response_notification(cls, apply: onboarding_models.FreelancerBusinessApply):
-        
-        filter_kwargs = {
-            'notification_settings__apply_response_notification': True,
-        }
-        push_ids = cls.get_user_push_ids(users_ids=[apply.freelancer.user.id], filter_kwargs=filter_kwargs)
-
-        if not push_ids:
-            return
-
-        title_en = "Application Response"
-        title_sq = "Përgjigje e aplikimit"
-        body_en = f"Your application to {apply.business.name} has been {apply.status}."
-        body_sq = f"Aplikimi juaj te {apply.business.name} është {apply.status}."
-
-        notification = PushSchema(
-            title=cls._localized_text(apply.freelancer.user, title_en, title_sq),
-            body=cls._localized_text(apply.freelancer.user, body_en, body_sq),
-            push_id=push_ids,
+        cls.send_templated(
+            NotificationType.APPLY_RESPONSE,
+            recipients=[
+                (apply.freelancer.user.id, NotificationAudience.FREELANCER),
+            ],
+            context={
+                'business_name': apply.business.name,
+                'status': apply.status,
+            },
             data={
-                'type': NotificationType.APPLY_RESPONSE.value,
                 'apply_uid': str(apply.uid),
                 'business_uid': str(apply.business.uid),
                 'freelancer_uid': str(apply.freelancer.uid),
             },
+            filter_kwargs={
+                'notification_settings__apply_response_notification': True,
+            },
         )
-        cls.send(notification)
 
     @classmethod
     def send_client_created_notification(
@@ -384,39 +283,17 @@ class NotificationTaskSender:
         """
         Send client created notification to the business owner
         """
-        filter_kwargs = {
-        }
-        business_push_ids = cls.get_user_push_ids(
-            users_ids=[client.user.id],
-            filter_kwargs=filter_kwargs
-        )
-
-        if not business_push_ids:
-            return
-
-        title_en = "Client List Request"
-        title_sq = "Kërkesë për listën e klientëve"
-        body_en = (
-            f"{client.business.store_name} would like to add you to their client list to make future bookings easier for you. "
-            "If you accept, your email address and phone number will be shared with them."
-        )
-        body_sq = (
-            f"{client.business.store_name} dëshiron t'ju shtojë në listën e tyre të klientëve për t'ju lehtësuar rezervimet e ardhshme. "
-            "Nëse pranoni, adresa juaj e emailit dhe numri i telefonit do t'u ndahen atyre."
-        )
-
-        notification = PushSchema(
-            title=cls._localized_text(client.user, title_en, title_sq),
-            body=cls._localized_text(client.user, body_en, body_sq),
-            push_id=business_push_ids,
+        cls.send_templated(
+            NotificationType.CLIENT_INVITATION,
+            recipients=[
+                (client.user.id, NotificationAudience.CUSTOMER),
+            ],
+            context={
+                'store_name': client.business.store_name,
+            },
             data={
-                'type': NotificationType.CLIENT_INVITATION.value,
                 'client_uid': str(client.uid),
                 'business_uid': str(client.business.uid),
                 'image': client.business.main_image_url
             },
         )
-
-        cls.send(notification)
-    
-    
\ No newline at end of file
@@ -5,6 +5,9 @@ from notifications.fire_push import FirePush, PushSchema, MsgSchema
 from notifications import models as notifications_models
 from notifications.enums import NotificationType
 from notifications.task_sender import NotificationTaskSender
+from notifications.retention import NotificationRetention
+from notifications.unread_counter import UnreadCounter
+from core.custom_logger import logger
 
 
 @shared_task(name='send_fire_push')
@@ -15,3 +18,14 @@ def send_fire_push_task(fire_push_schema: dict):
     FirePush().send_multicast_message(fire_push_schema)
     print('send_fire_push_task done')
 
+
+@shared_task(name='archive_notifications')
+def archive_notifications_task():
+    archived = NotificationRetention.archive_expired()
+    logger.info(f'Archived {archived} notifications')
+
+
+@shared_task(name='reconcile_unread_notifications')
+def reconcile_unread_notifications_task():
+    checked = UnreadCounter.reconcile()
+    logger.info(f'Reconciled {checked} unread notification counters')
@@ -0,0 +1,142 @@
+from typing import Dict, Iterable, List
+
+from django.db.models import Count
+from redis.exceptions import RedisError
+
+import settings
+from core.redis import redis_storage
+from core.custom_logger import logger
+from notifications import models as notifications_models
+from notifications.retention import NotificationRetention
+
+
+# only touch counters that are already loaded, a missing key is rebuilt from the DB on read
+INCREMENT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+    if value < 0 then
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+        value = 0
+    end
+    return value
+end
+return nil
+"""
+
+
+class UnreadCounter:
+    """
+    Per user unread notification counters in Redis.
+    - get: O(1) read, a missing counter is loaded from the DB once
+    - increment_many: called when notifications are logged
+    - decrement: called when one unread notification is read or cleared
+    - reset: called when all notifications of a user are cleared
+    - reconcile: periodic resync of the loaded counters with the DB
+    Redis errors never break the caller, reads fall back to the DB count.
+    """
+
+    KEY_PREFIX = "notification_unread"
+
+    _increment_script = None
+
+    @classmethod
+    def build_key(cls, user_id: int) -> str:
+        return f"{cls.KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def get_increment_script(cls):
+        if cls._increment_script is None:
+            cls._increment_script = redis_storage.connection.register_script(INCREMENT_IF_EXISTS)
+        return cls._increment_script
+
+    @staticmethod
+    def get_unread_queryset():
+        return notifications_models.NotificationObject.objects.filter(
+            read_at__isnull=True,
+            created_at__gte=NotificationRetention.cutoff(),
+        )
+
+    @classmethod
+    def count_from_db(cls, user_id: int) -> int:
+        return cls.get_unread_queryset().filter(user_id=user_id).count()
+
+    @classmethod
+    def get(cls, user_id: int) -> int:
+        key = cls.build_key(user_id)
+        try:
+            value = redis_storage.connection.get(key)
+            if value is not None:
+                return max(int(value), 0)
+            count = cls.count_from_db(user_id)
+            # nx: an increment that raced the DB count already loaded the key
+            redis_storage.connection.set(key, count, nx=True, ex=settings.NOTIFICATION_UNREAD_COUNTER_TTL_SECONDS)
+            return count
+        except RedisError as e:
+            logger.error(f"Unread counter unavailable for user {user_id}: {e}")
+            return cls.count_from_db(user_id)
+
+    @classmethod
+    def increment_many(cls, counts: Dict[int, int]):
+        if not counts:
+            return
+        try:
+            script = cls.get_increment_script()
+            pipe = redis_storage.connection.pipeline(transaction=False)
+            for user_id, amount in counts.items():
+                script(keys=[cls.build_key(user_id)], args=[amount], client=pipe)
+            pipe.execute()
+        except RedisError as e:
+            logger.error(f"Could not increment unread counters: {e}")
+
+    @classmethod
+    def increment(cls, user_id: int, amount: int = 1):
+        cls.increment_many({user_id: amount})
+
+    @classmethod
+    def decrement(cls, user_id: int, amount: int = 1):
+        cls.increment_many({user_id: -amount})
+
+    @classmethod
+    def reset(cls, user_id: int):
+        try:
+            redis_storage.connection.set(
+                cls.build_key(user_id), 0, ex=settings.NOTIFICATION_UNREAD_COUNTER_TTL_SECONDS
+            )
+        except RedisError as e:
+            logger.error(f"Could not reset unread counter for user {user_id}: {e}")
+
+    @classmethod
+    def iter_loaded_user_ids(cls, batch_size: int) -> Iterable[List[int]]:
+        batch = []
+        for key in redis_storage.connection.scan_iter(match=f"{cls.KEY_PREFIX}:*", count=batch_size):
+            batch.append(int(key.rsplit(':', 1)[1]))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @classmethod
+    def reconcile(cls, batch_size: int = 1000) -> int:
+        """
+        Overwrite every loaded counter with the DB count, one grouped query per batch.
+        Counters that are not loaded are left alone, they are rebuilt on the next read.
+        Returns the number of counters checked.
+        """
+        checked = 0
+        for user_ids in cls.iter_loaded_user_ids(batch_size):
+            counts = dict(
+                cls.get_unread_queryset()
+                .filter(user_id__in=user_ids)
+                .values('user_id')
+                .annotate(count=Count('id'))
+                .order_by()
+                .values_list('user_id', 'count')
+            )
+            pipe = redis_storage.connection.pipeline(transaction=False)
+            for user_id in user_ids:
+                # xx: don't resurrect a counter that expired while we were counting
+                pipe.set(cls.build_key(user_id), counts.get(user_id, 0), xx=True, keepttl=True)
+            pipe.execute()
+            checked += len(user_ids)
+        return checked
@@ -11,4 +11,5 @@ urlpatterns = [
     path('clear-all-notifications/', notification_views.ClearAllNotificationsView.as_view({'delete':'delete'}), name='clear-all-notifications'),
     path('clear-notification/<str:uid>/', notification_views.ClearNotificationView.as_view(), name='clear-notification'),
     path('mark-as-read/<str:uid>/', notification_views.MarkAsReadView.as_view(), name='mark-as-read'),
+    path('unread-count/', notification_views.UnreadCountView.as_view(), name='unread-count'),
 ]
@@ -14,6 +14,9 @@ from notifications import models as notification_models
 from notifications import serializers as notification_serializers
 
 from notifications import notifications_filters
+from notifications.pagination import NotificationCursorPager
+from notifications.retention import NotificationRetention
+from notifications.unread_counter import UnreadCounter
 from django_filters import rest_framework as filters
 from notifications.enums import NotificationType, OrderByChoices
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
@@ -30,13 +33,16 @@ class MyNotificationsListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.DjangoFilterBackend, ]
     filterset_class = notifications_filters.NotificationFilter
+    pagination_class = NotificationCursorPager
 
     def get_queryset(self):
         return (
             notification_models.NotificationObject.get_annotated_objects()
-            .filter(user=self.request.user)
-            .order_by('normalized_id', '-sent_at')
-            .distinct('normalized_id')
+            .filter(
+                user=self.request.user,
+                created_at__gte=NotificationRetention.cutoff(),
+            )
+            .order_by('-sent_at', '-id')
         )
 
     @extend_schema(
@@ -73,6 +79,7 @@ class ClearAllNotificationsView(GenericViewSet):
         notification_models.NotificationObject.objects.filter(
             user=request.user
         ).delete()
+        UnreadCounter.reset(request.user.id)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 
@@ -86,6 +93,22 @@ class ClearNotificationView(generics.DestroyAPIView):
     lookup_field = 'uid'
     allowed_methods = ['DELETE',]
 
+    def perform_destroy(self, instance):
+        was_unread = instance.read_at is None
+        super().perform_destroy(instance)
+        if was_unread and instance.user_id:
+            UnreadCounter.decrement(instance.user_id)
+
+
+class UnreadCountView(generics.RetrieveAPIView):
+    """
+    Unread notifications badge of the current user, served from the Redis counter
+    """
+    serializer_class = notification_serializers.NotificationUnreadCountSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        return {'unread_count': UnreadCounter.get(self.request.user.id)}
 
 
 class MarkAsReadView(generics.UpdateAPIView):
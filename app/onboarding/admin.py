@@ -79,4 +79,35 @@ class FreelancerBusinessApplyAdmin(UnfoldModelAdmin):
     ]
     list_filter = [
         "status",
-    ]
\ No newline at end of file
+    ]
+
+@admin.register(onboarding_models.DirectUpload)
+class DirectUploadAdmin(UnfoldModelAdmin):
+    """
+    Admin interface for the DirectUpload model.
+    """
+
+    list_display = [
+        "uid",
+        "user",
+        "kind",
+        "status",
+        "size",
+        "created_at",
+    ]
+
+    search_fields = [
+        "user__email",
+        "object_name",
+    ]
+    list_filter = [
+        "kind",
+        "status",
+    ]
+    list_select_related = [
+        "user",
+    ]
+    readonly_fields = [
+        "object_name",
+        "attached_uid",
+    ]
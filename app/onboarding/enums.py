@@ -18,4 +18,17 @@ class ApplicationStatusChoices(TextChoices):
     PENDING = "pending", _("Pending")
     APPROVED = "approved", _("Approved")
     REJECTED = "rejected", _("Rejected")
-    CANCELED = "canceled", _("Canceled")
\ No newline at end of file
+    CANCELED = "canceled", _("Canceled")
+
+class DirectUploadKindChoices(TextChoices):
+    GALLERY_IMAGE = "gallery_image", _("Business gallery image")
+    SERVICE_IMAGE = "service_image", _("Service gallery image")
+    VIDEO = "video", _("Business video")
+    AVATAR = "avatar", _("User avatar")
+
+
+class DirectUploadStatusChoices(TextChoices):
+    PENDING = "pending", _("Pending")
+    CONFIRMED = "confirmed", _("Confirmed")
+    ATTACHED = "attached", _("Attached")
+    FAILED = "failed", _("Failed")
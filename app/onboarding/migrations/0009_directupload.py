@@ -0,0 +1,43 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('onboarding', '0008_costumer_routine_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('kind', models.CharField(choices=[('gallery_image', 'Business gallery image'), ('service_image', 'Service gallery image'), ('video', 'Business video'), ('avatar', 'User avatar')], max_length=20)),
+                ('target_uid', models.UUIDField(blank=True, help_text='Business or service the file is attached to, empty for avatars', null=True)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('is_main', models.BooleanField(default=False)),
+                ('object_name', models.CharField(max_length=255, unique=True)),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('attached', 'Attached'), ('failed', 'Failed')], default='pending', max_length=15)),
+                ('error', models.CharField(blank=True, default='', max_length=255)),
+                ('attached_uid', models.UUIDField(blank=True, help_text='Uid of the gallery image, video or user the file was attached to', null=True)),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='direct_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Direct upload',
+                'verbose_name_plural': 'Direct uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
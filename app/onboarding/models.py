@@ -123,4 +123,54 @@ class FreelancerBusinessApply(models.Model):
             onboarding_utils.add_freelancer_to_employee(
                 freelancer=self.freelancer,
                 business=self.business,
-            )
\ No newline at end of file
+            )
+
+class DirectUpload(models.Model):
+    """
+    A file the client PUTs straight to storage through a signed url, then confirms.
+    The object is validated and attached to its target (business gallery, service gallery,
+    business videos or the user avatar) by the attach_direct_upload task.
+    """
+    class Meta:
+        verbose_name = _("Direct upload")
+        verbose_name_plural = _("Direct uploads")
+        ordering = ["-created_at"]
+
+    uid = models.UUIDField(default=uuid4, editable=False, unique=True)
+    user = models.ForeignKey(
+        "user.User",
+        on_delete=models.CASCADE,
+        related_name="direct_uploads",
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=onboarding_enums.DirectUploadKindChoices.choices,
+    )
+    target_uid = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text=_("Business or service the file is attached to, empty for avatars"),
+    )
+    name = models.CharField(max_length=255, blank=True, default="")
+    is_main = models.BooleanField(default=False)
+    object_name = models.CharField(max_length=255, unique=True)
+    content_type = models.CharField(max_length=100)
+    size = models.BigIntegerField()
+    status = models.CharField(
+        max_length=15,
+        choices=onboarding_enums.DirectUploadStatusChoices.choices,
+        default=onboarding_enums.DirectUploadStatusChoices.PENDING,
+    )
+    error = models.CharField(max_length=255, blank=True, default="")
+    attached_uid = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text=_("Uid of the gallery image, video or user the file was attached to"),
+    )
+    expires_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.kind}: {self.object_name} ({self.status})"
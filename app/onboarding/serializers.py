@@ -1,9 +1,13 @@
+import datetime
+
 from rest_framework import serializers
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from onboarding import models as onboarding_models
 from onboarding import enums as onboarding_enums
 from business import models as business_models
+from business.utils.schedule_writer import ScheduleWriter
 from business import serializers as business_serializers
 from business import enums as business_enums
 
@@ -15,6 +19,9 @@ from onboarding import utils as onboarding_utils
 from celery import current_app as celery_app
 from user.enums import UserRoleChoices
 
+from core.uploads import get_upload_backend
+import settings
+
 
 
 class BusinessCreateSerializer(serializers.ModelSerializer):
@@ -241,51 +248,21 @@ class WorkingHoursCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         business = validated_data.pop("business", None)
-
-        day = validated_data["day_of_week"]
-        start = validated_data["start_time"]
-        end = validated_data["end_time"]
-
-        instance = business_models.WorkingHours.objects.filter(
-            day_of_week=day,
-            start_time=start,
-            end_time=end,
-        ).first()
-
-        if instance is None:
-            instance = business_models.WorkingHours.objects.create(
-                day_of_week=day,
-                start_time=start,
-                end_time=end,
-            )
-
-        business.working_hours.add(instance)
-        return instance
+        return ScheduleWriter.add(
+            business,
+            [ScheduleWriter.build_slot(validated_data)],
+            field_name="working_hours",
+        )[0]
     
 
 class BreakingHoursCreateSerializer(WorkingHoursCreateSerializer):
     def create(self, validated_data):
         business = validated_data.pop("business", None)
-
-        day = validated_data["day_of_week"]
-        start = validated_data["start_time"]
-        end = validated_data["end_time"]
-
-        instance = business_models.WorkingHours.objects.filter(
-            day_of_week=day,
-            start_time=start,
-            end_time=end,
-        ).first()
-
-        if instance is None:
-            instance = business_models.WorkingHours.objects.create(
-                day_of_week=day,
-                start_time=start,
-                end_time=end,
-            )
-
-        business.breaking_hours.add(instance)
-        return instance
+        return ScheduleWriter.add(
+            business,
+            [ScheduleWriter.build_slot(validated_data)],
+            field_name="breaking_hours",
+        )[0]
     
 
 class WorkingHoursDeleteSerializer(serializers.ModelSerializer):
@@ -578,6 +555,118 @@ class UploadImageSerializer(serializers.ModelSerializer):
         return instace
     
 
+class DirectUploadRequestSerializer(serializers.ModelSerializer):
+    """
+    First step of a direct upload: validates the declared file and returns the signed url to PUT it to.
+    """
+    target = serializers.UUIDField(
+        source="target_uid",
+        write_only=True,
+        required=False,
+        allow_null=True,
+    )
+    file_name = serializers.CharField(
+        write_only=True,
+        max_length=255,
+    )
+    upload_url = serializers.CharField(read_only=True)
+    upload_method = serializers.CharField(read_only=True, default="PUT")
+    upload_headers = serializers.DictField(read_only=True)
+
+    class Meta:
+        model = onboarding_models.DirectUpload
+        fields = [
+            "uid",
+            "kind",
+            "target",
+            "name",
+            "is_main",
+            "file_name",
+            "content_type",
+            "size",
+            "status",
+            "upload_url",
+            "upload_method",
+            "upload_headers",
+            "expires_at",
+        ]
+        read_only_fields = [
+            "uid",
+            "status",
+            "expires_at",
+        ]
+
+    def validate(self, attrs):
+        kinds = onboarding_enums.DirectUploadKindChoices
+        kind = attrs["kind"]
+        allowed_types = settings.DIRECT_UPLOAD_VIDEO_TYPES if kind == kinds.VIDEO else settings.DIRECT_UPLOAD_IMAGE_TYPES
+        if attrs["content_type"] not in allowed_types:
+            raise serializers.ValidationError({"content_type": _("Unsupported file type.")})
+        if not 0 < attrs["size"] <= settings.MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError({"size": _("File is bigger than max file size.")})
+
+        user = self.context["request"].user
+        target_uid = attrs.get("target_uid")
+        if kind == kinds.AVATAR:
+            attrs["target_uid"] = None
+        elif kind == kinds.SERVICE_IMAGE:
+            service = business_models.Service.objects.filter(uid=target_uid).select_related("business").first()
+            if not service:
+                raise serializers.ValidationError({"target": _("Invalid service uid.")})
+            if not user == service.business.user:
+                raise serializers.ValidationError({"target": _("You are not the owner of this business.")})
+        else:
+            business = business_models.Business.objects.filter(uid=target_uid).first()
+            if not business:
+                raise serializers.ValidationError({"target": _("Invalid business uid.")})
+            if not user == business.user:
+                raise serializers.ValidationError({"target": _("You are not the owner of this business.")})
+        return attrs
+
+    def create(self, validated_data):
+        backend = get_upload_backend()
+        # only informative, the stored name is derived from the validated content type
+        validated_data.pop("file_name")
+        expires_in = datetime.timedelta(minutes=settings.DIRECT_UPLOAD_URL_EXPIRATION_MINUTES)
+        instance = onboarding_models.DirectUpload(
+            user=self.context["request"].user,
+            expires_at=timezone.now() + expires_in,
+            **validated_data,
+        )
+        instance.object_name = backend.object_name(instance.uid, instance.content_type)
+        instance.save()
+        instance.upload_url, instance.upload_headers = backend.put_url(
+            instance.object_name,
+            content_type=instance.content_type,
+            max_size=instance.size,
+            expires_in=expires_in,
+        )
+        # the local stand-in returns a path on this API
+        instance.upload_url = self.context["request"].build_absolute_uri(instance.upload_url)
+        return instance
+
+
+class DirectUploadSerializer(serializers.ModelSerializer):
+    """
+    State of a direct upload, attached_uid is set once it is attached.
+    """
+
+    class Meta:
+        model = onboarding_models.DirectUpload
+        fields = [
+            "uid",
+            "kind",
+            "target_uid",
+            "name",
+            "status",
+            "error",
+            "attached_uid",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class UploadVideoSerializer(serializers.ModelSerializer):
     business = serializers.UUIDField(
         write_only=True,
@@ -779,26 +868,11 @@ class WorkingHoursCreateServiceSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         service = validated_data.pop("service", None)
-
-        day = validated_data["day_of_week"]
-        start = validated_data["start_time"]
-        end = validated_data["end_time"]
-
-        instance = business_models.WorkingHours.objects.filter(
-            day_of_week=day,
-            start_time=start,
-            end_time=end,
-        ).first()
-
-        if instance is None:
-            instance = business_models.WorkingHours.objects.create(
-                day_of_week=day,
-                start_time=start,
-                end_time=end,
-            )
-
-        service.working_hours.add(instance)
-        return instance
+        return ScheduleWriter.add(
+            service,
+            [ScheduleWriter.build_slot(validated_data)],
+            field_name="working_hours",
+        )[0]
 
 
 class EmployeeCreateSerializer(serializers.ModelSerializer):
@@ -1092,26 +1166,11 @@ class WorkingHoursCreateEmployeeSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         employee = validated_data.pop("employee", None)
-
-        day = validated_data["day_of_week"]
-        start = validated_data["start_time"]
-        end = validated_data["end_time"]
-
-        instance = business_models.WorkingHours.objects.filter(
-            day_of_week=day,
-            start_time=start,
-            end_time=end,
-        ).first()
-
-        if instance is None:
-            instance = business_models.WorkingHours.objects.create(
-                day_of_week=day,
-                start_time=start,
-                end_time=end,
-            )
-
-        employee.working_hours.add(instance)
-        return instance
+        return ScheduleWriter.add(
+            employee,
+            [ScheduleWriter.build_slot(validated_data)],
+            field_name="working_hours",
+        )[0]
 
 
 class FreelancerCreateSerializer(serializers.ModelSerializer):
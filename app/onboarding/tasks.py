@@ -0,0 +1,113 @@
+from celery import shared_task
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image
+
+from business import models as business_models
+from core.custom_logger import logger
+from core.uploads import get_upload_backend
+from onboarding import enums as onboarding_enums
+from onboarding import models as onboarding_models
+import settings
+
+
+IMAGE_KINDS = (
+    onboarding_enums.DirectUploadKindChoices.GALLERY_IMAGE,
+    onboarding_enums.DirectUploadKindChoices.SERVICE_IMAGE,
+    onboarding_enums.DirectUploadKindChoices.AVATAR,
+)
+
+
+def validate_uploaded_object(upload, backend) -> str:
+    """
+    Returns the reason the uploaded object can not be attached, empty when it is fine.
+    """
+    stat = backend.stat(upload.object_name, upload.content_type)
+    if stat is None:
+        return "File was not uploaded."
+    if stat["size"] > settings.MAX_UPLOAD_SIZE or stat["size"] != upload.size:
+        return "Uploaded file size does not match the declared size."
+    if stat["content_type"] and stat["content_type"] != upload.content_type:
+        return "Uploaded content type does not match the declared one."
+    if upload.kind in IMAGE_KINDS:
+        try:
+            with default_storage.open(upload.object_name, "rb") as uploaded:
+                Image.open(uploaded).verify()
+        except Exception:
+            return "Uploaded file is not a valid image."
+    return ""
+
+
+def attach_uploaded_object(upload):
+    """
+    Attaches the object the same way the multipart upload views do, returns the uid of the attached row.
+    """
+    kinds = onboarding_enums.DirectUploadKindChoices
+    if upload.kind == kinds.AVATAR:
+        user = upload.user
+        user.avatar = upload.object_name
+        user.save(update_fields=["avatar"])
+        return user.uid
+
+    if upload.kind == kinds.VIDEO:
+        business = business_models.Business.objects.get(uid=upload.target_uid, user=upload.user)
+        video = business_models.VideoGallery.objects.create(name=upload.name, video=upload.object_name)
+        business.videos.add(video)
+        return video.uid
+
+    image = business_models.Gallery.objects.create(
+        name=upload.name,
+        image=upload.object_name,
+        is_main=upload.is_main and upload.kind == kinds.GALLERY_IMAGE,
+    )
+    if upload.kind == kinds.SERVICE_IMAGE:
+        service = business_models.Service.objects.get(uid=upload.target_uid, business__user=upload.user)
+        service.images.add(image)
+    else:
+        business = business_models.Business.objects.get(uid=upload.target_uid, user=upload.user)
+        business.images.add(image)
+        if image.is_main:
+            business.images.exclude(uid=image.uid).update(is_main=False)
+    return image.uid
+
+
+@shared_task(name="attach_direct_upload")
+def attach_direct_upload_task(upload_uid: str):
+    """
+    Validates a confirmed direct upload and attaches it to its target.
+    Invalid objects are deleted from storage and the upload is marked as failed.
+    """
+    statuses = onboarding_enums.DirectUploadStatusChoices
+    upload = onboarding_models.DirectUpload.objects.select_related("user").filter(
+        uid=upload_uid,
+        status=statuses.CONFIRMED,
+    ).first()
+    if upload is None:
+        return
+
+    backend = get_upload_backend()
+    error = validate_uploaded_object(upload, backend)
+    if not error:
+        try:
+            with transaction.atomic():
+                # a retried or duplicated task must not attach the same upload twice
+                if not onboarding_models.DirectUpload.objects.select_for_update().filter(
+                    pk=upload.pk,
+                    status=statuses.CONFIRMED,
+                ).exists():
+                    return
+                upload.attached_uid = attach_uploaded_object(upload)
+                upload.status = statuses.ATTACHED
+                upload.save(update_fields=["attached_uid", "status", "updated_at"])
+            return str(upload.attached_uid)
+        except (business_models.Business.DoesNotExist, business_models.Service.DoesNotExist):
+            error = "Upload target no longer exists."
+
+    logger.warning("Direct upload {} rejected: {}", upload.uid, error)
+    try:
+        backend.delete(upload.object_name)
+    except Exception as e:
+        logger.warning("Could not delete rejected upload {}: {}", upload.object_name, e)
+    upload.status = statuses.FAILED
+    upload.error = error
+    upload.save(update_fields=["status", "error", "updated_at"])
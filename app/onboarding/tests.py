@@ -1,3 +1,133 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from unittest import mock
+from urllib.parse import urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from business import models as business_models
+from onboarding import enums as onboarding_enums
+from onboarding import models as onboarding_models
+from onboarding.tasks import attach_direct_upload_task
+
+DIRECT_UPLOAD_URL = reverse("onboarding:direct_upload_create")
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 30, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+    MEDIA_ROOT=MEDIA_ROOT,
+)
+class DirectUploadApiTests(TestCase):
+    """Direct uploads against the local filesystem stand-in of the bucket"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = get_user_model().objects.create_user(email="owner@example.com", password="testpass123")
+        category = business_models.ServiceCategory.objects.create(name="Hair")
+        self.business = business_models.Business.objects.create(user=self.owner, name="Business", category=category)
+        self.client.force_authenticate(user=self.owner)
+
+    def request_upload(self, content: bytes, **payload):
+        payload = {
+            "kind": onboarding_enums.DirectUploadKindChoices.GALLERY_IMAGE,
+            "target": str(self.business.uid),
+            "name": "Front",
+            "file_name": "front.png",
+            "content_type": "image/png",
+            "size": len(content),
+            **payload,
+        }
+        return self.client.post(DIRECT_UPLOAD_URL, payload, format="json")
+
+    def put(self, upload_url: str, content: bytes, content_type: str = "image/png"):
+        url = urlsplit(upload_url)
+        return self.client.generic("PUT", f"{url.path}?{url.query}", content, content_type=content_type)
+
+    def confirm(self, uid):
+        with mock.patch("onboarding.tasks.attach_direct_upload_task.delay"):
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(reverse("onboarding:direct_upload_confirm", args=[uid]))
+        attach_direct_upload_task(str(uid))
+        return res
+
+    def test_direct_upload_attaches_gallery_image(self):
+        content = png_bytes()
+        res = self.request_upload(content, is_main=True)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["upload_method"], "PUT")
+
+        res_put = self.put(res.data["upload_url"], content)
+        self.assertEqual(res_put.status_code, status.HTTP_200_OK)
+
+        res_confirm = self.confirm(res.data["uid"])
+        self.assertEqual(res_confirm.status_code, status.HTTP_202_ACCEPTED)
+
+        upload = onboarding_models.DirectUpload.objects.get(uid=res.data["uid"])
+        self.assertEqual(upload.status, onboarding_enums.DirectUploadStatusChoices.ATTACHED)
+        image = self.business.images.get(uid=upload.attached_uid)
+        self.assertEqual(image.image.name, upload.object_name)
+        self.assertTrue(image.is_main)
+
+    def test_direct_upload_rejects_invalid_image(self):
+        content = b"not an image"
+        res = self.request_upload(content)
+        self.put(res.data["upload_url"], content)
+        self.confirm(res.data["uid"])
+
+        upload = onboarding_models.DirectUpload.objects.get(uid=res.data["uid"])
+        self.assertEqual(upload.status, onboarding_enums.DirectUploadStatusChoices.FAILED)
+        self.assertFalse(self.business.images.exists())
+
+    def test_direct_upload_not_uploaded_fails(self):
+        res = self.request_upload(png_bytes())
+        self.confirm(res.data["uid"])
+
+        upload = onboarding_models.DirectUpload.objects.get(uid=res.data["uid"])
+        self.assertEqual(upload.status, onboarding_enums.DirectUploadStatusChoices.FAILED)
+
+    def test_local_put_rejects_bigger_file(self):
+        content = png_bytes()
+        res = self.request_upload(content, size=10)
+        res_put = self.put(res.data["upload_url"], content)
+        self.assertEqual(res_put.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_local_put_rejects_tampered_token(self):
+        res = self.request_upload(png_bytes())
+        res_put = self.put(res.data["upload_url"] + "x", png_bytes())
+        self.assertEqual(res_put.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_direct_upload_requires_business_owner(self):
+        other = get_user_model().objects.create_user(email="other@example.com", password="testpass123")
+        self.client.force_authenticate(user=other)
+        res = self.request_upload(png_bytes())
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_direct_upload_rejects_unsupported_type(self):
+        res = self.request_upload(b"x", content_type="application/pdf", file_name="doc.pdf")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_direct_upload_extension_follows_content_type(self):
+        res = self.request_upload(png_bytes(), file_name="page.html")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        upload = onboarding_models.DirectUpload.objects.get(uid=res.data["uid"])
+        self.assertTrue(upload.object_name.endswith(".png"))
@@ -146,6 +146,21 @@ business_patterns = [
         onboarding_views.UploadImageView.as_view(),
         name="upload_image",
     ),
+    path(
+        "upload/direct/",
+        onboarding_views.DirectUploadCreateView.as_view(),
+        name="direct_upload_create",
+    ),
+    path(
+        "upload/direct/<uuid:uid>/",
+        onboarding_views.DirectUploadDetailView.as_view(),
+        name="direct_upload_detail",
+    ),
+    path(
+        "upload/direct/<uuid:uid>/confirm/",
+        onboarding_views.DirectUploadConfirmView.as_view(),
+        name="direct_upload_confirm",
+    ),
     path(
         "image/delete/<uuid:uid>/",
         onboarding_views.DeleteImageView.as_view(),
@@ -1,8 +1,12 @@
 
 from django.utils.translation import gettext_lazy as _
 
+from django.db import transaction
+
 from rest_framework import generics
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.parsers import FileUploadParser
 from rest_framework.parsers import MultiPartParser
 from rest_framework import serializers
@@ -12,8 +16,10 @@ from business import serializers as business_serializers
 from business.utils import registry as business_registry
 
 
+from onboarding import enums as onboarding_enums
 from onboarding import models as onboarding_models
 from onboarding import serializers as onboarding_serializers
+from onboarding import tasks as onboarding_tasks
 
 
 from user.permissions import IsOwner
@@ -235,6 +241,53 @@ class UploadImageView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
 
+class DirectUploadCreateView(generics.CreateAPIView):
+    """
+    API view to start a direct upload. The client PUTs the file to upload_url with upload_headers,
+    then calls the confirm endpoint. Replaces the multipart upload views for big files.
+    """
+    serializer_class = onboarding_serializers.DirectUploadRequestSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class DirectUploadDetailView(generics.RetrieveAPIView):
+    """
+    API view to poll the state of a direct upload.
+    """
+    serializer_class = onboarding_serializers.DirectUploadSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = "uid"
+
+    def get_queryset(self):
+        return onboarding_models.DirectUpload.objects.filter(user=self.request.user)
+
+
+class DirectUploadConfirmView(generics.GenericAPIView):
+    """
+    API view to confirm a direct upload once the PUT finished. The file is validated and attached
+    asynchronously, poll the detail view for the result.
+    """
+    serializer_class = onboarding_serializers.DirectUploadSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = "uid"
+
+    def get_queryset(self):
+        return onboarding_models.DirectUpload.objects.filter(user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        statuses = onboarding_enums.DirectUploadStatusChoices
+        instance = self.get_object()
+        confirmed = onboarding_models.DirectUpload.objects.filter(
+            pk=instance.pk,
+            status=statuses.PENDING,
+        ).update(status=statuses.CONFIRMED)
+        if confirmed:
+            instance.status = statuses.CONFIRMED
+            transaction.on_commit(lambda: onboarding_tasks.attach_direct_upload_task.delay(str(instance.uid)))
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
 class DeleteImageView(generics.DestroyAPIView):
     """
     API view to delete an image.
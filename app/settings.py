@@ -161,6 +161,9 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 EMAIL_POOL = os.environ.get('EMAIL_POOL')
 UNSUBSCRIBE_EMAIL = os.environ.get('UNSUBSCRIBE_EMAIL', '')
+MAIL_LOGO_CACHE_SECONDS = int(os.environ.get('MAIL_LOGO_CACHE_SECONDS', 300))
+# mails sent over one backend connection and logged with one insert
+MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', 100))
 
 
 CACHES = {
@@ -174,6 +177,8 @@ CACHES = {
 }
 
 MIDDLEWARE = [
+    # first, so the recorded wall time covers every other middleware
+    "core.middlewares.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -224,12 +229,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "core.pagination.DefaultPager",
     "PAGE_SIZE": 100,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.CachedJWTAuthentication",
     ],
     # Errors standardized
     "EXCEPTION_HANDLER": "drf_standardized_errors.handler.exception_handler",
     # Swagger schema
     "DEFAULT_SCHEMA_CLASS": "core.schema.CustomAutoSchema",
+    # proxies appending to X-Forwarded-For in front of the app, the client address is the entry before theirs:
+    # 1 for Cloud Run alone, 2 behind an external HTTPS load balancer
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 1)),
 }
 
 # Errors standardized
@@ -271,6 +279,11 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=365),
     "UPDATE_LAST_LOGIN": True,
 }
+# snapshot of the authenticated user kept in Redis, dropped on every user save
+AUTH_USER_CACHE_SECONDS = int(os.environ.get("AUTH_USER_CACHE_SECONDS", 300))
+# jtis known not to be revoked, cached per worker; revocations are pushed over pub/sub
+TOKEN_BLACKLIST_LOCAL_CACHE_SECONDS = int(os.environ.get("TOKEN_BLACKLIST_LOCAL_CACHE_SECONDS", 30))
+TOKEN_BLACKLIST_LOCAL_CACHE_SIZE = int(os.environ.get("TOKEN_BLACKLIST_LOCAL_CACHE_SIZE", 50000))
 
 AUTHENTICATION_BACKENDS = (
     "django.contrib.auth.backends.ModelBackend",  # this is default
@@ -345,6 +358,13 @@ GOOGLE_AUTH_BASE_URL = "https://www.googleapis.com/oauth2/v3/userinfo?alt=json"
 FACEBOOK_AUTH_BASE_URL = "https://graph.facebook.com/v12.0/me/?fields=email,id,name"
 APPLE_AUTH_BASE_URL = "?scope=name%20email%20sub"
 INSTAGRAM_AUTH_BASE_URL = "https://graph.instagram.com/me?fields=id,email"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+# comma separated OAuth client ids accepted as ID token audience, ID tokens are rejected when empty
+GOOGLE_OAUTH_CLIENT_IDS = [i.strip() for i in os.environ.get('GOOGLE_OAUTH_CLIENT_IDS', '').split(',') if i.strip()]
+APPLE_OAUTH_CLIENT_IDS = [i.strip() for i in os.environ.get('APPLE_OAUTH_CLIENT_IDS', '').split(',') if i.strip()]
+# timeout of the calls to the social login providers
+SOCIAL_AUTH_TIMEOUT_SECONDS = int(os.environ.get('SOCIAL_AUTH_TIMEOUT_SECONDS', 5))
 
 DEFAULT_FILE_STORAGE = os.environ.get("STORAGE")
 
@@ -375,6 +395,17 @@ else:
 
 MAX_UPLOAD_SIZE = 5242880 * 50 
 
+# direct uploads: clients PUT files to a signed url instead of posting them through the API, see core.uploads
+DIRECT_UPLOAD_URL_EXPIRATION_MINUTES = int(os.environ.get('DIRECT_UPLOAD_URL_EXPIRATION_MINUTES', 20))
+DIRECT_UPLOAD_IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+DIRECT_UPLOAD_VIDEO_TYPES = ('video/mp4', 'video/quicktime', 'video/webm')
+
+# orphan media sweep, see core.media_sweeper. Files younger than the grace period are never deleted,
+# the sweep only logs what it would delete until MEDIA_ORPHAN_SWEEP_DRY_RUN=0
+MEDIA_ORPHAN_SWEEP_GRACE_HOURS = int(os.environ.get('MEDIA_ORPHAN_SWEEP_GRACE_HOURS', 24))
+MEDIA_ORPHAN_SWEEP_MAX_DELETES = int(os.environ.get('MEDIA_ORPHAN_SWEEP_MAX_DELETES', 5000))
+MEDIA_ORPHAN_SWEEP_DRY_RUN = bool(int(os.environ.get('MEDIA_ORPHAN_SWEEP_DRY_RUN', True)))
+
 TIME_BEFORE_REMINDER_MINUTES = int(os.environ.get('TIME_BEFORE_REMINDER_MINUTES', 60))
 IS_TEST = bool(int(os.environ.get('IS_TEST', False)))
 CRON_TIME_1HR = int(os.environ.get('CRON_TIME_1HR', 10))  # in minutes
@@ -402,6 +433,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'send_reminder_notification_daily',
         'schedule': timedelta(minutes=CRON_TIME_24HR),
     },
+    'archive_notifications': {
+        'task': 'archive_notifications',
+        'schedule': timedelta(hours=24),
+    },
+    'reconcile_unread_notifications': {
+        'task': 'reconcile_unread_notifications',
+        'schedule': timedelta(hours=1),
+    },
+    'sweep_orphan_media': {
+        'task': 'sweep_orphan_media',
+        'schedule': timedelta(hours=24),
+    },
 }
 
 # ------------- CELERY TASKS -------------- #
@@ -426,6 +469,14 @@ CELERY_TASK_ROUTES = {
 
     "send_reminder_notification": {"queue": "main-queue"},
     "send_reminder_notification_daily": {"queue": "main-queue"},
+    "archive_notifications": {"queue": "main-queue"},
+    "reconcile_unread_notifications": {"queue": "main-queue"},
+    "generate_image_variants": {"queue": "main-queue"},
+    "delete_media_files": {"queue": "main-queue"},
+    "sweep_orphan_media": {"queue": "main-queue"},
+    "attach_direct_upload": {"queue": "main-queue"},
+
+    "send_sms_verification": {"queue": "sms-queue"},
 }
 
 
@@ -444,6 +495,20 @@ REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD")
 REDIS_SERVER = os.environ.get("REDIS_SERVER")
 REDIS_APP_DB = os.environ.get("REDIS_APP_DB")
 CELERY_BROKER_URL = f"redis://:{REDIS_PASSWORD}@{REDIS_SERVER}/{REDIS_APP_DB}"
+
+# quiet window for coalescing repeated push/mail tasks of the same booking
+NOTIFICATION_COALESCE_WINDOW_SECONDS = int(os.environ.get("NOTIFICATION_COALESCE_WINDOW_SECONDS", 30))
+# max coalesced notification tasks a single user can enqueue per rate window
+NOTIFICATION_RATE_LIMIT_PER_USER = int(os.environ.get("NOTIFICATION_RATE_LIMIT_PER_USER", 60))
+NOTIFICATION_RATE_LIMIT_WINDOW_SECONDS = int(os.environ.get("NOTIFICATION_RATE_LIMIT_WINDOW_SECONDS", 60))
+
+# notifications older than this are moved out of the live table
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", 180))
+NOTIFICATION_ARCHIVE_ENABLED = bool(int(os.environ.get("NOTIFICATION_ARCHIVE_ENABLED", True)))
+NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.environ.get("NOTIFICATION_ARCHIVE_BATCH_SIZE", 5000))
+# unread badge counters, idle users' counters expire and are rebuilt from the DB on read
+NOTIFICATION_UNREAD_COUNTER_TTL_SECONDS = int(os.environ.get("NOTIFICATION_UNREAD_COUNTER_TTL_SECONDS", 7 * 24 * 60 * 60))
+
 RESET_TOKEN_LENGTH = 5
 RESET_CODE_EXPIRE = 3600
 
@@ -481,17 +546,56 @@ FAKE_PAYMENT = bool(int(os.environ.get('FAKE_PAYMENT', False)))
 
 GMAPS_API_KEY = os.environ.get('GMAPS_API_KEY', '')
 
+# geocoding cache, see user.geo_utils.geocoding.GeocodeCache
+# user.geo_utils.geocoding.StubGeocoder answers locally without Google
+GEOCODER_BACKEND = os.environ.get('GEOCODER_BACKEND', 'user.geo_utils.geocoding.GoogleGeocoder')
+GEOCODER_TIMEOUT_SECONDS = int(os.environ.get('GEOCODER_TIMEOUT_SECONDS', 5))
+GEOCODE_CACHE_TTL_SECONDS = int(os.environ.get('GEOCODE_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+GEOCODE_NEGATIVE_CACHE_TTL_SECONDS = int(os.environ.get('GEOCODE_NEGATIVE_CACHE_TTL_SECONDS', 3600))
+GEOCODE_DB_TTL_DAYS = int(os.environ.get('GEOCODE_DB_TTL_DAYS', 90))
+GEOCODE_DB_NEGATIVE_TTL_HOURS = int(os.environ.get('GEOCODE_DB_NEGATIVE_TTL_HOURS', 24))
+# how long concurrent lookups of the same query wait for the first one
+GEOCODE_LOCK_SECONDS = int(os.environ.get('GEOCODE_LOCK_SECONDS', 10))
+
 TWILIO_SERVICE_UID = os.environ.get('TWILIO_SERVICE_UID', '')
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID', '')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN', '')
 
 IGNORE_TWILIO_CODE_CHECK = bool(int(os.environ.get('IGNORE_TWILIO_CODE_CHECK', False)))
 
+# verification SMS provider, sms.sms_client.FakeSmsProvider sends nothing (development, load tests)
+SMS_PROVIDER = os.environ.get('SMS_PROVIDER', 'sms.sms_client.TwilioSmsProvider')
+SMS_PROVIDER_TIMEOUT_SECONDS = int(os.environ.get('SMS_PROVIDER_TIMEOUT_SECONDS', 10))
+# code approved by the fake provider and its simulated latency per call
+SMS_FAKE_CODE = os.environ.get('SMS_FAKE_CODE', '123456')
+SMS_FAKE_LATENCY_MS = int(os.environ.get('SMS_FAKE_LATENCY_MS', 0))
+# queue verification sends on sms-queue instead of sending in the request
+SMS_SEND_ASYNC = bool(int(os.environ.get('SMS_SEND_ASYNC', True)))
+# seconds between two codes to the same phone and hourly sends per phone / client IP, 0 turns a limit off
+SMS_PHONE_COOLDOWN_SECONDS = int(os.environ.get('SMS_PHONE_COOLDOWN_SECONDS', 60))
+SMS_PHONE_HOURLY_LIMIT = int(os.environ.get('SMS_PHONE_HOURLY_LIMIT', 5))
+SMS_IP_HOURLY_LIMIT = int(os.environ.get('SMS_IP_HOURLY_LIMIT', 20))
+
 
 APP_DEEP_LINK = os.environ.get('APP_DEEP_LINK', 'https://dua-flavor.web.app/booking?bookingUid=')
 
 DEVICE_ID_HEADER = os.environ.get('DEVICE_ID_HEADER', 'X-Device-ID')
+# per worker Bloom filter over the blacklisted devices, under 1% false positives up to 100k devices
+DEVICE_BLACKLIST_BLOOM_SIZE = int(os.environ.get("DEVICE_BLACKLIST_BLOOM_SIZE", 1 << 20))
+DEVICE_BLACKLIST_BLOOM_HASHES = int(os.environ.get("DEVICE_BLACKLIST_BLOOM_HASHES", 7))
+DEVICE_BLACKLIST_REFRESH_SECONDS = int(os.environ.get("DEVICE_BLACKLIST_REFRESH_SECONDS", 300))
+
+# per view request metrics, exported per worker process on /metrics/
+REQUEST_METRICS_ENABLED = bool(int(os.environ.get("REQUEST_METRICS_ENABLED", True)))
+# requests slower than this are logged with their worst SQL fingerprints
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 500))
+# bearer token required by /metrics/, when empty the endpoint answers 404 unless DEBUG
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 DEVICE_MIDDLEWARE_IGNORED_PATHS = [
+    '/metrics/',
+    '/uploads/local/',
+
     '/api/user/auth/logout/all/',
 
     '/api/user/auth/refresh/',
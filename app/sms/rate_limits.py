@@ -0,0 +1,68 @@
+import time
+
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework.exceptions import Throttled
+
+import settings
+from core.redis import redis_storage
+from core.custom_logger import logger
+
+
+class SmsRateLimiter:
+    """
+    Limits verification SMS sends in Redis.
+    - cooldown: one send per phone every SMS_PHONE_COOLDOWN_SECONDS
+    - quotas: SMS_PHONE_HOURLY_LIMIT sends per phone and SMS_IP_HOURLY_LIMIT per client IP each hour
+    A limit set to 0 is off. Without Redis sends are not limited.
+    """
+
+    KEY_PREFIX = "sms_rate"
+    QUOTA_WINDOW_SECONDS = 3600
+
+    @classmethod
+    def hit(cls, phone_number: str, ip_address: str = None):
+        """
+        Counts a send, raises Throttled with the seconds to wait when a limit is reached.
+        """
+        try:
+            wait = cls.cooldown_wait(phone_number)
+            if wait:
+                raise Throttled(wait=wait, detail=_("Please wait before requesting another code."))
+
+            quotas = [(f"phone:{phone_number}", settings.SMS_PHONE_HOURLY_LIMIT)]
+            if ip_address:
+                quotas.append((f"ip:{ip_address}", settings.SMS_IP_HOURLY_LIMIT))
+            wait = cls.quota_wait(quotas)
+            if wait:
+                logger.warning("SMS quota reached for {} / {}", phone_number, ip_address)
+                raise Throttled(wait=wait, detail=_("Too many verification codes requested, try again later."))
+        except RedisError as e:
+            logger.error(f"SMS rate limiter unavailable, not limiting: {e}")
+
+    @classmethod
+    def cooldown_wait(cls, phone_number: str) -> int:
+        cooldown = settings.SMS_PHONE_COOLDOWN_SECONDS
+        if not cooldown:
+            return 0
+        key = f"{cls.KEY_PREFIX}:cooldown:{phone_number}"
+        if redis_storage.connection.set(key, 1, nx=True, ex=cooldown):
+            return 0
+        return max(redis_storage.connection.ttl(key), 1)
+
+    @classmethod
+    def quota_wait(cls, quotas) -> int:
+        quotas = [(name, limit) for name, limit in quotas if limit]
+        if not quotas:
+            return 0
+        now = time.time()
+        bucket = int(now // cls.QUOTA_WINDOW_SECONDS)
+        pipe = redis_storage.connection.pipeline()
+        for name, _limit in quotas:
+            key = f"{cls.KEY_PREFIX}:{name}:{bucket}"
+            pipe.incr(key)
+            pipe.expire(key, cls.QUOTA_WINDOW_SECONDS)
+        counts = pipe.execute()[::2]
+        if any(count > limit for count, (_name, limit) in zip(counts, quotas)):
+            return int((bucket + 1) * cls.QUOTA_WINDOW_SECONDS - now) + 1
+        return 0
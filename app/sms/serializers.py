@@ -2,7 +2,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.utils.translation import gettext_lazy as _
-from sms.sms_client import SmsClient
+from sms.sms_client import SmsClient, get_client_ip
 from user import models as user_models
 
 from core.validators import phone_validator
@@ -90,7 +90,10 @@ class CreateSmsSerializer(PhoneNumberValidatorSerializer):
                 "user_role": validated_data.get("user_role", None),
             }
         client = SmsClient()
-        is_sent = client.send_sms_verification(validated_data["phone_number"])
+        is_sent = client.request_sms_verification(
+            validated_data["phone_number"],
+            get_client_ip(self.context["request"]),
+        )
 
         if not is_sent:
             raise_400(_("Could not send verification SMS"))
@@ -202,7 +205,10 @@ class SendVerificationOnlySerializer(PhoneNumberValidatorSerializer):
             }
         
         client = SmsClient()
-        is_sent = client.send_sms_verification(phone_number)
+        is_sent = client.request_sms_verification(
+            phone_number,
+            get_client_ip(self.context["request"]),
+        )
 
         if not is_sent:
             raise_400(_("Could not send verification SMS"))
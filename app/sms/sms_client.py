@@ -1,25 +1,108 @@
-
+import os
 import re
+import threading
+import time
+
+from celery import current_app as celery_app
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 from twilio.rest.verify.v2.service import ServiceContext
 from rest_framework.serializers import ValidationError
+from rest_framework.throttling import BaseThrottle
+from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 
 
-from settings import TWILIO_SERVICE_UID , TWILIO_ACCOUNT_SID , TWILIO_AUTH_TOKEN, IGNORE_TWILIO_CODE_CHECK
+import settings
 from sms import enums as sms_enums
+from sms.rate_limits import SmsRateLimiter
 
 from core.custom_logger import logger
 
-class SmsClient:
-    def __init__(self):
-        self.client = Client(
-            TWILIO_ACCOUNT_SID,
-            TWILIO_AUTH_TOKEN
-        )
+
+_client_lock = threading.Lock()
+_clients = {}
+
+
+def get_twilio_client() -> Client:
+    """
+    Process-wide Twilio client, HTTPS connections to the API are kept alive between sends.
+    Keyed by pid so forked workers create their own instead of sharing the parent's sockets.
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(pid)
+            if client is None:
+                _clients.clear()
+                http_client = TwilioHttpClient(
+                    pool_connections=True,
+                    timeout=settings.SMS_PROVIDER_TIMEOUT_SECONDS,
+                )
+                client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, http_client=http_client)
+                _clients[pid] = client
+    return client
+
+
+class TwilioSmsProvider:
+    """
+    Twilio Verify, returns the verification status of each call.
+    """
 
     def _get_service(self) -> ServiceContext:
-        return self.client.verify.services(TWILIO_SERVICE_UID)
+        return get_twilio_client().verify.services(settings.TWILIO_SERVICE_UID)
+
+    def send_verification(self, phone_number: str) -> str:
+        return self._get_service().verifications.create(to=phone_number, channel="sms").status
+
+    def check_code(self, phone_number: str, code: str) -> str:
+        return self._get_service().verification_checks.create(code=code, to=phone_number).status
+
+
+class FakeSmsProvider:
+    """
+    Local provider for development and load tests: sends nothing, approves SMS_FAKE_CODE
+    and waits SMS_FAKE_LATENCY_MS per call to mimic the provider round trip.
+    """
+
+    def _wait(self):
+        if settings.SMS_FAKE_LATENCY_MS:
+            time.sleep(settings.SMS_FAKE_LATENCY_MS / 1000)
+
+    def send_verification(self, phone_number: str) -> str:
+        self._wait()
+        logger.info("Fake SMS verification code {} for {}", settings.SMS_FAKE_CODE, phone_number)
+        return sms_enums.VerificationSmsStatus.PENDING
+
+    def check_code(self, phone_number: str, code: str) -> str:
+        self._wait()
+        if code == settings.SMS_FAKE_CODE:
+            return sms_enums.VerificationSmsStatus.APPROVED
+        return sms_enums.VerificationSmsStatus.PENDING
+
+
+_provider = None
+
+
+def get_sms_provider():
+    global _provider
+    if _provider is None:
+        _provider = import_string(settings.SMS_PROVIDER)()
+    return _provider
+
+
+def get_client_ip(request) -> str:
+    """
+    Client address as DRF throttles identify it, see REST_FRAMEWORK["NUM_PROXIES"].
+    """
+    return BaseThrottle().get_ident(request)
+
+
+class SmsClient:
+    @property
+    def provider(self):
+        return get_sms_provider()
 
     def _normalize_phone(self, phone: str) -> str:
         p = (phone or "").strip()
@@ -32,33 +115,37 @@ class SmsClient:
             logger.warning(f"Phone not in E.164 format after normalization: {p}")
         return p
 
+    def request_sms_verification(self, phone_number: str, ip_address: str = None) -> bool:
+        """
+        Applies the per phone and per IP limits, then queues the send on the sms queue
+        (or sends right away when SMS_SEND_ASYNC is off). Raises Throttled over the limits.
+        """
+        phone_number = self._normalize_phone(phone_number)
+        SmsRateLimiter.hit(phone_number, ip_address)
+        if not settings.SMS_SEND_ASYNC:
+            return self.send_sms_verification(phone_number)
+        celery_app.send_task("send_sms_verification", kwargs={"phone_number": phone_number})
+        return True
+
     def send_sms_verification(self, phone_number: str) -> bool:
         phone_number = self._normalize_phone(phone_number)
-        service = self._get_service()
         try:
-            response = service.verifications.create(
-                to=phone_number,
-                channel="sms"
-            )
+            verification_status = self.provider.send_verification(phone_number)
         except Exception as e:
-            print(f"Error sending SMS verification: {e}")
+            logger.error(f"Error sending SMS verification: {e}")
             raise ValidationError(_(f"Failed to send sms verification to {phone_number}."))
 
-        return response.status in sms_enums.VerificationSmsStatus.ok_statuses()
+        return verification_status in sms_enums.VerificationSmsStatus.ok_statuses()
 
     def check_sms_code(self, phone_number: str, code: str) -> bool:
         phone_number = self._normalize_phone(phone_number)
-        if IGNORE_TWILIO_CODE_CHECK:
+        if settings.IGNORE_TWILIO_CODE_CHECK:
             return True
-    
-        service = self._get_service()
+
         try:
-            response = service.verification_checks.create(
-                code=code,
-                to=phone_number
-            )
+            verification_status = self.provider.check_code(phone_number, code)
         except Exception as e:
-            print(f"Error checking SMS code: {e}")
+            logger.error(f"Error checking SMS code: {e}")
             raise ValidationError(_(f"Failed to check sms code for {phone_number}. double check the code or try again."))
 
-        return response.status == sms_enums.VerificationSmsStatus.APPROVED
+        return verification_status == sms_enums.VerificationSmsStatus.APPROVED
@@ -0,0 +1,18 @@
+from celery import shared_task
+from rest_framework.serializers import ValidationError
+
+from core.custom_logger import logger
+from sms.sms_client import SmsClient
+
+
+@shared_task(name="send_sms_verification")
+def send_sms_verification_task(phone_number: str):
+    """
+    Not retried: a code delivered minutes late is useless, the user asks for a new one instead.
+    """
+    try:
+        is_sent = SmsClient().send_sms_verification(phone_number)
+    except ValidationError:
+        return
+    if not is_sent:
+        logger.warning("SMS verification to {} was not accepted by the provider", phone_number)
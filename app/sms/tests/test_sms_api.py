@@ -4,6 +4,8 @@ from rest_framework import status
 from rest_framework.test import APIClient
 from django.urls import reverse
 from user.models import User
+from core.redis import redis_storage
+from sms.rate_limits import SmsRateLimiter
 import mock
 
 
@@ -31,6 +33,12 @@ class PublicSmsApiTests(TestCase):
         check_sms_code
     ):
         self.client = APIClient()
+        self.addCleanup(self.clear_sms_rate_limits)
+
+    def clear_sms_rate_limits(self):
+        keys = redis_storage.connection.keys(f"{SmsRateLimiter.KEY_PREFIX}:*")
+        if keys:
+            redis_storage.connection.delete(*keys)
     
 
     @mock.patch('sms.sms_client.SmsClient.send_sms_verification', side_effect=mocked_send_sms_verification)
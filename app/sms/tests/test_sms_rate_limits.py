@@ -0,0 +1,45 @@
+import mock
+from django.test import TestCase
+from rest_framework.exceptions import Throttled
+
+from core.redis import redis_storage
+from sms import enums as sms_enums
+from sms.rate_limits import SmsRateLimiter
+from sms.sms_client import FakeSmsProvider
+
+
+class SmsRateLimiterTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(self.clear_redis)
+
+    def clear_redis(self):
+        keys = redis_storage.connection.keys(f"{SmsRateLimiter.KEY_PREFIX}:*")
+        if keys:
+            redis_storage.connection.delete(*keys)
+
+    @mock.patch.multiple("settings", SMS_PHONE_COOLDOWN_SECONDS=60)
+    def test_cooldown_per_phone(self):
+        SmsRateLimiter.hit("+355690000001", "10.0.0.1")
+        with self.assertRaises(Throttled) as raised:
+            SmsRateLimiter.hit("+355690000001", "10.0.0.1")
+        self.assertGreater(raised.exception.wait, 0)
+        SmsRateLimiter.hit("+355690000002", "10.0.0.1")
+
+    @mock.patch.multiple("settings", SMS_PHONE_COOLDOWN_SECONDS=0, SMS_IP_HOURLY_LIMIT=2)
+    def test_quota_per_ip(self):
+        SmsRateLimiter.hit("+355690000001", "10.0.0.1")
+        SmsRateLimiter.hit("+355690000002", "10.0.0.1")
+        with self.assertRaises(Throttled):
+            SmsRateLimiter.hit("+355690000003", "10.0.0.1")
+        SmsRateLimiter.hit("+355690000003", "10.0.0.2")
+
+
+class FakeSmsProviderTests(TestCase):
+
+    @mock.patch.multiple("settings", SMS_FAKE_CODE="654321", SMS_FAKE_LATENCY_MS=0)
+    def test_only_fake_code_is_approved(self):
+        provider = FakeSmsProvider()
+        self.assertEqual(provider.send_verification("+355690000001"), sms_enums.VerificationSmsStatus.PENDING)
+        self.assertEqual(provider.check_code("+355690000001", "654321"), sms_enums.VerificationSmsStatus.APPROVED)
+        self.assertEqual(provider.check_code("+355690000001", "000000"), sms_enums.VerificationSmsStatus.PENDING)
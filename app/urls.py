@@ -5,6 +5,9 @@ from django.urls import path, include
 
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.uploads import LocalUploadBackend, get_upload_backend
+from core.views import metrics_view, local_upload_view
+
 admin.site.site_header = f"{settings.PROJECT_NAME} administration"
 admin.site.index_title = f"{settings.PROJECT_NAME} administration"
 admin.site.site_title = f"{settings.PROJECT_NAME}"
@@ -46,7 +49,11 @@ urlpatterns = [
     api_patterns,
     path("admin/", admin.site.urls),
     path("accounts/", include("django.contrib.auth.urls")),
+    path("metrics/", metrics_view, name="metrics"),
 ]
+# the signed-token upload endpoint only exists for the local stand-in, the bucket takes the PUTs otherwise
+if isinstance(get_upload_backend(), LocalUploadBackend):
+    urlpatterns.append(path("uploads/local/", local_upload_view, name="local_upload"))
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
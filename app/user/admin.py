@@ -4,6 +4,7 @@ from unfold.admin import ModelAdmin as UnfoldModelAdmin
 from leaflet.admin import LeafletGeoAdmin
 
 from user import models
+from user.device_blacklist import DeviceBlacklist
 
 # unregister unnecessary models
 from django.contrib.auth.admin import GroupAdmin
@@ -122,3 +123,14 @@ class UserDeviceAdmin(UnfoldModelAdmin):
         "is_blacklisted",
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if obj.is_blacklisted:
+            DeviceBlacklist.add(obj.user_id, [obj.device_id])
+        else:
+            DeviceBlacklist.remove(obj.user_id, obj.device_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        DeviceBlacklist.remove(obj.user_id, obj.device_id)
+
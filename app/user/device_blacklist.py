@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Iterable
+
+from redis.exceptions import RedisError
+
+import settings
+from core.bloom import BloomFilter
+from core.redis import redis_storage, ChannelSubscription
+from core.custom_logger import logger
+from user import models as user_models
+
+
+class DeviceBlacklist:
+    """
+    Blacklisted (user, device) pairs indexed in a Redis set, with a Bloom filter of the
+    set in every worker.
+    - is_blacklisted: memory lookup, Redis is only asked when the filter reports a hit
+    - add / remove: called wherever UserDevice.is_blacklisted changes, additions are
+      published so every worker updates its filter, removals make workers rebuild it
+    - the filter is also rebuilt every DEVICE_BLACKLIST_REFRESH_SECONDS in case a
+      worker missed a message
+    Without Redis the check falls back to the UserDevice query.
+    """
+
+    SET_KEY = "device_blacklist"
+    LOADED_KEY = "device_blacklist:loaded"
+    CHANNEL = "device_blacklist:updates"
+    REBUILD_MESSAGE = "rebuild"
+
+    _bloom = None
+    _bloom_expires_at = 0
+    _subscription = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build_member(user_id: int, device_id: str) -> str:
+        return f"{user_id}:{device_id}"
+
+    @classmethod
+    def ensure_loaded(cls):
+        """
+        Fill the Redis set from the DB if it was never built or Redis lost it.
+        """
+        if redis_storage.connection.exists(cls.LOADED_KEY):
+            return
+        members = [
+            cls.build_member(user_id, device_id)
+            for user_id, device_id in user_models.UserDevice.objects.filter(
+                is_blacklisted=True
+            ).values_list('user_id', 'device_id').iterator()
+        ]
+        pipe = redis_storage.connection.pipeline()
+        pipe.delete(cls.SET_KEY)
+        if members:
+            pipe.sadd(cls.SET_KEY, *members)
+        pipe.set(cls.LOADED_KEY, 1)
+        pipe.execute()
+
+    @classmethod
+    def rebuild_bloom(cls):
+        cls.ensure_loaded()
+        bloom = BloomFilter(settings.DEVICE_BLACKLIST_BLOOM_SIZE, settings.DEVICE_BLACKLIST_BLOOM_HASHES)
+        for member in redis_storage.connection.sscan_iter(cls.SET_KEY, count=1000):
+            bloom.add(member)
+        cls._bloom = bloom
+        cls._bloom_expires_at = time.monotonic() + settings.DEVICE_BLACKLIST_REFRESH_SECONDS
+
+    @classmethod
+    def handle_message(cls, message):
+        data = message['data']
+        if data == cls.REBUILD_MESSAGE:
+            cls._bloom_expires_at = 0
+        elif cls._bloom is not None:
+            cls._bloom.add(data)
+
+    @classmethod
+    def get_bloom(cls) -> BloomFilter:
+        if cls._subscription is None:
+            with cls._lock:
+                if cls._subscription is None:
+                    cls._subscription = ChannelSubscription(cls.CHANNEL, cls.handle_message)
+        if cls._subscription.ensure():
+            # additions published while unsubscribed are missing from the filter
+            cls._bloom_expires_at = 0
+        if cls._bloom is None or time.monotonic() >= cls._bloom_expires_at:
+            with cls._lock:
+                if cls._bloom is None or time.monotonic() >= cls._bloom_expires_at:
+                    cls.rebuild_bloom()
+        return cls._bloom
+
+    @classmethod
+    def is_blacklisted(cls, user_id: int, device_id: str) -> bool:
+        member = cls.build_member(user_id, device_id)
+        try:
+            if member not in cls.get_bloom():
+                return False
+            return bool(redis_storage.connection.sismember(cls.SET_KEY, member))
+        except RedisError as e:
+            logger.error(f"Device blacklist index unavailable: {e}")
+            return user_models.UserDevice.objects.filter(
+                device_id=device_id, user_id=user_id, is_blacklisted=True
+            ).exists()
+
+    @classmethod
+    def add(cls, user_id: int, device_ids: Iterable[str]):
+        members = [cls.build_member(user_id, device_id) for device_id in device_ids]
+        if not members:
+            return
+        try:
+            pipe = redis_storage.connection.pipeline()
+            pipe.sadd(cls.SET_KEY, *members)
+            for member in members:
+                pipe.publish(cls.CHANNEL, member)
+            pipe.execute()
+            # pub/sub delivery is asynchronous, the device is blocked in this worker right away
+            if cls._bloom is not None:
+                for member in members:
+                    cls._bloom.add(member)
+        except RedisError as e:
+            # the next ensure_loaded after Redis comes back reads the DB again
+            logger.error(f"Could not index blacklisted devices of user {user_id}: {e}")
+            cls.invalidate()
+
+    @classmethod
+    def remove(cls, user_id: int, device_id: str):
+        try:
+            if redis_storage.connection.srem(cls.SET_KEY, cls.build_member(user_id, device_id)):
+                redis_storage.connection.publish(cls.CHANNEL, cls.REBUILD_MESSAGE)
+                cls._bloom_expires_at = 0
+        except RedisError as e:
+            logger.error(f"Could not unindex device {device_id} of user {user_id}: {e}")
+            cls.invalidate()
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drop the Redis index, it is rebuilt from the DB on the next check.
+        """
+        try:
+            redis_storage.connection.delete(cls.LOADED_KEY)
+            redis_storage.connection.publish(cls.CHANNEL, cls.REBUILD_MESSAGE)
+        except RedisError as e:
+            logger.error(f"Could not invalidate device blacklist index: {e}")
@@ -0,0 +1,289 @@
+import datetime
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import googlemaps
+import requests
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from redis.exceptions import RedisError
+
+import settings
+from core.custom_logger import logger
+from core.redis import redis_storage
+
+
+Coordinates = Tuple[float, float]
+
+
+class GeocoderError(Exception):
+    """
+    Transient geocoder failure (network, quota). Never cached, unlike a "not found" result.
+    """
+
+
+def normalize_address(address: str) -> str:
+    """
+    "  Rruga  Myslym Shyri, Tiranë " and "rruga myslym shyri tiranë" share a cache entry.
+    """
+    address = unicodedata.normalize("NFKC", address or "").casefold()
+    address = re.sub(r"[\s,;]+", " ", address)
+    return address.strip(" .")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Scheme and host are case insensitive, the fragment and a trailing slash do not change the target.
+    """
+    parts = urlsplit((url or "").strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+class GoogleGeocoder:
+    """
+    Google Maps geocoder and short url resolver. Returns None when nothing is found,
+    raises GeocoderError when the answer is unknown.
+    """
+    COORDINATES_IN_URL = re.compile(r"@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.client = None
+        if settings.GMAPS_API_KEY:
+            self.client = googlemaps.Client(
+                key=settings.GMAPS_API_KEY,
+                timeout=settings.GEOCODER_TIMEOUT_SECONDS,
+                requests_session=self.session,
+            )
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        if self.client is None:
+            raise GeocoderError("GMAPS_API_KEY is not set")
+        try:
+            geocode_result = self.client.geocode(address)
+        except googlemaps.exceptions.ApiError as e:
+            if e.status == "ZERO_RESULTS":
+                return None
+            raise GeocoderError(str(e)) from e
+        except (googlemaps.exceptions.TransportError, googlemaps.exceptions.Timeout) as e:
+            raise GeocoderError(str(e)) from e
+        if not geocode_result:
+            return None
+        location = geocode_result[0].get("geometry", {}).get("location", {})
+        if location.get("lng") is None or location.get("lat") is None:
+            return None
+        return float(location["lng"]), float(location["lat"])
+
+    def resolve_short_url(self, short_url: str) -> Optional[Coordinates]:
+        try:
+            response = self.session.get(short_url, allow_redirects=True, timeout=settings.GEOCODER_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            raise GeocoderError(str(e)) from e
+        if response.status_code >= 500:
+            raise GeocoderError(f"{short_url} returned {response.status_code}")
+        if response.status_code != 200:
+            return None
+        if "maps.google.com" not in response.url and "google.com/maps" not in response.url:
+            return None
+        match = self.COORDINATES_IN_URL.search(response.url)
+        if not match:
+            return None
+        lat, lng = match.groups()
+        return float(lng), float(lat)
+
+
+class StubGeocoder:
+    """
+    Local geocoder for tests and development: answers from the given dicts, keyed by the
+    normalized address or url, and counts the lookups.
+    """
+
+    def __init__(self, addresses: Optional[dict] = None, urls: Optional[dict] = None):
+        self.addresses = {normalize_address(key): value for key, value in (addresses or {}).items()}
+        self.urls = {normalize_url(key): value for key, value in (urls or {}).items()}
+        self.calls = 0
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        self.calls += 1
+        return self.addresses.get(normalize_address(address))
+
+    def resolve_short_url(self, short_url: str) -> Optional[Coordinates]:
+        self.calls += 1
+        return self.urls.get(normalize_url(short_url))
+
+
+class GeocodeCache:
+    """
+    Geocoding results cached in Redis, backed by the GeocodeResult table for the long term.
+    - keys are hashes of the normalized query, so spelling variants share an entry
+    - "not found" is cached too, with shorter TTLs; geocoder errors are not cached
+    - concurrent lookups of the same query: one caller holds a Redis lock and asks the
+      geocoder, the others wait for its result up to GEOCODE_LOCK_SECONDS
+    Without Redis lookups go to the table and the geocoder directly.
+    """
+
+    KEY_PREFIX = "geocode"
+    ADDRESS = "address"
+    SHORT_URL = "short_url"
+    NOT_FOUND = "none"
+    WAIT_STEP_SECONDS = 0.05
+
+    _geocoder = None
+
+    @classmethod
+    def get_geocoder(cls):
+        if cls._geocoder is None:
+            cls._geocoder = import_string(settings.GEOCODER_BACKEND)()
+        return cls._geocoder
+
+    @classmethod
+    def set_geocoder(cls, geocoder):
+        """
+        Replaces the geocoder, e.g. with a StubGeocoder in tests. None restores GEOCODER_BACKEND.
+        """
+        cls._geocoder = geocoder
+
+    @classmethod
+    def build_key(cls, kind: str, query: str) -> str:
+        digest = hashlib.sha1(query.encode()).hexdigest()
+        return f"{cls.KEY_PREFIX}:{kind}:{digest}"
+
+    @classmethod
+    def get_address(cls, address: str) -> Optional[Coordinates]:
+        query = normalize_address(address)
+        if not query:
+            return None
+        return cls.lookup(cls.ADDRESS, query, lambda: cls.get_geocoder().geocode(address))
+
+    @classmethod
+    def get_short_url(cls, short_url: str) -> Optional[Coordinates]:
+        query = normalize_url(short_url)
+        if not query:
+            return None
+        return cls.lookup(cls.SHORT_URL, query, lambda: cls.get_geocoder().resolve_short_url(short_url))
+
+    @classmethod
+    def lookup(cls, kind: str, query: str, resolve: Callable[[], Optional[Coordinates]]) -> Optional[Coordinates]:
+        key = cls.build_key(kind, query)
+        try:
+            cached = redis_storage.connection.get(key)
+        except RedisError as e:
+            logger.warning("Geocode cache unavailable: {}", e)
+            return cls.load_or_resolve(key, kind, query, resolve, use_redis=False)
+        if cached is not None:
+            return cls.decode(cached)
+        return cls.load_or_resolve(key, kind, query, resolve)
+
+    @classmethod
+    def load_or_resolve(cls, key, kind, query, resolve, use_redis=True) -> Optional[Coordinates]:
+        stored = cls.load_stored(key)
+        if stored is not None:
+            _, coordinates = stored
+            if use_redis:
+                cls.store_redis(key, coordinates)
+            return coordinates
+
+        acquired = use_redis and cls.acquire(key)
+        if use_redis and not acquired:
+            waited = cls.wait_for(key)
+            if waited is not None:
+                return cls.decode(waited)
+        try:
+            coordinates = resolve()
+        finally:
+            if acquired:
+                cls.release(key)
+        cls.store(key, kind, query, coordinates, use_redis)
+        return coordinates
+
+    @staticmethod
+    def encode(coordinates: Optional[Coordinates]) -> str:
+        return json.dumps(list(coordinates)) if coordinates else GeocodeCache.NOT_FOUND
+
+    @staticmethod
+    def decode(value: str) -> Optional[Coordinates]:
+        if value == GeocodeCache.NOT_FOUND:
+            return None
+        lng, lat = json.loads(value)
+        return lng, lat
+
+    @classmethod
+    def acquire(cls, key: str) -> bool:
+        try:
+            return bool(redis_storage.connection.set(f"{key}:lock", 1, nx=True, ex=settings.GEOCODE_LOCK_SECONDS))
+        except RedisError:
+            return True
+
+    @classmethod
+    def release(cls, key: str):
+        try:
+            redis_storage.connection.delete(f"{key}:lock")
+        except RedisError:
+            pass
+
+    @classmethod
+    def wait_for(cls, key: str) -> Optional[str]:
+        """
+        Cached value written by the lock holder, None if it did not finish in time.
+        """
+        deadline = time.monotonic() + settings.GEOCODE_LOCK_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(cls.WAIT_STEP_SECONDS)
+            try:
+                cached = redis_storage.connection.get(key)
+                if cached is not None:
+                    return cached
+                if not redis_storage.connection.exists(f"{key}:lock"):
+                    return redis_storage.connection.get(key)
+            except RedisError:
+                return None
+        return None
+
+    @staticmethod
+    def load_stored(key: str) -> Optional[Tuple[bool, Optional[Coordinates]]]:
+        """
+        (found, coordinates) of an unexpired table row, None if there is none.
+        """
+        from user.models import GeocodeResult
+
+        row = GeocodeResult.objects.filter(key=key, expires_at__gt=timezone.now()).first()
+        if row is None:
+            return None
+        if row.longitude is None or row.latitude is None:
+            return False, None
+        return True, (row.longitude, row.latitude)
+
+    @classmethod
+    def store_redis(cls, key: str, coordinates: Optional[Coordinates]):
+        ttl = settings.GEOCODE_CACHE_TTL_SECONDS if coordinates else settings.GEOCODE_NEGATIVE_CACHE_TTL_SECONDS
+        try:
+            redis_storage.connection.set(key, cls.encode(coordinates), ex=ttl)
+        except RedisError as e:
+            logger.warning("Could not cache geocode result: {}", e)
+
+    @classmethod
+    def store(cls, key, kind, query, coordinates, use_redis=True):
+        from user.models import GeocodeResult
+
+        if coordinates:
+            expires_in = datetime.timedelta(days=settings.GEOCODE_DB_TTL_DAYS)
+        else:
+            expires_in = datetime.timedelta(hours=settings.GEOCODE_DB_NEGATIVE_TTL_HOURS)
+        longitude, latitude = coordinates or (None, None)
+        GeocodeResult.objects.update_or_create(
+            key=key,
+            defaults={
+                "kind": kind,
+                "query": query[:500],
+                "longitude": longitude,
+                "latitude": latitude,
+                "expires_at": timezone.now() + expires_in,
+            },
+        )
+        if use_redis:
+            cls.store_redis(key, coordinates)
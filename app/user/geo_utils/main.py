@@ -1,16 +1,10 @@
 from typing import Optional
 from django.contrib.gis.geos import Point
-import settings 
-import googlemaps
-import requests
-import re
+
+from core.custom_logger import logger
+from user.geo_utils.geocoding import GeocodeCache, GeocoderError
 
 class GeoUtils:
-    try:
-        gmaps = googlemaps.Client(key=settings.GMAPS_API_KEY)
-    except Exception as e:
-        print(f"error in GeoUtils: {e}")
-        gmaps = None
 
     @staticmethod
     def point_to_coordinates(point: Point) -> tuple:
@@ -46,23 +40,20 @@ class GeoUtils:
     ):
         """
         Get latitude and longitude from a Google Maps URL or address.
+        Results are cached, see user.geo_utils.geocoding.GeocodeCache.
         
         Args:
             address (str): address.
         
         Returns:
-            tuple: (latitude, longitude) or None if not found.
+            tuple: (longitude, latitude) or (None, None) if not found.
         """
-        geocode_result = GeoUtils.gmaps.geocode(address)
         try:
-            if geocode_result:
-                location = geocode_result[0].get("geometry", {}).get("location", {})
-                lng, lat = location.get("lng"), location.get("lat")
-                return lng, lat
-        except Exception as e:
-            print(f"error in get_coordinates_from_url: {e}")
+            coordinates = GeocodeCache.get_address(address)
+        except GeocoderError as e:
+            logger.warning("error in get_coordinates_from_address: {}", e)
             return None, None
-        return None, None
+        return coordinates or (None, None)
 
     @staticmethod
     def get_coordinates_from_short_url(
@@ -70,24 +61,20 @@ class GeoUtils:
     ):
         """
         Get latitude and longitude from a Google Maps URL or address.
+        Results are cached, see user.geo_utils.geocoding.GeocodeCache.
         
         Args:
             short_url (str): short URL.
         
         Returns:
-            tuple: (latitude, longitude) or None if not found.
+            tuple: (longitude, latitude) or (None, None) if not found.
         """
-        response = requests.get(short_url, allow_redirects=True, timeout=10)
-        if response.status_code == 200:
-            url = response.url
-        else:
-            print(f"error in get_coordinates_from_url: {response.status_code}")
+        try:
+            coordinates = GeocodeCache.get_short_url(short_url)
+        except GeocoderError as e:
+            logger.warning("error in get_coordinates_from_short_url: {}", e)
             return None, None
-        
-        if "maps.google.com" in url:
-            lat, lng = re.findall(r'@(\d+\.\d+),(\d+\.\d+)', url)[0]
-            return lng, lat
-        return None, None
+        return coordinates or (None, None)
 
     
    
\ No newline at end of file
@@ -0,0 +1,173 @@
+import json
+import re
+import threading
+import time
+from typing import Iterable, Optional
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+
+import settings
+from core.custom_logger import logger
+
+
+def build_session() -> requests.Session:
+    """
+    Session with a connection pool sized for the worker threads, shared by the social login calls.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http = build_session()
+
+
+class IdTokenError(Exception):
+    pass
+
+
+class JWKSCache:
+    """
+    Signing keys of an identity provider, kept in process memory.
+    - expiry follows the Cache-Control max-age of the keys response, DEFAULT_TTL without one
+    - in the last REFRESH_AHEAD fraction of the lifetime a daemon thread refetches the keys,
+      logins keep using the current ones meanwhile
+    - an unknown kid (key rotation) triggers a synchronous refetch, at most once per MIN_REFETCH_SECONDS
+    """
+
+    DEFAULT_TTL = 3600 * 6
+    REFRESH_AHEAD = 0.2
+    MIN_REFETCH_SECONDS = 60
+    MAX_AGE = re.compile(r"max-age=(\d+)")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.keys = {}
+        self.fetched_at = 0.0
+        self.expires_at = 0.0
+        self.refreshing = False
+        self.lock = threading.Lock()
+
+    def fetch(self):
+        response = http.get(self.url, timeout=settings.SOCIAL_AUTH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+            except (KeyError, jwt.PyJWKError) as e:
+                logger.warning("Skipping signing key of {}: {}", self.url, e)
+
+        match = self.MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        ttl = int(match.group(1)) if match else self.DEFAULT_TTL
+        now = time.monotonic()
+        with self.lock:
+            self.keys = keys
+            self.fetched_at = now
+            self.expires_at = now + ttl
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+
+        def run():
+            try:
+                self.fetch()
+            except Exception as e:
+                logger.warning("Could not refresh signing keys of {}: {}", self.url, e)
+            finally:
+                self.refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get_key(self, kid: str):
+        now = time.monotonic()
+        if now >= self.expires_at:
+            self.fetch()
+        elif now >= self.expires_at - (self.expires_at - self.fetched_at) * self.REFRESH_AHEAD:
+            self.refresh_in_background()
+
+        key = self.keys.get(kid)
+        if key is None and time.monotonic() - self.fetched_at >= self.MIN_REFETCH_SECONDS:
+            self.fetch()
+            key = self.keys.get(kid)
+        if key is None:
+            raise IdTokenError(f"Unknown signing key {kid}")
+        return key
+
+
+class IdTokenVerifier:
+    """
+    Verifies OpenID Connect ID tokens locally: signature against the provider keys, issuer,
+    audience and expiry. No request is made while the keys are cached.
+    Without configured client ids every token is rejected, a token issued to another app must not log in.
+    """
+
+    ALGORITHMS = ["RS256"]
+    LEEWAY_SECONDS = 30
+
+    def __init__(self, jwks_url: str, issuers: Iterable[str], audiences: Iterable[str]):
+        self.jwks = JWKSCache(jwks_url)
+        self.issuers = list(issuers)
+        self.audiences = [audience for audience in audiences if audience]
+
+    @staticmethod
+    def looks_like_jwt(token: str) -> bool:
+        return token.count(".") == 2
+
+    def verify(self, token: str) -> dict:
+        if not self.audiences:
+            raise IdTokenError("No OAuth client ids configured")
+        try:
+            header = jwt.get_unverified_header(token)
+            key = self.jwks.get_key(header.get("kid"))
+            claims = jwt.decode(
+                token,
+                key=key,
+                algorithms=self.ALGORITHMS,
+                audience=self.audiences,
+                leeway=self.LEEWAY_SECONDS,
+                options={"require": ["aud", "exp", "iat", "iss", "sub"]},
+            )
+        except (jwt.PyJWTError, requests.RequestException) as e:
+            raise IdTokenError(str(e)) from e
+        if claims["iss"] not in self.issuers:
+            raise IdTokenError(f"Unexpected issuer {claims['iss']}")
+        return claims
+
+
+google_id_tokens = IdTokenVerifier(
+    jwks_url=settings.GOOGLE_JWKS_URL,
+    issuers=("accounts.google.com", "https://accounts.google.com"),
+    audiences=settings.GOOGLE_OAUTH_CLIENT_IDS,
+)
+
+apple_id_tokens = IdTokenVerifier(
+    jwks_url=settings.APPLE_JWKS_URL,
+    issuers=("https://appleid.apple.com",),
+    audiences=settings.APPLE_OAUTH_CLIENT_IDS,
+)
+
+
+def get_json(url: str, params: Optional[dict] = None) -> dict:
+    """
+    GET through the pooled session, {} when the provider answers with an error.
+    """
+    try:
+        response = http.get(url, params=params, timeout=settings.SOCIAL_AUTH_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        logger.warning("Social auth request to {} failed: {}", url.split("?")[0], e)
+        return {}
+    if response.status_code >= 400:
+        logger.warning("Social auth error from {}: {}", url.split("?")[0], response.status_code)
+        return {}
+    try:
+        return response.json()
+    except json.JSONDecodeError:
+        return {}
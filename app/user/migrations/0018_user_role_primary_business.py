@@ -0,0 +1,48 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_roles(apps, schema_editor):
+    User = apps.get_model('user', 'User')
+    Business = apps.get_model('business', 'Business')
+    FreeLancer = apps.get_model('onboarding', 'FreeLancer')
+    Costumer = apps.get_model('onboarding', 'Costumer')
+
+    # same precedence as User.refresh_role: freelancer, business, customer
+    User.objects.update(
+        role=models.Case(
+            models.When(models.Exists(FreeLancer.objects.filter(user_id=models.OuterRef('pk'))), then=models.Value('FREELANCER')),
+            models.When(models.Exists(Business.objects.filter(user_id=models.OuterRef('pk'))), then=models.Value('BUSINESS')),
+            models.When(models.Exists(Costumer.objects.filter(user_id=models.OuterRef('pk'))), then=models.Value('CUSTOMER')),
+            default=None,
+            output_field=models.CharField(),
+        ),
+        primary_business_id=models.Subquery(
+            Business.objects.filter(user_id=models.OuterRef('pk')).order_by('id').values('id')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0045_business_apply_for_weeks_date'),
+        ('onboarding', '0008_costumer_routine_data'),
+        ('user', '0017_usernotificationsettings_apply_notification_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role',
+            field=models.CharField(blank=True, choices=[('BUSINESS', 'BUSINESS'), ('CUSTOMER', 'CUSTOMER'), ('FREELANCER', 'FREELANCER')], default=None, editable=False, help_text="Kept in sync with the user's freelancer, business and customer records", max_length=64, null=True, verbose_name='Role'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='primary_business',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='business.business', verbose_name='Primary business'),
+        ),
+        migrations.RunPython(backfill_roles, migrations.RunPython.noop),
+    ]
@@ -98,6 +98,12 @@ class User(AbstractBaseUser, PermissionsMixin):
         validators=[validate_file_size],
         verbose_name=_("Avatar"),
     )
+    avatar_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized variants of the avatar, see core.images.ImageDerivatives"),
+    )
     avatar_id = models.CharField(
         max_length=255,
         null=True,
@@ -139,6 +145,25 @@ class User(AbstractBaseUser, PermissionsMixin):
         default="en",
         verbose_name=_("Language code"),
     )
+    role = models.CharField(
+        max_length=64,
+        choices=enums.UserRoleChoices.choices,
+        default=None,
+        verbose_name=_("Role"),
+        help_text=_("Kept in sync with the user's freelancer, business and customer records"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    primary_business = models.ForeignKey(
+        "business.Business",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name=_("Primary business"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     objects = UserManager()
     USERNAME_FIELD = "email"
@@ -149,10 +174,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         Returns the first business associated with the user.
         :return: Business instance or None if no business is found.
         """
-        try:
-            return business_models.Business.objects.filter(user=self).first()
-        except business_models.Business.DoesNotExist:
-            return None
+        return self.primary_business
     
     @property
     def get_firebase_token(self) -> str:
@@ -164,13 +186,30 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     @property
     def user_role(self) -> str:
-        if onboarding_models.FreeLancer.objects.filter(user=self).exists():
-            return enums.UserRoleChoices.FREELANCER.value
-        if business_models.Business.objects.filter(user=self).exists():
-            return enums.UserRoleChoices.BUSINESS.value
-        if onboarding_models.Costumer.objects.filter(user=self).exists():
-            return enums.UserRoleChoices.COSTUMER.value
-        return None
+        return self.role
+
+    @classmethod
+    def refresh_role(cls, user_id: int):
+        """
+        Recompute role and primary_business from the freelancer, business and customer
+        records. Runs when one of them is created or deleted, never on reads.
+        """
+        if onboarding_models.FreeLancer.objects.filter(user_id=user_id).exists():
+            role = enums.UserRoleChoices.FREELANCER.value
+        elif business_models.Business.objects.filter(user_id=user_id).exists():
+            role = enums.UserRoleChoices.BUSINESS.value
+        elif onboarding_models.Costumer.objects.filter(user_id=user_id).exists():
+            role = enums.UserRoleChoices.COSTUMER.value
+        else:
+            role = None
+        primary_business_id = (
+            business_models.Business.objects.filter(user_id=user_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        # update() instead of save(): the user may be in the middle of a cascade delete
+        cls.objects.filter(pk=user_id).update(role=role, primary_business_id=primary_business_id)
 
     def __str__(self) -> str:
         return f"{self.email}"
@@ -287,3 +326,25 @@ class UserDevice(models.Model):
         help_text=_("Indicates if the device is blacklisted"),
     )
 
+
+class GeocodeResult(models.Model):
+    """
+    Long term store of geocoding results, see user.geo_utils.geocoding.GeocodeCache.
+    Empty coordinates mean the query was not found.
+    """
+    class Meta:
+        verbose_name = _("Geocode result")
+        verbose_name_plural = _("Geocode results")
+
+    key = models.CharField(max_length=80, unique=True)
+    kind = models.CharField(max_length=20)
+    query = models.CharField(max_length=500)
+    longitude = models.FloatField(null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.kind}: {self.query}"
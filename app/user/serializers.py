@@ -14,6 +14,7 @@ import settings
 # from twilio_sms.sms_client import SmsClient
 
 from core import response, exception
+from core.fields import ImageVariantsField
 from core.token_blacklist import TokenBlacklist
 from user import models
 from user import utils
@@ -215,9 +216,11 @@ class TokenRefreshSerializer(serializers.Serializer):
     def validate(self, attrs):
         refresh = attrs.get('refresh')
         try:
-            RefreshToken(refresh)
+            token = RefreshToken(refresh)
         except Exception:
             raise ValidationError(_('Token is invalid or expired'))
+        if TokenBlacklist.is_revoked(token.payload):
+            raise ValidationError(_('Token is invalid or expired'))
 
         return attrs
 
@@ -248,9 +251,19 @@ class LogoutAllSerializer(serializers.Serializer):
     detail = serializers.CharField(read_only=True, default="Successfully logged out from all devices")
 
     def create(self, validated_data):
-        user = self.context.get('request').user
+        """
+        Revokes every token of the user with one watermark key, except the caller's
+        token family so the current device stays logged in.
+        """
+        request = self.context.get('request')
+        user = request.user
         device_id = validated_data.get('device_id', None)
         utils.blacklist_devices(user, exclude_device_id=device_id)
+        current_token = request.auth
+        TokenBlacklist.revoke_all(
+            user.id,
+            keep_issued_at=current_token.get('iat') if current_token is not None else None,
+        )
         
         return {
             'detail': _('Successfully logged out from all devices'),
@@ -287,6 +300,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
     current_location = LocationPointDisplaySerializer()
     user_role = serializers.CharField(read_only=True, default=None)
     gender = serializers.CharField(source='costumer.gender', read_only=True, default=None)
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = models.User
@@ -301,6 +315,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
             "is_email_verified",
             "notification_settings",
             "avatar",
+            "avatar_variants",
             "avatar_id",
             "current_location",
             "chosen_role",
@@ -321,6 +336,7 @@ class userInlineDetailsSerializer(UserDetailSerializer):
             "surname",
             "phone",
             "avatar",
+            "avatar_variants",
             "avatar_id",
         )
 
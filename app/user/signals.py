@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.authentication import UserSnapshotCache
+from onboarding import models as onboarding_models
+from business import models as business_models
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    UserSnapshotCache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=onboarding_models.FreeLancer)
+@receiver(post_save, sender=onboarding_models.Costumer)
+@receiver(post_save, sender=business_models.Business)
+@receiver(post_delete, sender=onboarding_models.FreeLancer)
+@receiver(post_delete, sender=onboarding_models.Costumer)
+@receiver(post_delete, sender=business_models.Business)
+def refresh_user_role(sender, instance, created=True, **kwargs):
+    """
+    Keep User.role and User.primary_business in sync with the role records.
+    Updates of existing records don't change either, only creates and deletes do.
+    """
+    if not created or not instance.user_id:
+        return
+    User.refresh_role(instance.user_id)
+    UserSnapshotCache.invalidate(instance.user_id)
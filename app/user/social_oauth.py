@@ -1,13 +1,14 @@
-import jwt
-
-import requests
-
 import settings
+from core.custom_logger import logger
+from user import id_tokens
 from user.models import User
 
 
 class SocialUserMixin:
     USER_FIELD_NAME = None
+    # filled from the provider profile when it is known, only used for new users
+    name = None
+    surname = None
 
     def get_user(self):
         if not self.email or not self.social_id:
@@ -16,6 +17,9 @@ class SocialUserMixin:
         user, is_created = User.objects.get_or_create(email=self.email)
         setattr(user, self.USER_FIELD_NAME, self.social_id)
         user.is_email_verified = True
+        if is_created:
+            user.name = self.name or user.name
+            user.surname = self.surname or user.surname
         user.save()
         return user
 
@@ -29,23 +33,33 @@ class SocialUserMixin:
 
 
 class GoogleUser(SocialUserMixin):
+    """
+    Accepts a Google ID token, verified locally against the cached Google keys,
+    or an access token, checked with the userinfo endpoint.
+    allow_test_token=False rejects the "test*<email>" shortcut of the social endpoints.
+    """
     USER_FIELD_NAME = "google_id"
 
-    def __init__(self, social_token):
-        is_test = self.check_for_test_token(social_token)
+    def __init__(self, social_token, allow_test_token=True):
+        is_test = allow_test_token and self.check_for_test_token(social_token)
         if is_test:
             return
-        
-        url = f"{settings.GOOGLE_AUTH_BASE_URL}&access_token={social_token}"
-        response = requests.get(url)
-
-        if response.status_code >= 400:
-            print("Google auth error:", response.content)
 
-        google_data = response.json()
+        if id_tokens.google_id_tokens.looks_like_jwt(social_token):
+            try:
+                google_data = id_tokens.google_id_tokens.verify(social_token)
+            except id_tokens.IdTokenError as e:
+                logger.warning("Google auth error: {}", e)
+                google_data = {}
+        else:
+            google_data = id_tokens.get_json(settings.GOOGLE_AUTH_BASE_URL, params={"access_token": social_token})
 
         self.social_id = google_data.get("sub")
         self.email = google_data.get("email")
+        self.name = google_data.get("given_name")
+        self.surname = google_data.get("family_name")
+        if google_data.get("email_verified") in (False, "false"):
+            self.email = None
 
 
 class FacebookUser(SocialUserMixin):
@@ -55,14 +69,8 @@ class FacebookUser(SocialUserMixin):
         is_test = self.check_for_test_token(social_token)
         if is_test:
             return
-        
-        url = f"{settings.FACEBOOK_AUTH_BASE_URL}&access_token={social_token}"
-        response = requests.get(url)
 
-        if response.status_code >= 400:
-            print("Facebook auth error:", response.content)
-
-        facebook_data = response.json()
+        facebook_data = id_tokens.get_json(settings.FACEBOOK_AUTH_BASE_URL, params={"access_token": social_token})
 
         self.social_id = facebook_data.get("id")
         self.email = facebook_data.get("email")
@@ -75,13 +83,11 @@ class AppleUser(SocialUserMixin):
         is_test = self.check_for_test_token(social_token)
         if is_test:
             return
-        
+
         try:
-            apple_data = jwt.decode(
-                social_token, "", options={"verify_signature": False}
-            )
-        except Exception:
-            print("Apple auth error.")
+            apple_data = id_tokens.apple_id_tokens.verify(social_token)
+        except id_tokens.IdTokenError as e:
+            logger.warning("Apple auth error: {}", e)
             apple_data = {}
 
         self.social_id = apple_data.get("sub")
@@ -90,6 +96,8 @@ class AppleUser(SocialUserMixin):
     def get_user(self):
         if self.email:
             return super().get_user()
+        if not self.social_id:
+            return None
 
         user = User.objects.filter(apple_id=self.social_id).first()
         return user
@@ -102,14 +110,8 @@ class InstagramUser(SocialUserMixin):
         is_test = self.check_for_test_token(social_token)
         if is_test:
             return
-        
-        url = f"{settings.INSTAGRAM_AUTH_BASE_URL}&access_token={social_token}"
-        response = requests.get(url)
 
-        if response.status_code >= 400:
-            print("Instagram auth error:", response.content)
-
-        instagram_data = response.json()
+        instagram_data = id_tokens.get_json(settings.INSTAGRAM_AUTH_BASE_URL, params={"access_token": social_token})
 
         self.social_id = instagram_data.get("id")
         self.email = instagram_data.get("email")
@@ -117,10 +119,12 @@ class InstagramUser(SocialUserMixin):
     def get_user(self):
         if self.email:
             return super().get_user()
+        if not self.social_id:
+            return None
 
         user, is_created = User.objects.get_or_create(
             instagram_id=self.social_id
-        ).first()
+        )
         setattr(user, self.USER_FIELD_NAME, self.social_id)
         if not user.email:
             user.is_email_verified = False
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.redis import redis_storage
+from user.device_blacklist import DeviceBlacklist
+from user.models import UserDevice
+
+
+class DeviceBlacklistTests(TestCase):
+    """Bloom filter in front of the Redis index of blacklisted devices"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="device@example.com", password="testpass123")
+        self.reset()
+        self.addCleanup(self.reset)
+
+    def reset(self):
+        redis_storage.connection.delete(DeviceBlacklist.SET_KEY, DeviceBlacklist.LOADED_KEY)
+        DeviceBlacklist._bloom = None
+        DeviceBlacklist._bloom_expires_at = 0
+
+    def test_add_reaches_the_filter(self):
+        self.assertFalse(DeviceBlacklist.is_blacklisted(self.user.id, "device-a"))
+
+        DeviceBlacklist.add(self.user.id, ["device-a"])
+
+        self.assertIn(DeviceBlacklist.build_member(self.user.id, "device-a"), DeviceBlacklist._bloom)
+        self.assertTrue(DeviceBlacklist.is_blacklisted(self.user.id, "device-a"))
+        self.assertFalse(DeviceBlacklist.is_blacklisted(self.user.id, "device-b"))
+
+    def test_published_addition_reaches_the_filter(self):
+        DeviceBlacklist.is_blacklisted(self.user.id, "device-a")
+        member = DeviceBlacklist.build_member(self.user.id, "device-a")
+
+        DeviceBlacklist.handle_message({"data": member})
+
+        self.assertIn(member, DeviceBlacklist._bloom)
+
+    def test_index_is_loaded_from_the_db(self):
+        UserDevice.objects.create(user=self.user, device_id="device-a", is_blacklisted=True)
+        UserDevice.objects.create(user=self.user, device_id="device-b")
+
+        self.assertTrue(DeviceBlacklist.is_blacklisted(self.user.id, "device-a"))
+        self.assertFalse(DeviceBlacklist.is_blacklisted(self.user.id, "device-b"))
+
+    def test_removed_device_is_allowed_again(self):
+        DeviceBlacklist.add(self.user.id, ["device-a"])
+        DeviceBlacklist.is_blacklisted(self.user.id, "device-a")
+
+        DeviceBlacklist.remove(self.user.id, "device-a")
+
+        self.assertFalse(DeviceBlacklist.is_blacklisted(self.user.id, "device-a"))
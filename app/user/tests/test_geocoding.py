@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from core.redis import redis_storage
+from user.geo_utils.geocoding import GeocodeCache, StubGeocoder
+from user.geo_utils.main import GeoUtils
+from user.models import GeocodeResult
+
+TIRANA = (19.8187, 41.3275)
+
+
+class GeocodeCacheTests(TestCase):
+    """Geocoding through the cache with a local stub geocoder"""
+
+    def setUp(self):
+        self.geocoder = StubGeocoder(
+            addresses={"Rruga Myslym Shyri, Tirane": TIRANA},
+            urls={"https://maps.app.goo.gl/tirana": TIRANA},
+        )
+        GeocodeCache.set_geocoder(self.geocoder)
+        self.addCleanup(GeocodeCache.set_geocoder, None)
+        self.addCleanup(self.clear_redis)
+
+    def clear_redis(self):
+        keys = redis_storage.connection.keys(f"{GeocodeCache.KEY_PREFIX}:*")
+        if keys:
+            redis_storage.connection.delete(*keys)
+
+    def test_address_is_geocoded_once(self):
+        self.assertEqual(GeoUtils.get_coordinates_from_address("Rruga Myslym Shyri, Tirane"), TIRANA)
+        self.assertEqual(GeoUtils.get_coordinates_from_address("  rruga myslym shyri   TIRANE "), TIRANA)
+        self.assertEqual(self.geocoder.calls, 1)
+
+    def test_not_found_is_cached(self):
+        self.assertEqual(GeoUtils.get_coordinates_from_address("Nowhere 1"), (None, None))
+        self.assertEqual(GeoUtils.get_coordinates_from_address("Nowhere 1"), (None, None))
+        self.assertEqual(self.geocoder.calls, 1)
+        row = GeocodeResult.objects.get()
+        self.assertIsNone(row.longitude)
+
+    def test_table_answers_when_redis_is_empty(self):
+        GeoUtils.get_coordinates_from_address("Rruga Myslym Shyri, Tirane")
+        self.clear_redis()
+
+        self.assertEqual(GeoUtils.get_coordinates_from_address("Rruga Myslym Shyri, Tirane"), TIRANA)
+        self.assertEqual(self.geocoder.calls, 1)
+
+    def test_short_url_is_resolved_once(self):
+        self.assertEqual(GeoUtils.get_coordinates_from_short_url("https://maps.app.goo.gl/tirana/"), TIRANA)
+        self.assertEqual(GeoUtils.get_coordinates_from_short_url("https://MAPS.app.goo.gl/tirana"), TIRANA)
+        self.assertEqual(self.geocoder.calls, 1)
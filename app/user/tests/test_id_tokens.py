@@ -0,0 +1,85 @@
+import time
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.test import TestCase
+
+from user import id_tokens
+from user.models import User
+from user.social_oauth import AppleUser, GoogleUser
+
+
+class IdTokenTests(TestCase):
+    """ID tokens verified against a locally generated signing key"""
+
+    CLIENT_ID = "app.client.id"
+
+    def setUp(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        for verifier in (id_tokens.google_id_tokens, id_tokens.apple_id_tokens):
+            audiences = mock.patch.object(verifier, "audiences", [self.CLIENT_ID])
+            audiences.start()
+            self.addCleanup(audiences.stop)
+            jwks = verifier.jwks
+            patcher = mock.patch.multiple(
+                jwks,
+                keys={"local": self.private_key.public_key()},
+                fetched_at=time.monotonic(),
+                expires_at=time.monotonic() + 3600,
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+            fetch = mock.patch.object(jwks, "fetch")
+            fetch.start()
+            self.addCleanup(fetch.stop)
+
+    def sign(self, key=None, **claims):
+        now = int(time.time())
+        payload = {
+            "sub": "1234", "email": "social@test.com", "aud": self.CLIENT_ID, "iat": now, "exp": now + 600, **claims
+        }
+        return jwt.encode(payload, key or self.private_key, algorithm="RS256", headers={"kid": "local"})
+
+    def test_google_id_token(self):
+        token = self.sign(
+            iss="https://accounts.google.com", email_verified=True, given_name="Ada", family_name="Lovelace"
+        )
+        user = GoogleUser(token).get_user()
+        self.assertEqual(user.email, "social@test.com")
+        self.assertEqual(user.google_id, "1234")
+        self.assertEqual((user.name, user.surname), ("Ada", "Lovelace"))
+
+    def test_profile_name_kept_for_existing_user(self):
+        User.objects.create_user(email="social@test.com", password="testpass123", name="Own")
+        token = self.sign(iss="https://accounts.google.com", given_name="Ada", family_name="Lovelace")
+        self.assertEqual(GoogleUser(token).get_user().name, "Own")
+
+    def test_forged_token_is_rejected(self):
+        token = self.sign(key=self.other_key, iss="https://appleid.apple.com")
+        self.assertIsNone(AppleUser(token).get_user())
+        self.assertFalse(User.objects.filter(email="social@test.com").exists())
+
+    def test_wrong_issuer_is_rejected(self):
+        self.assertIsNone(AppleUser(self.sign(iss="https://accounts.google.com")).get_user())
+
+    def test_expired_token_is_rejected(self):
+        token = self.sign(iss="https://accounts.google.com", exp=int(time.time()) - 3600)
+        self.assertIsNone(GoogleUser(token).get_user())
+
+    def test_other_audience_is_rejected(self):
+        token = self.sign(iss="https://accounts.google.com", aud="other.app.client.id")
+        self.assertIsNone(GoogleUser(token).get_user())
+
+    def test_rejected_without_client_ids(self):
+        with mock.patch.object(id_tokens.apple_id_tokens, "audiences", []):
+            self.assertIsNone(AppleUser(self.sign(iss="https://appleid.apple.com")).get_user())
+
+    def test_test_token_still_works(self):
+        self.assertEqual(GoogleUser("test*social@test.com").get_user().email, "social@test.com")
+
+    def test_test_token_refused_when_not_allowed(self):
+        with mock.patch.object(id_tokens, "get_json", return_value={}):
+            self.assertIsNone(GoogleUser("test*social@test.com", allow_test_token=False).get_user())
+        self.assertFalse(User.objects.filter(email="social@test.com").exists())
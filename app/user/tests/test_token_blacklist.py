@@ -0,0 +1,100 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.redis import redis_storage
+from core.token_blacklist import TokenBlacklist
+
+REFRESH_TOKEN_URL = reverse("user:token_refresh")
+USER_DETAIL_URL = reverse("user:detail")
+LOGOUT_ALL_URL = reverse("user:logout_all")
+
+
+class TokenBlacklistTests(TestCase):
+    """Revocation by jti and by the per user watermark"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="revoke@example.com", password="testpass123")
+        self.client = APIClient()
+        self.addCleanup(self.clear_blacklist)
+
+    def clear_blacklist(self):
+        keys = redis_storage.connection.keys("tbl:*")
+        if keys:
+            redis_storage.connection.delete(*keys)
+        TokenBlacklist._not_revoked.clear()
+        TokenBlacklist._watermarks.clear()
+
+    def issue_pair(self, age_seconds=0):
+        """
+        (refresh, access) of the user, issued age_seconds ago.
+        """
+        refresh = RefreshToken.for_user(self.user)
+        access = refresh.access_token
+        if age_seconds:
+            issued_at = int(time.time()) - age_seconds
+            refresh["iat"] = issued_at
+            access["iat"] = issued_at
+        return refresh, access
+
+    def test_blacklisted_refresh_token_is_rejected(self):
+        refresh, _ = self.issue_pair()
+        other_refresh, _ = self.issue_pair()
+        self.assertFalse(TokenBlacklist.is_revoked(refresh.payload))
+
+        TokenBlacklist.blacklist(str(refresh), token_type="refresh")
+
+        self.assertTrue(TokenBlacklist.is_revoked(refresh.payload))
+        self.assertFalse(TokenBlacklist.is_revoked(other_refresh.payload))
+        res = self.client.post(REFRESH_TOKEN_URL, {"refresh": str(refresh)})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tokens_issued_before_watermark_are_rejected(self):
+        old_refresh, old_access = self.issue_pair(age_seconds=60)
+
+        TokenBlacklist.revoke_all(self.user.id)
+
+        self.assertTrue(TokenBlacklist.is_revoked(old_refresh.payload))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {old_access}")
+        res = self.client.get(USER_DETAIL_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_watermark_reaches_workers_without_redis_lookup(self):
+        old_refresh, _ = self.issue_pair(age_seconds=60)
+        TokenBlacklist.handle_message({"data": f"u:{self.user.id}:{int(time.time())}"})
+
+        self.assertTrue(TokenBlacklist.is_revoked(old_refresh.payload))
+
+    def test_logout_all_keeps_the_callers_tokens(self):
+        # unmodified pair, the refresh endpoint looks it up as issued
+        refresh, access = self.issue_pair()
+        other_refresh, other_access = self.issue_pair(age_seconds=120)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        # revoke a minute ahead so the caller's pair falls below the watermark too
+        clock = mock.Mock(time=lambda: time.time() + 60, monotonic=time.monotonic)
+        with mock.patch("core.token_blacklist.time", clock):
+            res = self.client.post(LOGOUT_ALL_URL, {"device_id": "kept-device"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("access", res.data)
+
+        self.assertTrue(TokenBlacklist.is_revoked(other_refresh.payload))
+        self.assertTrue(TokenBlacklist.is_revoked(other_access.payload))
+        self.assertEqual(self.client.get(USER_DETAIL_URL).status_code, status.HTTP_200_OK)
+        self.client.credentials()
+        res = self.client.post(REFRESH_TOKEN_URL, {"refresh": str(refresh)})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_kept_family_reaches_workers(self):
+        refresh, _ = self.issue_pair(age_seconds=60)
+        other_refresh, _ = self.issue_pair(age_seconds=120)
+        TokenBlacklist.handle_message({"data": f"u:{self.user.id}:{int(time.time())}:{refresh['iat']}"})
+
+        self.assertFalse(TokenBlacklist.is_revoked(refresh.payload))
+        self.assertTrue(TokenBlacklist.is_revoked(other_refresh.payload))
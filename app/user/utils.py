@@ -8,6 +8,7 @@ import redis
 from rest_framework.serializers import ValidationError
 
 from user import models as user_models
+from user.device_blacklist import DeviceBlacklist
 
 
 def is_valid_password(password_candidate):
@@ -91,6 +92,7 @@ def register_device_id(request: Request, user: user_models.User):
             device_id=device_id,
             defaults={"is_blacklisted": False}
         )
+        DeviceBlacklist.remove(user.id, device_id)
         return instance
     else:
         return None
@@ -103,7 +105,9 @@ def blacklist_devices(user: user_models.User, exclude_device_id: str = None):
     user_devices = user_models.UserDevice.objects.filter(
         user=user
     ).exclude(device_id=exclude_device_id)
+    device_ids = list(user_devices.values_list("device_id", flat=True))
     user_devices.update(is_blacklisted=True)
+    DeviceBlacklist.add(user.id, device_ids)
     return user_devices
 
 
@@ -9,10 +9,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-import requests
-
-from settings import GOOGLE_AUTH_BASE_URL
-from user.google_oauth import GoogleUser
+from user.social_oauth import GoogleUser
 from user import serializers
 from user import models
 
@@ -68,7 +65,11 @@ class DetailView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # one query for everything UserDetailSerializer reads, role is on the row
+        return models.User.objects.select_related(
+            "notification_settings",
+            "costumer",
+        ).get(pk=self.request.user.pk)
     
 
 class UpdateUserView(generics.UpdateAPIView):
@@ -121,15 +122,11 @@ class GoogleAuth(APIView):
     serializer_class = serializers.UserDetailSerializer
 
     def post(self, request):
-        base_url = GOOGLE_AUTH_BASE_URL
         token = request.data.get("token", "")
-        url = f"{base_url}&access_token={token}"
-        res = requests.get(url)
-        data = res.json()
-        if not "sub" in data:
+        user = GoogleUser(token, allow_test_token=False).get_user()
+        if user is None:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        user = GoogleUser(data).get_user()
         serialized = serializers.UserDetailSerializer(
             user, context={"request": request}
         )
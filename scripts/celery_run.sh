@@ -1,2 +1,4 @@
 #! /bin/sh
-celery -A core worker -l info -Q main-queue -B
\ No newline at end of file
+# verification codes get their own worker so they never wait behind image rendering or archive jobs
+celery -A core worker -l info -Q sms-queue -n sms@%h -c ${SMS_WORKER_CONCURRENCY:-2} &
+exec celery -A core worker -l info -Q main-queue -n main@%h -B
\ No newline at end of file